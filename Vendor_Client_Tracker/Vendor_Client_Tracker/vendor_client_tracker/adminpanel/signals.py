@@ -0,0 +1,28 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from sales.lookups import lookups
+from vendor_client_tracker.catalog import bump_catalog
+from .models import Marketer, Recruiter
+
+
+# ---------- Catalog versions ----------
+@receiver(post_save, sender=Marketer)
+@receiver(post_delete, sender=Marketer)
+def bump_marketer_catalog(sender, **kwargs):
+    bump_catalog('marketers')
+
+
+@receiver(post_save, sender=Recruiter)
+@receiver(post_delete, sender=Recruiter)
+def bump_recruiter_catalog(sender, **kwargs):
+    bump_catalog('recruiters')
+
+
+# ---------- Lookup cache ----------
+@receiver(post_save, sender=Marketer)
+@receiver(post_delete, sender=Marketer)
+@receiver(post_save, sender=Recruiter)
+@receiver(post_delete, sender=Recruiter)
+def invalidate_lookup(sender, instance, **kwargs):
+    lookups.invalidate(sender, instance.pk)
@@ -4,6 +4,7 @@ from rest_framework import status
 from rest_framework.response import Response
 from .models import Marketer, Recruiter
 from .serializers import MarketerSerializer, RecruiterSerializer
+from vendor_client_tracker.catalog import catalog_response
 
 
 # ---------- MARKETER ----------
@@ -19,7 +20,7 @@ def AddMarketer(request):
 
 
 @csrf_exempt
-@api_view(['POST'])
+@api_view(['GET', 'POST'])
 def GetMarketerInfo(request):
     marketer_id = request.data.get('id', None)
     if marketer_id:
@@ -30,9 +31,11 @@ def GetMarketerInfo(request):
         except Marketer.DoesNotExist:
             return Response({"error": "Marketer not found"}, status=status.HTTP_404_NOT_FOUND)
     else:
-        marketers = Marketer.objects.all().order_by('-created_at')
-        serializer = MarketerSerializer(marketers, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        # full list: versioned and pre-rendered, honours If-None-Match / If-Modified-Since
+        return catalog_response(
+            request, 'marketers',
+            lambda: MarketerSerializer(Marketer.objects.all().order_by('-created_at'), many=True).data
+        )
 
 
 # ---------- RECRUITER ----------
@@ -48,7 +51,7 @@ def AddRecruiter(request):
 
 
 @csrf_exempt
-@api_view(['POST'])
+@api_view(['GET', 'POST'])
 def GetRecruiterInfo(request):
     recruiter_id = request.data.get('id', None)
     if recruiter_id:
@@ -59,6 +62,7 @@ def GetRecruiterInfo(request):
         except Recruiter.DoesNotExist:
             return Response({"error": "Recruiter not found"}, status=status.HTTP_404_NOT_FOUND)
     else:
-        recruiters = Recruiter.objects.all().order_by('-created_at')
-        serializer = RecruiterSerializer(recruiters, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return catalog_response(
+            request, 'recruiters',
+            lambda: RecruiterSerializer(Recruiter.objects.all().order_by('-created_at'), many=True).data
+        )
@@ -0,0 +1,216 @@
+"""
+Client–vendor relationship graph.
+
+Vendors and clients are nodes; a directed edge points one tier closer to the
+client. Edges come from two sources:
+- every Submission chain vendor -> prime vendor -> implementation partner ->
+  end client (tiers left empty are skipped), counted per submission;
+- every ClientVendorLink vendor -> client, labelled with its role.
+
+The graph is held in process memory as adjacency sets with per-edge label
+counts, so traversals never touch the database. Submission and link writes
+apply their edge deltas after commit (see clients.signals and sales.signals)
+and bump the 'client-graph' Version row, which every worker process shares; a
+process that finds the stored version moved past its own (another process
+wrote, or a vendor or client was deleted) rebuilds from two aggregated queries
+on its next read. Each read checks the version with one primary-key query.
+Reachable client sets are memoized per vendor until the next change.
+"""
+
+import threading
+import time
+from collections import Counter, defaultdict, deque
+
+from django.db import transaction
+from django.db.models import Count
+
+from sales.models import Submission
+from vendor_client_tracker.models import Version
+from .models import ClientVendorLink
+
+VERSION_NAME = 'client-graph'
+FULL_REBUILD_SECONDS = 60 * 60
+MAX_CHAIN_VENDORS = 6
+MAX_CHAINS = 500
+
+SUBMISSION = 'submission'
+CHAIN_FIELDS = ('vendor_id', 'prime_vendor_id', 'implementation_partner_id', 'end_client_id')
+
+
+def vendor(pk):
+    return ('vendor', pk)
+
+
+def client(pk):
+    return ('client', pk)
+
+
+def chain_edges(vendor_id=None, prime_vendor_id=None, implementation_partner_id=None, end_client_id=None, **kwargs):
+    """Edges of one submission chain, given its CHAIN_FIELDS values."""
+    nodes = [vendor(pk) for pk in (vendor_id, prime_vendor_id, implementation_partner_id) if pk]
+    if end_client_id:
+        nodes.append(client(end_client_id))
+    return [(a, b) for a, b in zip(nodes, nodes[1:]) if a != b]
+
+
+def _bump_version():
+    return Version.bump(VERSION_NAME)
+
+
+class RelationshipGraph:
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._edges = None  # (from, to) -> Counter(label)
+        self._out = None
+        self._in = None
+        self._reach = {}
+        self.version = None
+        self.built_at = 0
+
+    # ---------- Loading ----------
+    def _rebuild(self):
+        self._edges, self._out, self._in = {}, defaultdict(set), defaultdict(set)
+        self._reach = {}
+        with transaction.atomic():  # one snapshot for the version and both queries
+            version = Version.current(VERSION_NAME)[0]
+            chains = Submission.objects.order_by().values(*CHAIN_FIELDS).annotate(n=Count('id'))
+            for row in chains.iterator(chunk_size=5000):
+                for edge in chain_edges(**row):
+                    self._add(edge, SUBMISSION, row['n'])
+            links = ClientVendorLink.objects.values_list('vendor_id', 'client_id', 'role')
+            for vendor_id, client_id, role in links.iterator(chunk_size=5000):
+                self._add((vendor(vendor_id), client(client_id)), role, 1)
+        self.version, self.built_at = version, time.monotonic()
+
+    def _current(self):
+        if (self._edges is None or Version.current(VERSION_NAME)[0] != self.version
+                or time.monotonic() - self.built_at > FULL_REBUILD_SECONDS):
+            self._rebuild()
+
+    # ---------- Changes ----------
+    def _add(self, edge, label, count):
+        labels = self._edges.get(edge)
+        if labels is None:
+            labels = self._edges[edge] = Counter()
+            self._out[edge[0]].add(edge[1])
+            self._in[edge[1]].add(edge[0])
+        labels[label] += count
+
+    def _remove(self, edge, label, count):
+        labels = self._edges.get(edge)
+        if labels is None:
+            return
+        labels[label] -= count
+        if labels[label] <= 0:
+            del labels[label]
+        if not labels:
+            del self._edges[edge]
+            self._out[edge[0]].discard(edge[1])
+            self._in[edge[1]].discard(edge[0])
+
+    def apply(self, removed=(), added=()):
+        """
+        Apply edge deltas ([(edge, label)] lists) of a committed write. Only
+        call after commit (see on_commit); the graph must not see rolled-back rows.
+        """
+        removed, added = Counter(removed), Counter(added)
+        removed, added = removed - added, added - removed
+        if not removed and not added:
+            return
+        version = _bump_version()
+        with self._lock:
+            if self._edges is None or self.version is None:
+                return
+            if version != self.version + 1:
+                self.version = None  # missed another process's change; rebuild on next read
+                return
+            for (edge, label), count in removed.items():
+                self._remove(edge, label, count)
+            for (edge, label), count in added.items():
+                self._add(edge, label, count)
+            self._reach = {}
+            self.version = version
+
+    def apply_on_commit(self, removed=(), added=()):
+        removed, added = list(removed), list(added)
+        transaction.on_commit(lambda: self.apply(removed, added))
+
+    def invalidate(self):
+        """Force every process to rebuild (for changes that are not edge deltas, e.g. deletes that null FKs)."""
+        transaction.on_commit(_bump_version)
+
+    # ---------- Traversals ----------
+    def reachable_clients(self, vendor_id):
+        """{client_id: hops} of every client vendor_id reaches through any path."""
+        with self._lock:
+            self._current()
+            start = vendor(vendor_id)
+            if start not in self._reach:
+                self._reach[start] = self._reach_from(start)
+            return self._reach[start]
+
+    def _reach_from(self, start):
+        hops, seen, queue = {}, {start}, deque([(start, 0)])
+        while queue:
+            node, depth = queue.popleft()
+            for following in self._out.get(node, ()):
+                if following in seen:
+                    continue
+                seen.add(following)
+                if following[0] == 'client':
+                    hops[following[1]] = depth + 1
+                else:
+                    queue.append((following, depth + 1))
+        return hops
+
+    def shortest_chain(self, vendor_id, client_id):
+        """Fewest-hop chain of nodes from vendor_id to client_id, or None."""
+        with self._lock:
+            self._current()
+            start, goal = vendor(vendor_id), client(client_id)
+            parents, queue = {start: None}, deque([start])
+            while queue:
+                node = queue.popleft()
+                if node == goal:
+                    path = []
+                    while node is not None:
+                        path.append(node)
+                        node = parents[node]
+                    return self._describe(path[::-1])
+                for following in self._out.get(node, ()):
+                    if following not in parents and (following[0] == 'vendor' or following == goal):
+                        parents[following] = node
+                        queue.append(following)
+            return None
+
+    def chains_to_client(self, client_id, limit=MAX_CHAINS):
+        """
+        Return (chains, truncated): the vendor chains ending at client_id, one
+        per vendor path of up to MAX_CHAIN_VENDORS tiers without repeats,
+        shortest first. Past `limit` the longer ones are cut and truncated is True.
+        Every queued path becomes a chain, so the queue is never let past
+        `limit` either.
+        """
+        with self._lock:
+            self._current()
+            chains, queue, truncated = [], deque([[client(client_id)]]), False
+            while queue:
+                path = queue.popleft()
+                if len(path) > 1:
+                    chains.append(self._describe(path[::-1]))
+                if len(path) - 1 < MAX_CHAIN_VENDORS:
+                    upstream = sorted(node for node in self._in.get(path[-1], ()) if node not in path)
+                    room = limit - len(chains) - len(queue)
+                    if len(upstream) > room:
+                        upstream, truncated = upstream[:max(room, 0)], True
+                    queue.extend(path + [node] for node in upstream)
+            return chains, truncated
+
+    def _describe(self, path):
+        return {
+            'nodes': [{'type': kind, 'id': pk} for kind, pk in path],
+            'hops': [dict(self._edges[edge]) for edge in zip(path, path[1:])],
+        }
+
+
+graph = RelationshipGraph()
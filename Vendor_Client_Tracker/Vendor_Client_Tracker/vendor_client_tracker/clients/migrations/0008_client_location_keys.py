@@ -0,0 +1,77 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:45
+
+from django.db import migrations, models
+
+# frozen copies of clients.models.normalize_city and vendor_client_tracker.states.state_code
+STATE_NAMES = {
+    'AL': 'Alabama', 'AK': 'Alaska', 'AZ': 'Arizona', 'AR': 'Arkansas', 'CA': 'California',
+    'CO': 'Colorado', 'CT': 'Connecticut', 'DE': 'Delaware', 'FL': 'Florida', 'GA': 'Georgia',
+    'HI': 'Hawaii', 'ID': 'Idaho', 'IL': 'Illinois', 'IN': 'Indiana', 'IA': 'Iowa', 'KS': 'Kansas',
+    'KY': 'Kentucky', 'LA': 'Louisiana', 'ME': 'Maine', 'MD': 'Maryland', 'MA': 'Massachusetts',
+    'MI': 'Michigan', 'MN': 'Minnesota', 'MS': 'Mississippi', 'MO': 'Missouri', 'MT': 'Montana',
+    'NE': 'Nebraska', 'NV': 'Nevada', 'NH': 'New Hampshire', 'NJ': 'New Jersey',
+    'NM': 'New Mexico', 'NY': 'New York', 'NC': 'North Carolina', 'ND': 'North Dakota',
+    'OH': 'Ohio', 'OK': 'Oklahoma', 'OR': 'Oregon', 'PA': 'Pennsylvania', 'RI': 'Rhode Island',
+    'SC': 'South Carolina', 'SD': 'South Dakota', 'TN': 'Tennessee', 'TX': 'Texas', 'UT': 'Utah',
+    'VT': 'Vermont', 'VA': 'Virginia', 'WA': 'Washington', 'WV': 'West Virginia',
+    'WI': 'Wisconsin', 'WY': 'Wyoming',
+}
+STATE_CODES = {**{code.lower(): code for code in STATE_NAMES}, **{name.lower(): code for code, name in STATE_NAMES.items()}}
+
+
+def normalize_city(value):
+    if not value:
+        return None
+    return " ".join(str(value).split()).casefold() or None
+
+
+def state_code(value):
+    if not value:
+        return None
+    return STATE_CODES.get(" ".join(str(value).split()).lower())
+
+
+def backfill_location_keys(apps, schema_editor):
+    Client = apps.get_model('clients', 'Client')
+    batch = []
+    for client in Client.objects.only('city', 'state').order_by('id').iterator(chunk_size=2000):
+        client.city_normalized = normalize_city(client.city)
+        client.state_code = state_code(client.state)
+        batch.append(client)
+        if len(batch) >= 2000:
+            Client.objects.bulk_update(batch, ['city_normalized', 'state_code'])
+            batch = []
+    Client.objects.bulk_update(batch, ['city_normalized', 'state_code'])
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clients', '0007_clientaddress'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='client',
+            name='city_normalized',
+            field=models.CharField(blank=True, editable=False, max_length=100, null=True),
+        ),
+        migrations.AddField(
+            model_name='client',
+            name='state_code',
+            field=models.CharField(blank=True, editable=False, max_length=2, null=True),
+        ),
+        # filled before the indexes are built
+        migrations.RunPython(backfill_location_keys, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='client',
+            index=models.Index(fields=['state_code', 'city_normalized', 'id'], name='client_state_city_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='client',
+            index=models.Index(fields=['city_normalized', 'id'], name='client_city_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='client',
+            index=models.Index(fields=['state_code', 'id'], name='client_state_idx'),
+        ),
+    ]
@@ -1,7 +1,18 @@
 from django.db import models
 from django.contrib.auth.models import User
 
-class Client(models.Model):
+from geo.models import Geocoded
+from vendor_client_tracker.states import state_code
+
+
+def normalize_city(value):
+    """Case- and whitespace-insensitive form of a city name ("  San  Jose " -> "san jose")."""
+    if not value:
+        return None
+    return " ".join(str(value).split()).casefold() or None
+
+
+class Client(Geocoded):
     name = models.CharField(max_length=255)
     domain_id = models.IntegerField(blank=True, null=True)   # store id
     domain_name = models.CharField(max_length=255, blank=True, null=True)  # store readable name
@@ -15,10 +26,37 @@ class Client(models.Model):
     contact_phone = models.CharField(max_length=20, blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    # derived from city/state in save(); SearchClient filters on these with equality
+    city_normalized = models.CharField(max_length=100, blank=True, null=True, editable=False)
+    state_code = models.CharField(max_length=2, blank=True, null=True, editable=False)
+
+    LOCATION_SOURCE_FIELDS = {'city', 'state'}
+    LOCATION_KEY_FIELDS = {'city_normalized', 'state_code'}
+
+    class Meta:
+        # each filter combination is an equality prefix followed by id, the page order
+        indexes = [
+            models.Index(fields=['state_code', 'city_normalized', 'id'], name='client_state_city_idx'),
+            models.Index(fields=['city_normalized', 'id'], name='client_city_idx'),
+            models.Index(fields=['state_code', 'id'], name='client_state_idx'),
+            models.Index(fields=['latitude', 'longitude'], name='client_geo_idx'),
+        ]
+
+    def set_location_keys(self):
+        self.city_normalized = normalize_city(self.city)
+        self.state_code = state_code(self.state)
+
+    def save(self, *args, **kwargs):
+        self.set_location_keys()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and self.LOCATION_SOURCE_FIELDS & set(update_fields):
+            kwargs['update_fields'] = set(update_fields) | self.LOCATION_KEY_FIELDS
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return self.name
 
-class ClientAddress(models.Model):
+class ClientAddress(Geocoded):
     client = models.ForeignKey(Client, on_delete=models.CASCADE, related_name="addresses")
     street_address = models.CharField(max_length=255, blank=True, null=True)
     city = models.CharField(max_length=100, blank=True, null=True)
@@ -29,6 +67,9 @@ class ClientAddress(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [models.Index(fields=['latitude', 'longitude'], name='client_address_geo_idx')]
+
     def __str__(self):
         return f"{self.client.name} - {self.street_address}, {self.city}"
 
@@ -17,7 +17,8 @@ class VendorSerializer(serializers.ModelSerializer):
 class ClientSerializer(serializers.ModelSerializer):
     class Meta:
         model = Client
-        fields = '__all__'
+        # derived search/geo columns stay internal
+        exclude = ('city_normalized', 'state_code', 'latitude', 'longitude')
         read_only_fields = ('id', 'created_at')
 
 class ClientAddressSerializer(serializers.ModelSerializer):
@@ -0,0 +1,38 @@
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from vendors.models import Vendor
+from .graph import graph, vendor, client
+from .models import Client, ClientVendorLink
+
+
+def _link_edge(vendor_id, client_id, role):
+    return (vendor(vendor_id), client(client_id)), role
+
+
+# ---------- Relationship graph ----------
+@receiver(pre_save, sender=ClientVendorLink)
+def remember_stored_link(sender, instance, **kwargs):
+    instance._stored = (ClientVendorLink.objects.filter(pk=instance.pk).values_list('vendor_id', 'client_id', 'role')
+                        .first() if instance.pk else None)
+
+
+@receiver(post_save, sender=ClientVendorLink)
+def add_link_edge(sender, instance, **kwargs):
+    stored = getattr(instance, '_stored', None)
+    graph.apply_on_commit(
+        removed=[_link_edge(*stored)] if stored else [],
+        added=[_link_edge(instance.vendor_id, instance.client_id, instance.role)],
+    )
+
+
+@receiver(post_delete, sender=ClientVendorLink)
+def remove_link_edge(sender, instance, **kwargs):
+    graph.apply_on_commit(removed=[_link_edge(instance.vendor_id, instance.client_id, instance.role)])
+
+
+@receiver(post_delete, sender=Client)
+@receiver(post_delete, sender=Vendor)
+def rebuild_graph_on_delete(sender, **kwargs):
+    # their submissions are nulled by SET_NULL without signals
+    graph.invalidate()
@@ -20,6 +20,10 @@ urlpatterns = [
     path("UpdateClientAddress/", UpdateClientAddressView.as_view(), name="update-client-address"),
     path("DeleteClientAddress/", DeleteClientAddressView.as_view(), name="delete-client-address"),
     path('SearchClient/', views.SearchClientView.as_view(), name='searchclient'),
+    path('GetReachableClients/<int:vendor_id>/', views.GetReachableClientsView.as_view(), name='get-reachable-clients'),
+    path('GetShortestChain/<int:vendor_id>/<int:client_id>/', views.GetShortestChainView.as_view(),
+         name='get-shortest-chain'),
+    path('GetClientChains/<int:client_id>/', views.GetClientChainsView.as_view(), name='get-client-chains'),
     # Optional sanity endpoint:
     # path('GetVendor/', views.GetVendorView.as_view(), name='get-vendor'),
 ]
@@ -4,11 +4,16 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from django.shortcuts import get_object_or_404
-from django.db.models import Q
+from django.db.models import Exists, OuterRef, Q
 from .domain_constants import DOMAIN_CHOICES
+from vendor_client_tracker.catalog import catalog_response
+from vendor_client_tracker.fieldsets import FieldsetError, model_field_map, render_rows, requested_fields, sparse_values
+from vendor_client_tracker.pagination import InvalidCursor, approximate_count, paginate_keyset, parse_limit
+from vendor_client_tracker.states import state_code, state_codes_starting
 
 
-from .models import Client, ClientVendorLink, ClientAddress
+from .graph import graph
+from .models import Client, ClientVendorLink, ClientAddress, normalize_city
 from vendors.models import Vendor as Vendor
 
 from .serializers import (
@@ -19,17 +24,30 @@ from .serializers import (
     VendorSerializer
 )
 
+# same columns as ClientSerializer, so the ?fields= fast path keeps the derived ones internal too
+CLIENT_VALUES = {
+    name: lookup for name, lookup in model_field_map(Client).items() if name not in ClientSerializer.Meta.exclude
+}
+CLIENT_SEARCH_ORDERING = ('id',)
+
 class SearchClientView(APIView):
     """
     POST /clients/SearchClient/
-    Filter clients by City, State, and Vendor (name or id).
+    Filter clients by City, State, and Vendor (name or id), oldest first.
 
     Example Body:
     {
-        "city": "Dallas",
-        "state": "TX",
-        "vendor_name": "TechConnect"
+        "city": "Dal",            # prefix of the city
+        "state": "TX",            # code, full name or the start of a name
+        "vendor_name": "TechConnect",
+        "limit": 100,             # optional paging: sending limit or cursor
+        "cursor": "<next_cursor of the previous page>",
+        "with_count": true        # adds "count" (capped) and "count_exact" to a page
     }
+    City and state match ignoring case and spacing, as prefix range scans on
+    the normalized columns (see Client.Meta.indexes). A state that is not a US
+    state matches the start of the stored state of clients outside the US list.
+    Without limit/cursor every match is returned with its count.
     """
 
     def post(self, request):
@@ -37,40 +55,59 @@ class SearchClientView(APIView):
         clients = Client.objects.all()
 
         # 🔹 Filter by City
-        city = data.get('city')
+        city = normalize_city(data.get('city'))
         if city:
-            clients = clients.filter(city__icontains=city)
+            clients = clients.filter(city_normalized__startswith=city)
 
         # 🔹 Filter by State
         state = data.get('state')
         if state:
-            clients = clients.filter(state__icontains=state)
-
-        # 🔹 Filter by Vendor (using link table)
+            code = state_code(state)
+            if code:
+                clients = clients.filter(state_code=code)
+            else:
+                clients = clients.filter(
+                    Q(state_code__in=state_codes_starting(state))
+                    | Q(state_code__isnull=True, state__istartswith=" ".join(str(state).split()))
+                )
+
+        # 🔹 Filter by Vendor (EXISTS on the link table; no join fan-out to dedupe)
         vendor_id = data.get('vendor_id')
         vendor_name = data.get('vendor_name')
 
         if vendor_id or vendor_name:
-            vendor_links = ClientVendorLink.objects.all()
+            vendor_links = ClientVendorLink.objects.filter(client=OuterRef('pk'))
 
             if vendor_id:
-                vendor_links = vendor_links.filter(vendor_id=vendor_id)
+                try:
+                    vendor_links = vendor_links.filter(vendor_id=int(vendor_id))
+                except (TypeError, ValueError):
+                    return Response({"error": "vendor_id must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
             if vendor_name:
                 vendor_links = vendor_links.filter(vendor__name__icontains=vendor_name)
 
-            client_ids = vendor_links.values_list('client_id', flat=True).distinct()
-            clients = clients.filter(id__in=client_ids)
+            clients = clients.filter(Exists(vendor_links))
 
-        serializer = ClientSerializer(clients.distinct(), many=True)
-        return Response({
-            "count": clients.count(),
-            "results": serializer.data
-        }, status=status.HTTP_200_OK)
+        if not data.get('limit') and not data.get('cursor'):
+            results = ClientSerializer(clients.order_by(*CLIENT_SEARCH_ORDERING), many=True).data
+            return Response({"count": len(results), "results": results}, status=status.HTTP_200_OK)
+
+        limit = parse_limit(data.get('limit'))
+        try:
+            page, next_cursor = paginate_keyset(clients, CLIENT_SEARCH_ORDERING, data.get('cursor'), limit)
+        except InvalidCursor:
+            return Response({"error": "Invalid cursor"}, status=status.HTTP_400_BAD_REQUEST)
+
+        body = {"results": ClientSerializer(page, many=True).data, "next_cursor": next_cursor}
+        if data.get('with_count'):
+            body["count"], body["count_exact"] = approximate_count(clients)
+        return Response(body, status=status.HTTP_200_OK)
 
 class DomainListAPI(APIView):
     def get(self, request):
-        data = [{"id": i + 1, "name": d} for i, d in enumerate(DOMAIN_CHOICES)]
-        return Response(data)
+        return catalog_response(
+            request, 'domains', lambda: [{"id": i + 1, "name": d} for i, d in enumerate(DOMAIN_CHOICES)], static=True
+        )
 
 class AddClientView(APIView):
     def post(self, request):
@@ -97,8 +134,18 @@ class AddClientView(APIView):
 
 
 class GetClientView(APIView):
+    """
+    GET /client/GetClient/?fields=id,name,city  (or ?exclude=...)
+    """
     def get(self, request):
+        try:
+            fields = requested_fields(request, CLIENT_VALUES)
+        except FieldsetError as exc:
+            return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
         clients = Client.objects.all()
+        if fields:
+            return Response(render_rows(sparse_values(clients, CLIENT_VALUES, fields), CLIENT_VALUES, fields))
         serializer = ClientSerializer(clients, many=True)
         return Response(serializer.data)
 
@@ -271,3 +318,60 @@ class GetVendorView(APIView):
             "message": "Vendors retrieved successfully",
             "data": VendorSerializer(vendors, many=True).data
         }, status=status.HTTP_200_OK)
+
+
+# ---------- Client–vendor relationship graph ----------
+def _named(chains):
+    """Add names to the nodes of graph chains, one query per node type."""
+    ids = {'vendor': set(), 'client': set()}
+    for chain in chains:
+        for node in chain['nodes']:
+            ids[node['type']].add(node['id'])
+    names = {
+        'vendor': dict(Vendor.objects.filter(id__in=ids['vendor']).values_list('id', 'name')),
+        'client': dict(Client.objects.filter(id__in=ids['client']).values_list('id', 'name')),
+    }
+    return [{
+        'nodes': [{**node, 'name': names[node['type']].get(node['id'])} for node in chain['nodes']],
+        'hops': chain['hops'],
+    } for chain in chains]
+
+
+class GetReachableClientsView(APIView):
+    """
+    GET /client/GetReachableClients/<vendor_id>/
+    Clients the vendor reaches through any chain of submissions and vendor links, nearest first.
+    """
+    def get(self, request, vendor_id):
+        hops = graph.reachable_clients(vendor_id)
+        names = dict(Client.objects.filter(id__in=hops).values_list('id', 'name'))
+        clients = sorted(({"id": pk, "name": names.get(pk), "hops": n} for pk, n in hops.items()),
+                         key=lambda c: (c["hops"], c["id"]))
+        return Response({"vendor_id": vendor_id, "count": len(clients), "clients": clients}, status=200)
+
+
+class GetShortestChainView(APIView):
+    """
+    GET /client/GetShortestChain/<vendor_id>/<client_id>/
+    The chain with the fewest tiers from the vendor to the client.
+    """
+    def get(self, request, vendor_id, client_id):
+        chain = graph.shortest_chain(vendor_id, client_id)
+        if chain is None:
+            return Response({"error": "No chain from this vendor to this client"}, status=status.HTTP_404_NOT_FOUND)
+        return Response(_named([chain])[0], status=200)
+
+
+class GetClientChainsView(APIView):
+    """
+    GET /client/GetClientChains/<client_id>/
+    Every vendor chain that ends at the client, shortest first (at most clients.graph.MAX_CHAINS).
+    """
+    def get(self, request, client_id):
+        chains, truncated = graph.chains_to_client(client_id)
+        return Response({
+            "client_id": client_id,
+            "count": len(chains),
+            "truncated": truncated,
+            "chains": _named(chains),
+        }, status=200)
@@ -0,0 +1,106 @@
+"""
+Offline geocoding against the bundled US ZIP centroid table (ZipCentroid).
+
+An address is placed at the centroid of its 5-digit ZIP code, or, when the
+ZIP code is missing or unknown, at the mean of the centroids of its city and
+state. Nothing here calls out to a network service. Functions take the
+centroid model as an argument so migrations can pass their historical model.
+"""
+
+import csv
+import gzip
+import re
+from pathlib import Path
+
+from django.db import transaction
+from django.db.models import Avg
+
+from vendor_client_tracker.states import state_code
+
+DATA_FILE = Path(__file__).resolve().parent / 'data' / 'us_zip_centroids.csv.gz'
+BATCH_SIZE = 2000
+
+ZIP_RE = re.compile(r'^\s*(\d{5})(?:[-\s]?\d{4})?\s*$')
+
+
+def zip5(value):
+    """'75201', '75201-1234', ' 752011234 ' -> '75201'; None for anything else."""
+    match = ZIP_RE.match(str(value)) if value else None
+    return match.group(1) if match else None
+
+
+def _city_key(city, state):
+    code = state_code(state)
+    city = " ".join(str(city).split()) if city else ''
+    return (code, city.casefold()) if code and city else None
+
+
+def locate(centroids, zipcode=None, city=None, state=None):
+    """(latitude, longitude) of a ZIP code, else of a city and state; None if neither is known."""
+    zipcode = zip5(zipcode)
+    if zipcode:
+        point = centroids.objects.filter(zipcode=zipcode).values_list('latitude', 'longitude').first()
+        if point:
+            return point
+    key = _city_key(city, state)
+    return _city_centroid(centroids, key) if key else None
+
+
+def _city_centroid(centroids, key):
+    code, city = key
+    point = centroids.objects.filter(state=code, city__iexact=city).aggregate(lat=Avg('latitude'), lon=Avg('longitude'))
+    return (point['lat'], point['lon']) if point['lat'] is not None else None
+
+
+def geocode(objects, centroids):
+    """
+    Set latitude/longitude on `objects` (anything with zipcode, city and state
+    attributes): one query for all their ZIP codes, plus one per distinct city
+    that needs the fallback.
+    """
+    zips = [zip5(obj.zipcode) for obj in objects]
+    found = {
+        zipcode: (lat, lon) for zipcode, lat, lon in
+        centroids.objects.filter(zipcode__in={z for z in zips if z}).values_list('zipcode', 'latitude', 'longitude')
+    } if any(zips) else {}
+    cities = {}
+    for obj, zipcode in zip(objects, zips):
+        point = found.get(zipcode)
+        if point is None:
+            key = _city_key(obj.city, obj.state)
+            if key and key not in cities:
+                cities[key] = _city_centroid(centroids, key)
+            point = cities.get(key)
+        obj.latitude, obj.longitude = point or (None, None)
+
+
+def backfill_coordinates(model, centroids, batch_size=BATCH_SIZE):
+    """Re-geocode every row of `model`. Returns the number of rows placed."""
+    placed, batch = 0, []
+    rows = model.objects.only('zipcode', 'city', 'state', 'latitude', 'longitude').order_by('pk')
+    for obj in rows.iterator(chunk_size=batch_size):
+        batch.append(obj)
+        if len(batch) >= batch_size:
+            placed += _update(model, centroids, batch)
+            batch = []
+    return placed + _update(model, centroids, batch)
+
+
+def _update(model, centroids, batch):
+    geocode(batch, centroids)
+    model.objects.bulk_update(batch, ['latitude', 'longitude'])
+    return sum(obj.latitude is not None for obj in batch)
+
+
+def load_centroids(centroids, path=DATA_FILE):
+    """Replace the centroid table with the rows of `path` (gzipped CSV). Returns the row count."""
+    with gzip.open(path, 'rt', newline='') as f:
+        rows = [
+            centroids(zipcode=row['zipcode'], city=row['city'], state=row['state'],
+                      latitude=float(row['latitude']), longitude=float(row['longitude']))
+            for row in csv.DictReader(f)
+        ]
+    with transaction.atomic():
+        centroids.objects.all().delete()
+        centroids.objects.bulk_create(rows, batch_size=BATCH_SIZE)
+    return len(rows)
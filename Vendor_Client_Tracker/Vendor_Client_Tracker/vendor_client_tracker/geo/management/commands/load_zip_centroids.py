@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from clients.models import Client, ClientAddress
+from geo.geocoding import DATA_FILE, backfill_coordinates, load_centroids
+from geo.models import ZipCentroid
+from vendors.models import Vendor, VendorAddress
+
+GEOCODED_MODELS = (Client, ClientAddress, Vendor, VendorAddress)
+
+
+class Command(BaseCommand):
+    help = "Reload the ZIP centroid table from the bundled data file and re-geocode every address."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--file', default=str(DATA_FILE),
+                            help='Gzipped CSV of zipcode,city,state,latitude,longitude.')
+        parser.add_argument('--skip-geocode', action='store_true', help='Only reload the centroids.')
+
+    def handle(self, *args, **options):
+        count = load_centroids(ZipCentroid, options['file'])
+        self.stdout.write(f"Loaded {count} ZIP centroids")
+        if options['skip_geocode']:
+            return
+        for model in GEOCODED_MODELS:
+            placed = backfill_coordinates(model, ZipCentroid)
+            self.stdout.write(f"{model.__name__}: {placed} placed")
+        self.stdout.write(self.style.SUCCESS("Done"))
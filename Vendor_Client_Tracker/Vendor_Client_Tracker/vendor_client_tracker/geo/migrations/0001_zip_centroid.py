@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:48
+
+import csv
+import gzip
+from pathlib import Path
+
+from django.db import migrations, models
+
+DATA_FILE = Path(__file__).resolve().parent.parent / 'data' / 'us_zip_centroids.csv.gz'
+
+
+def load_bundled_centroids(apps, schema_editor):
+    ZipCentroid = apps.get_model('geo', 'ZipCentroid')
+    with gzip.open(DATA_FILE, 'rt', newline='') as f:
+        rows = [
+            ZipCentroid(zipcode=row['zipcode'], city=row['city'], state=row['state'],
+                        latitude=float(row['latitude']), longitude=float(row['longitude']))
+            for row in csv.DictReader(f)
+        ]
+    ZipCentroid.objects.bulk_create(rows, batch_size=2000)
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ZipCentroid',
+            fields=[
+                ('zipcode', models.CharField(max_length=5, primary_key=True, serialize=False)),
+                ('city', models.CharField(max_length=64)),
+                ('state', models.CharField(max_length=2)),
+                ('latitude', models.FloatField()),
+                ('longitude', models.FloatField()),
+            ],
+            options={
+                'indexes': [models.Index(fields=['state', 'city'], name='zipcentroid_city_idx')],
+            },
+        ),
+        migrations.RunPython(load_bundled_centroids, migrations.RunPython.noop),
+    ]
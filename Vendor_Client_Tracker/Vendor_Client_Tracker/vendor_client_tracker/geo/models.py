@@ -0,0 +1,44 @@
+from django.db import models
+
+from .geocoding import geocode
+
+
+class ZipCentroid(models.Model):
+    """Centroid of a US ZIP code, loaded from data/us_zip_centroids.csv.gz (see load_centroids)."""
+    zipcode = models.CharField(max_length=5, primary_key=True)
+    city = models.CharField(max_length=64)
+    state = models.CharField(max_length=2)
+    latitude = models.FloatField()
+    longitude = models.FloatField()
+
+    class Meta:
+        indexes = [models.Index(fields=['state', 'city'], name='zipcentroid_city_idx')]
+
+    def __str__(self):
+        return f"{self.zipcode} {self.city}, {self.state}"
+
+
+class Geocoded(models.Model):
+    """
+    Adds latitude/longitude derived in save() from the model's zipcode, city
+    and state fields. Concrete models add an index on (latitude, longitude)
+    for the radius search's bounding box.
+    """
+    latitude = models.FloatField(blank=True, null=True, editable=False)
+    longitude = models.FloatField(blank=True, null=True, editable=False)
+
+    GEO_SOURCE_FIELDS = {'zipcode', 'city', 'state'}
+    GEO_KEY_FIELDS = {'latitude', 'longitude'}
+
+    class Meta:
+        abstract = True
+
+    def set_coordinates(self):
+        geocode([self], ZipCentroid)
+
+    def save(self, *args, **kwargs):
+        self.set_coordinates()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and self.GEO_SOURCE_FIELDS & set(update_fields):
+            kwargs['update_fields'] = set(update_fields) | self.GEO_KEY_FIELDS
+        super().save(*args, **kwargs)
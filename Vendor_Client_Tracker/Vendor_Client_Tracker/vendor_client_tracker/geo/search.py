@@ -0,0 +1,107 @@
+"""
+Radius search over geocoded clients and vendors.
+
+Candidates are read through the (latitude, longitude) index of each model
+with a bounding box that is guaranteed to contain the circle, then the exact
+great-circle (haversine) distance is computed for all of them in one NumPy
+pass (a plain loop when NumPy is not installed). A client or vendor matches
+if its own address or any of its extra addresses is inside the radius, at the
+distance of the nearest one.
+"""
+
+import math
+
+from django.db.models import Q
+
+from clients.models import Client, ClientAddress
+from vendors.models import Vendor, VendorAddress
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+EARTH_RADIUS_MILES = 3958.8
+MAX_RADIUS_MILES = 500
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 1000
+
+# entity -> (model returned, [(geocoded model, attribute holding the entity id)])
+ENTITIES = {
+    'client': (Client, [(Client, 'id'), (ClientAddress, 'client_id')]),
+    'vendor': (Vendor, [(Vendor, 'id'), (VendorAddress, 'vendor_id')]),
+}
+RESULT_FIELDS = ('id', 'name', 'city', 'state', 'zipcode')
+
+
+class GeoError(ValueError):
+    pass
+
+
+def bounding_box(lat, lon, miles):
+    """Q on latitude/longitude matching a box that contains every point within `miles`."""
+    angle = miles / EARTH_RADIUS_MILES
+    dlat = math.degrees(angle)
+    box = Q(latitude__gte=lat - dlat, latitude__lte=lat + dlat)
+    if abs(lat) + dlat >= 90:
+        return box  # the circle covers a pole: every longitude
+    dlon = math.degrees(math.asin(math.sin(angle) / math.cos(math.radians(lat))))
+    west, east = lon - dlon, lon + dlon
+    if west < -180:  # wraps across the antimeridian
+        return box & (Q(longitude__gte=west + 360) | Q(longitude__lte=east))
+    if east > 180:
+        return box & (Q(longitude__gte=west) | Q(longitude__lte=east - 360))
+    return box & Q(longitude__gte=west, longitude__lte=east)
+
+
+def within(lat, lon, lats, lons, miles):
+    """[(index, distance)] of the points of lats/lons within `miles` of (lat, lon)."""
+    if not lats:
+        return []
+    if np is None:
+        distances = [_haversine(lat, lon, la, lo) for la, lo in zip(lats, lons)]
+        return [(i, d) for i, d in enumerate(distances) if d <= miles]
+
+    lat1, lon1 = math.radians(lat), math.radians(lon)
+    lat2, lon2 = np.radians(np.asarray(lats)), np.radians(np.asarray(lons))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    distances = 2 * EARTH_RADIUS_MILES * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+    hits = np.flatnonzero(distances <= miles)
+    return list(zip(hits.tolist(), distances[hits].tolist()))
+
+
+def _haversine(lat, lon, lat2, lon2):
+    lat1, lat2 = math.radians(lat), math.radians(lat2)
+    a = (math.sin((lat2 - lat1) / 2) ** 2
+         + math.cos(lat1) * math.cos(lat2) * math.sin(math.radians(lon2 - lon) / 2) ** 2)
+    return 2 * EARTH_RADIUS_MILES * math.asin(math.sqrt(min(a, 1.0)))
+
+
+def radius_search(entity, lat, lon, miles, limit=DEFAULT_LIMIT):
+    """
+    Return (results, total): the `limit` nearest clients or vendors within
+    `miles` of (lat, lon), nearest first, as RESULT_FIELDS plus distance_miles.
+    """
+    if entity not in ENTITIES:
+        raise GeoError(f"Entity must be one of {', '.join(ENTITIES)}")
+    if not 0 < miles <= MAX_RADIUS_MILES:
+        raise GeoError(f'Miles must be between 0 and {MAX_RADIUS_MILES}')
+    model, sources = ENTITIES[entity]
+
+    box = bounding_box(lat, lon, miles)
+    nearest = {}
+    for source, attr in sources:
+        owners, lats, lons = [], [], []
+        for owner, la, lo in source.objects.filter(box).values_list(attr, 'latitude', 'longitude').iterator():
+            owners.append(owner)
+            lats.append(la)
+            lons.append(lo)
+        for index, distance in within(lat, lon, lats, lons, miles):
+            owner = owners[index]
+            if distance < nearest.get(owner, math.inf):
+                nearest[owner] = distance
+
+    page = sorted(nearest.items(), key=lambda item: (item[1], item[0]))[:limit]
+    rows = {row['id']: row for row in model.objects.filter(id__in=[pk for pk, _ in page]).values(*RESULT_FIELDS)}
+    results = [{**rows[pk], 'distance_miles': round(distance, 2)} for pk, distance in page if pk in rows]
+    return results, len(nearest)
@@ -0,0 +1,6 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('RadiusSearch/', views.radius_search, name='radius_search'),
+]
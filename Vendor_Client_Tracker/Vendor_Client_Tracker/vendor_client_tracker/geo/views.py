@@ -0,0 +1,62 @@
+import math
+
+from rest_framework import status
+from rest_framework.decorators import api_view
+from rest_framework.response import Response
+
+from vendor_client_tracker.pagination import parse_limit
+from . import search
+from .geocoding import locate
+from .models import ZipCentroid
+
+
+def _coordinate(value, name, bound):
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f'{name} must be a number')
+    if not math.isfinite(number) or abs(number) > bound:
+        raise ValueError(f'{name} must be between -{bound} and {bound}')
+    return number
+
+
+def _center(data):
+    if data.get('Latitude') not in (None, '') or data.get('Longitude') not in (None, ''):
+        return _coordinate(data.get('Latitude'), 'Latitude', 90), _coordinate(data.get('Longitude'), 'Longitude', 180)
+    if not (data.get('Zip') or data.get('City')):
+        raise ValueError('Zip, City and State, or Latitude and Longitude is required')
+    point = locate(ZipCentroid, data.get('Zip'), data.get('City'), data.get('State'))
+    if point is None:
+        raise ValueError('Location not found')
+    return point
+
+
+# ---------- Radius search ----------
+@api_view(['POST'])
+def radius_search(request):
+    """
+    Body: {"Entity": "client" | "vendor", "Zip": "75201" | "City": "Dallas", "State": "TX"
+           | "Latitude": 32.78, "Longitude": -96.80, "Miles": 50, "Limit": 100}
+    Clients or vendors with an address within Miles of the center, nearest first.
+    """
+    data = request.data
+    entity = data.get('Entity') or 'client'
+    if not isinstance(entity, str):
+        return Response({'error': f"Entity must be one of {', '.join(search.ENTITIES)}"},
+                        status=status.HTTP_400_BAD_REQUEST)
+    try:
+        lat, lon = _center(data)
+        miles = float(data.get('Miles') or 0)
+    except (TypeError, ValueError) as exc:
+        return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+    limit = parse_limit(data.get('Limit'), search.DEFAULT_LIMIT, search.MAX_LIMIT)
+    try:
+        results, total = search.radius_search(entity, lat, lon, miles, limit)
+    except search.GeoError as exc:
+        return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+    return Response({
+        'center': {'latitude': lat, 'longitude': lon},
+        'miles': miles,
+        'total': total,
+        'results': results,
+    }, status=status.HTTP_200_OK)
@@ -0,0 +1,230 @@
+"""
+Import job execution for the DB-backed worker (see run_import_worker).
+
+Jobs are claimed with a conditional UPDATE on their status, so several worker
+processes can poll the same table without an external broker. Each file is
+streamed row by row and written in batches; progress and row-level errors are
+saved on the job in the same transaction as every batch, together with a
+heartbeat. A running job whose heartbeat is older than STALE_AFTER (its worker
+died) is requeued and resumes after its last committed batch, or is failed
+once it has been attempted MAX_ATTEMPTS times.
+"""
+
+import re
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from clients.domain_constants import DOMAIN_CHOICES
+from clients.models import Client
+from clients.serializers import ClientSerializer
+from geo.geocoding import geocode
+from geo.models import ZipCentroid
+from sales.consultant_import import FIELD_MAP, import_consultants
+from vendors.models import Vendor
+from vendors.serializers import VendorSerializer
+from .models import ImportJob
+from .readers import count_rows, iter_rows
+
+BATCH_SIZE = 500
+MAX_STORED_ERRORS = 1000
+STALE_AFTER = timedelta(minutes=10)
+MAX_ATTEMPTS = 3
+
+
+def _key(header):
+    return re.sub(r'[^a-z0-9]', '', header.lower())
+
+
+# ---------- Consultants ----------
+CONSULTANT_COLUMNS = {_key(k): k for k in FIELD_MAP}
+CONSULTANT_COLUMNS.update({_key(field): k for k, field in FIELD_MAP.items()})
+CONSULTANT_COLUMNS.update({'priority': 'priority', 'skill': 'SkillId', 'visa': 'VisaStatus'})
+ADDRESS_COLUMNS = {'street': 'Street', 'city': 'City', 'state': 'State', 'zipcode': 'Zipcode', 'zip': 'Zipcode'}
+EDUCATION_COLUMNS = {
+    'educationtype': 'Type', 'degree': 'Type', 'universityname': 'UniversityName', 'university': 'UniversityName',
+    'major': 'Major', 'yearofcompletion': 'YearOfCompletion',
+}
+
+
+def _consultant_record(row):
+    record, address, education = {}, {}, {}
+    for header, value in row.items():
+        key = _key(header)
+        if key in CONSULTANT_COLUMNS:
+            record[CONSULTANT_COLUMNS[key]] = value
+        elif key in ADDRESS_COLUMNS:
+            address[ADDRESS_COLUMNS[key]] = value
+        elif key in EDUCATION_COLUMNS:
+            education[EDUCATION_COLUMNS[key]] = value
+    if any(address.values()):
+        record['AddrInfo'] = address
+    if any(education.values()):
+        record['ListOfEdu'] = [education]
+    if record.get('priority') is None:
+        record.pop('priority', None)
+    return record
+
+
+def import_consultant_rows(batch):
+    results = import_consultants([_consultant_record(row) for _, row in batch])
+    errors = []
+    for (row_number, _), result in zip(batch, results):
+        if result['status'] == 'duplicate':
+            errors.append({'row': row_number, 'errors': {result['reason']: ['Duplicate consultant']}})
+        elif result['status'] == 'invalid':
+            errors.append({'row': row_number, 'errors': result['errors']})
+    return sum(1 for r in results if r['status'] == 'created'), errors
+
+
+# ---------- Vendors / Clients ----------
+class VendorImportSerializer(VendorSerializer):
+    # name uniqueness is checked for the whole batch in import_vendor_rows
+    class Meta(VendorSerializer.Meta):
+        extra_kwargs = {'name': {'validators': []}}
+
+
+def _model_columns(model, aliases):
+    columns = {
+        _key(f.name): f.name for f in model._meta.concrete_fields
+        if f.editable and f.name not in ('id', 'created_at', 'updated_at')
+    }
+    columns.update(aliases)
+    return columns
+
+
+VENDOR_COLUMNS = _model_columns(Vendor, {'vendorname': 'name', 'vendor': 'name', 'linkedin': 'linkedin_url'})
+CLIENT_COLUMNS = _model_columns(Client, {'clientname': 'name', 'client': 'name', 'domain': 'domain_name'})
+
+
+def _map_row(row, columns):
+    return {columns[_key(h)]: v for h, v in row.items() if _key(h) in columns and v is not None}
+
+
+def import_vendor_rows(batch):
+    valid, errors = [], []
+    for row_number, row in batch:
+        serializer = VendorImportSerializer(data=_map_row(row, VENDOR_COLUMNS))
+        if serializer.is_valid():
+            valid.append((row_number, serializer.validated_data))
+        else:
+            errors.append({'row': row_number, 'errors': serializer.errors})
+
+    names = {data['name'] for _, data in valid}
+    taken = set(Vendor.objects.filter(name__in=names).values_list('name', flat=True))
+    vendors = []
+    for row_number, data in valid:
+        if data['name'] in taken:
+            errors.append({'row': row_number, 'errors': {'name': ['vendor with this name already exists.']}})
+            continue
+        taken.add(data['name'])
+        vendors.append(Vendor(**data))
+    geocode(vendors, ZipCentroid)  # bulk_create skips save()
+    Vendor.objects.bulk_create(vendors)
+    return len(vendors), errors
+
+
+def import_client_rows(batch):
+    clients, errors = [], []
+    for row_number, row in batch:
+        data = _map_row(row, CLIENT_COLUMNS)
+        domain_id = data.get('domain_id')
+        if domain_id:
+            try:
+                data['domain_name'] = DOMAIN_CHOICES[int(domain_id) - 1]
+            except (ValueError, IndexError):
+                errors.append({'row': row_number, 'errors': {'domain_id': ['Invalid domain_id']}})
+                continue
+        serializer = ClientSerializer(data=data)
+        if serializer.is_valid():
+            client = Client(**serializer.validated_data)
+            client.set_location_keys()  # bulk_create skips save()
+            clients.append(client)
+        else:
+            errors.append({'row': row_number, 'errors': serializer.errors})
+    geocode(clients, ZipCentroid)
+    Client.objects.bulk_create(clients)
+    return len(clients), errors
+
+
+HANDLERS = {
+    'consultant': import_consultant_rows,
+    'vendor': import_vendor_rows,
+    'client': import_client_rows,
+}
+
+
+# ---------- Worker ----------
+def reclaim_stale_jobs():
+    """Requeue (or fail, after MAX_ATTEMPTS) running jobs whose worker stopped sending heartbeats."""
+    cutoff = timezone.now() - STALE_AFTER
+    stale = Q(status='running') & (Q(heartbeat_at__lt=cutoff) | Q(heartbeat_at__isnull=True, started_at__lt=cutoff))
+    for job_id, attempts in ImportJob.objects.filter(stale).values_list('id', 'attempts'):
+        if attempts >= MAX_ATTEMPTS:
+            ImportJob.objects.filter(stale, id=job_id).update(
+                status='failed', finished_at=timezone.now(),
+                message=f'Worker stopped responding ({attempts} attempts)',
+            )
+        else:
+            ImportJob.objects.filter(stale, id=job_id).update(status='queued')
+
+
+def claim_next_job():
+    """Atomically move the oldest queued job to running and return it (or None)."""
+    reclaim_stale_jobs()
+    queued = ImportJob.objects.filter(status='queued').order_by('created_at').values_list('id', flat=True)
+    for job_id in queued[:10]:
+        now = timezone.now()
+        claimed = ImportJob.objects.filter(id=job_id, status='queued').update(
+            status='running', started_at=now, heartbeat_at=now, attempts=F('attempts') + 1,
+        )
+        if claimed:
+            return ImportJob.objects.get(id=job_id)
+    return None
+
+
+def _flush(job, handler, batch):
+    # the batch and the progress that records it commit together, so a requeued job resumes exactly after it
+    with transaction.atomic():
+        created, errors = handler(batch)
+        errors.sort(key=lambda e: e['row'])
+        job.processed_rows += len(batch)
+        job.created_rows += created
+        job.error_rows += len(errors)
+        room = MAX_STORED_ERRORS - len(job.errors)
+        if room > 0:
+            job.errors.extend(errors[:room])
+        job.heartbeat_at = timezone.now()
+        job.save(update_fields=['processed_rows', 'created_rows', 'error_rows', 'errors', 'heartbeat_at'])
+
+
+def run_job(job):
+    handler = HANDLERS[job.kind]
+    name = job.original_name or job.file.name
+    try:
+        with job.file.open('rb') as f:
+            job.total_rows = count_rows(f, name)
+        job.heartbeat_at = timezone.now()
+        job.save(update_fields=['total_rows', 'heartbeat_at'])
+
+        with job.file.open('rb') as f:
+            batch = []
+            for row_number, row in enumerate(iter_rows(f, name), start=1):
+                if row_number <= job.processed_rows:
+                    continue  # committed before a previous attempt died
+                batch.append((row_number, row))
+                if len(batch) >= BATCH_SIZE:
+                    _flush(job, handler, batch)
+                    batch = []
+            if batch:
+                _flush(job, handler, batch)
+        job.status = 'completed'
+    except Exception as exc:
+        job.status = 'failed'
+        job.message = str(exc)
+
+    job.finished_at = timezone.now()
+    job.save(update_fields=['status', 'message', 'finished_at'])
+    return job
@@ -0,0 +1,28 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from imports.jobs import claim_next_job, run_job
+
+
+class Command(BaseCommand):
+    help = "Process queued consultant/vendor/client import jobs (no external broker needed)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Drain the queue once and exit.')
+        parser.add_argument('--poll-interval', type=float, default=2.0, help='Seconds to sleep when the queue is empty.')
+
+    def handle(self, *args, **options):
+        while True:
+            job = claim_next_job()
+            if job is None:
+                if options['once']:
+                    return
+                time.sleep(options['poll_interval'])
+                continue
+
+            self.stdout.write(f"Running {job}")
+            job = run_job(job)
+            self.stdout.write(
+                f"{job}: {job.processed_rows} rows, {job.created_rows} created, {job.error_rows} errors"
+            )
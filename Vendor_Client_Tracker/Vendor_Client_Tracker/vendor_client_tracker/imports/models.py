@@ -0,0 +1,40 @@
+from django.db import models
+
+
+class ImportJob(models.Model):
+    KIND_CHOICES = [
+        ('consultant', 'Consultant'),
+        ('vendor', 'Vendor'),
+        ('client', 'Client'),
+    ]
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('completed', 'Completed'),
+        ('failed', 'Failed'),
+    ]
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    file = models.FileField(upload_to='imports/')
+    original_name = models.CharField(max_length=255, blank=True, null=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='queued')
+    total_rows = models.PositiveIntegerField(blank=True, null=True)
+    processed_rows = models.PositiveIntegerField(default=0)
+    created_rows = models.PositiveIntegerField(default=0)
+    error_rows = models.PositiveIntegerField(default=0)
+    errors = models.JSONField(default=list, blank=True)  # [{"row": n, "errors": {...}}], capped
+    message = models.TextField(blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(blank=True, null=True)
+    heartbeat_at = models.DateTimeField(blank=True, null=True)  # refreshed by the worker after every batch
+    attempts = models.PositiveIntegerField(default=0)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        indexes = [
+            # the worker polls for the oldest queued job
+            models.Index(fields=['status', 'created_at'], name='imports_job_status_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} import #{self.pk} ({self.status})"
@@ -0,0 +1,80 @@
+"""
+Row-by-row readers for uploaded CSV and XLSX files.
+
+Both readers yield one dict per data row keyed by the header row, so a file of
+any size is processed with constant memory. XLSX support needs openpyxl.
+"""
+
+import csv
+import io
+from datetime import date, datetime
+from decimal import Decimal
+
+SUPPORTED_EXTENSIONS = ('.csv', '.xlsx')
+
+
+def _cell(value):
+    """Normalise a spreadsheet cell into what the DRF serializers accept."""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.date().isoformat() if value.time() == datetime.min.time() else value.isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))  # phone numbers / SSNs typed as numbers
+    if isinstance(value, (int, float, Decimal)) and not isinstance(value, bool):
+        return str(value)
+    if isinstance(value, str):
+        value = value.strip()
+        return value or None
+    return value
+
+
+def _rows(header, values_iter):
+    header = [str(h).strip() if h is not None else '' for h in header]
+    for values in values_iter:
+        row = {h: _cell(v) for h, v in zip(header, values) if h}
+        if any(v is not None for v in row.values()):
+            yield row
+
+
+def _open_csv(file):
+    return io.TextIOWrapper(file, encoding='utf-8-sig', newline='')
+
+
+def _load_xlsx(file):
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise ValueError('openpyxl is required to import .xlsx files')
+    return load_workbook(file, read_only=True, data_only=True)
+
+
+def iter_rows(file, name):
+    """Yield {header: value} dicts from an open binary file."""
+    if name.lower().endswith('.xlsx'):
+        workbook = _load_xlsx(file)
+        try:
+            values = workbook.active.iter_rows(values_only=True)
+            header = next(values, None)
+            if header:
+                yield from _rows(header, values)
+        finally:
+            workbook.close()
+    else:
+        reader = csv.reader(_open_csv(file))
+        header = next(reader, None)
+        if header:
+            yield from _rows(header, reader)
+
+
+def count_rows(file, name):
+    """Cheap data-row estimate used for progress reporting."""
+    if name.lower().endswith('.xlsx'):
+        workbook = _load_xlsx(file)
+        try:
+            return max((workbook.active.max_row or 1) - 1, 0)
+        finally:
+            workbook.close()
+    return max(sum(1 for _ in csv.reader(_open_csv(file))) - 1, 0)
@@ -0,0 +1,7 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('UploadImport/', views.upload_import, name='upload_import'),
+    path('GetImportStatus/<int:job_id>/', views.get_import_status, name='get_import_status'),
+]
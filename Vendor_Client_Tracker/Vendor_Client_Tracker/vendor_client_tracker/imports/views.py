@@ -0,0 +1,68 @@
+import os
+
+from rest_framework.decorators import api_view
+from rest_framework.response import Response
+from rest_framework import status
+from django.utils import timezone
+from .models import ImportJob
+from .readers import SUPPORTED_EXTENSIONS
+
+
+# ---------- Upload ----------
+@api_view(['POST'])
+def upload_import(request):
+    """
+    POST /import/UploadImport/ (multipart)
+    file: .csv or .xlsx, kind: consultant | vendor | client
+    The file is stored and queued for the import worker (manage.py run_import_worker).
+    """
+    upload = request.FILES.get('file')
+    kind = request.data.get('kind')
+
+    if not upload:
+        return Response({'error': 'file is required'}, status=status.HTTP_400_BAD_REQUEST)
+    if kind not in dict(ImportJob.KIND_CHOICES):
+        return Response({'error': 'kind must be one of consultant, vendor, client'}, status=status.HTTP_400_BAD_REQUEST)
+    if os.path.splitext(upload.name)[1].lower() not in SUPPORTED_EXTENSIONS:
+        return Response({'error': 'Only .csv and .xlsx files are supported'}, status=status.HTTP_400_BAD_REQUEST)
+
+    job = ImportJob.objects.create(kind=kind, file=upload, original_name=upload.name)
+    return Response({'message': 'Import queued', 'job_id': job.id, 'status': job.status},
+                    status=status.HTTP_202_ACCEPTED)
+
+
+# ---------- Status ----------
+@api_view(['GET'])
+def get_import_status(request, job_id):
+    try:
+        job = ImportJob.objects.get(id=job_id)
+    except ImportJob.DoesNotExist:
+        return Response({'error': 'Import job not found'}, status=status.HTTP_404_NOT_FOUND)
+
+    progress = None
+    if job.total_rows:
+        progress = round(100.0 * job.processed_rows / job.total_rows, 1)
+
+    rows_per_second = None
+    if job.started_at:
+        elapsed = ((job.finished_at or timezone.now()) - job.started_at).total_seconds()
+        if elapsed > 0:
+            rows_per_second = round(job.processed_rows / elapsed, 1)
+
+    return Response({
+        'job_id': job.id,
+        'kind': job.kind,
+        'file_name': job.original_name,
+        'status': job.status,
+        'message': job.message,
+        'total_rows': job.total_rows,
+        'processed_rows': job.processed_rows,
+        'created_rows': job.created_rows,
+        'error_rows': job.error_rows,
+        'progress_percent': progress,
+        'rows_per_second': rows_per_second,
+        'created_at': job.created_at,
+        'started_at': job.started_at,
+        'finished_at': job.finished_at,
+        'errors': job.errors,
+    }, status=status.HTTP_200_OK)
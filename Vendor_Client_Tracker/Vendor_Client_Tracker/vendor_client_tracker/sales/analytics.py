@@ -0,0 +1,158 @@
+"""
+Submission analytics: counts over an arbitrary date range, grouped by any
+mix of dimensions and bucketed by day/week/month in SQL.
+
+Queries whose dimensions are all covered by SubmissionDailyRollup are answered
+from the rollup; the rest (prime_vendor, implementation_partner) aggregate
+Submission with an index-friendly submission_date range. Results are cached
+per query signature and version; submission writes bump the version (a
+Version row shared by every worker process) once they commit.
+"""
+
+import hashlib
+import json
+from datetime import datetime, time, timedelta
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDay, TruncMonth, TruncWeek
+from django.utils import timezone
+
+from adminpanel.models import Marketer
+from clients.models import Client
+from vendors.models import Vendor
+from vendor_client_tracker.models import Version
+from .models import Consultant, Skill, Submission, SubmissionDailyRollup
+
+CACHE_TIMEOUT = 300
+VERSION_NAME = 'submission-analytics'
+
+# dimension -> (Submission id field, model used to resolve names, name field)
+DIMENSIONS = {
+    'consultant': ('consultant_id', Consultant, None),
+    'vendor': ('vendor_id', Vendor, 'name'),
+    'prime_vendor': ('prime_vendor_id', Vendor, 'name'),
+    'implementation_partner': ('implementation_partner_id', Vendor, 'name'),
+    'end_client': ('end_client_id', Client, 'name'),
+    'marketer': ('marketer_id', Marketer, 'name'),
+    'skill': ('skill_id', Skill, 'name'),
+    'vendor_response': ('vendor_response', None, None),
+}
+ROLLUP_DIMENSIONS = {'consultant', 'vendor', 'end_client', 'marketer', 'skill', 'vendor_response'}
+BUCKETS = {'day': TruncDay, 'week': TruncWeek, 'month': TruncMonth}
+
+
+class AnalyticsError(ValueError):
+    pass
+
+
+def parse_query(data):
+    """Validate request data into (start, end, group_by, bucket)."""
+    try:
+        end = datetime.strptime(data['EndDate'], '%Y-%m-%d').date() if data.get('EndDate') else timezone.localdate()
+        start = datetime.strptime(data['StartDate'], '%Y-%m-%d').date() if data.get('StartDate') else end - timedelta(days=30)
+    except (TypeError, ValueError):
+        raise AnalyticsError('StartDate and EndDate must be YYYY-MM-DD')
+    if start > end:
+        raise AnalyticsError('StartDate must not be after EndDate')
+
+    group_by = data.get('GroupBy') or []
+    if isinstance(group_by, str):
+        group_by = [g.strip() for g in group_by.split(',') if g.strip()]
+    if not isinstance(group_by, list) or not all(isinstance(g, str) for g in group_by):
+        raise AnalyticsError('GroupBy must be a list of dimension names')
+    unknown = [g for g in group_by if g not in DIMENSIONS]
+    if unknown:
+        raise AnalyticsError(f"Unknown GroupBy dimension(s): {', '.join(unknown)}")
+
+    bucket = data.get('Bucket') or None
+    if bucket and (not isinstance(bucket, str) or bucket not in BUCKETS):
+        raise AnalyticsError('Bucket must be one of day, week, month')
+    return start, end, list(dict.fromkeys(group_by)), bucket
+
+
+def bump_version():
+    # after commit: a bump inside the write's transaction would hold the row lock until it ends
+    transaction.on_commit(lambda: Version.bump(VERSION_NAME))
+
+
+def submission_analytics(start, end, group_by, bucket):
+    version = Version.current(VERSION_NAME)[0]
+    signature = json.dumps([str(start), str(end), sorted(group_by), bucket, version])
+    key = 'submission-analytics:' + hashlib.sha1(signature.encode()).hexdigest()
+
+    result = cache.get(key)
+    if result is None:
+        result = _run(start, end, group_by, bucket)
+        cache.set(key, result, CACHE_TIMEOUT)
+    return result
+
+
+def _run(start, end, group_by, bucket):
+    if set(group_by) <= ROLLUP_DIMENSIONS:
+        source = 'rollup'
+        rows = SubmissionDailyRollup.objects.filter(day__gte=start, day__lte=end)
+        date_field, total = 'day', Sum('count')
+    else:
+        source = 'submissions'
+        rows = Submission.objects.filter(
+            submission_date__gte=_day_start(start), submission_date__lt=_day_start(end + timedelta(days=1))
+        )
+        date_field, total = 'submission_date', Count('id')
+
+    fields = [DIMENSIONS[g][0] for g in group_by]
+    if bucket:
+        rows = rows.annotate(bucket=BUCKETS[bucket](date_field))
+        fields.insert(0, 'bucket')
+
+    if fields:
+        rows = list(rows.order_by().values(*fields).annotate(count=total).filter(count__gt=0).order_by(*fields))
+    else:
+        rows = [{'count': rows.aggregate(count=total)['count'] or 0}]
+    names = _resolve_names(group_by, rows)
+
+    results = []
+    for row in rows:
+        item = {}
+        if bucket:
+            item['bucket'] = row['bucket'].isoformat()[:10]
+        for dimension in group_by:
+            value = row[DIMENSIONS[dimension][0]] or None  # rollup stores "none" as 0
+            if DIMENSIONS[dimension][1] is None:
+                item[dimension] = value
+            else:
+                item[dimension] = {'id': value, 'name': names[dimension].get(value)}
+        item['count'] = row['count']
+        results.append(item)
+
+    return {
+        'start': str(start),
+        'end': str(end),
+        'group_by': group_by,
+        'bucket': bucket,
+        'source': source,
+        'total': sum(row['count'] for row in rows),
+        'results': results,
+    }
+
+
+def _resolve_names(group_by, rows):
+    names = {}
+    for dimension in group_by:
+        field, model, name_field = DIMENSIONS[dimension]
+        if model is None:
+            continue
+        ids = {row[field] for row in rows if row[field]}
+        if model is Consultant:
+            names[dimension] = {
+                c['id']: f"{c['first_name']} {c['last_name']}"
+                for c in Consultant.objects.filter(id__in=ids).values('id', 'first_name', 'last_name')
+            }
+        else:
+            names[dimension] = dict(model.objects.filter(id__in=ids).values_list('id', name_field))
+    return names
+
+
+def _day_start(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
@@ -0,0 +1,242 @@
+"""
+Compressed bitmap of non-negative integer ids, after the Roaring layout.
+
+Ids are split into chunks of 2**16 by their high bits; only chunks holding
+at least one id are stored. A chunk with at most ARRAY_MAX ids is a sorted
+array('H') of their low 16 bits (2 bytes per id); a denser chunk is a Python
+int bitset of at most 8 KB. A facet value held by a few consultants spread
+over a large id range therefore costs a few bytes per member instead of one
+bit per possible id, and dense chunks still combine with C-speed big-int
+operations.
+
+Bitmaps returned by & and | may hold chunks in either form and may share
+chunks with their operands (copy() one before mutating it); add() and
+discard() keep the stored form matched to the chunk's cardinality.
+"""
+
+from array import array
+from bisect import bisect_left
+
+try:
+    import numpy as np
+except ImportError:  # intersection counts fall back to Python sets
+    np = None
+
+CHUNK_BITS = 16
+LOW_MASK = (1 << CHUNK_BITS) - 1
+ARRAY_MAX = 4096  # above this a bitset (8 KB) is smaller than an array
+
+# byte value -> positions of its set bits
+_BYTE_BITS = [tuple(bit for bit in range(8) if byte >> bit & 1) for byte in range(256)]
+
+
+def _bits(bitset):
+    """Sorted low ids set in an int bitset."""
+    data = bitset.to_bytes((bitset.bit_length() + 7) // 8, 'little')
+    return [(offset << 3) + bit for offset, byte in enumerate(data) if byte for bit in _BYTE_BITS[byte]]
+
+
+def _mask(container):
+    """numpy bool array over the 2**16 low ids of a chunk."""
+    if isinstance(container, int):
+        data = np.frombuffer(container.to_bytes(1 << (CHUNK_BITS - 3), 'little'), dtype=np.uint8)
+        return np.unpackbits(data, bitorder='little').view(bool)
+    mask = np.zeros(1 << CHUNK_BITS, dtype=bool)
+    mask[np.frombuffer(container, dtype=np.uint16)] = True
+    return mask
+
+
+def _to_int(values):
+    """Int bitset of sorted low ids."""
+    if not values:
+        return 0
+    buf = bytearray(values[-1] // 8 + 1)
+    for low in values:
+        buf[low >> 3] |= 1 << (low & 7)
+    return int.from_bytes(buf, 'little')
+
+
+def _fit(container):
+    """Store a chunk in the smaller form for its cardinality; None when empty."""
+    if isinstance(container, int):
+        count = container.bit_count()
+        if not count:
+            return None
+        return array('H', _bits(container)) if count <= ARRAY_MAX else container
+    if not container:
+        return None
+    return _to_int(container) if len(container) > ARRAY_MAX else container
+
+
+def _count(container):
+    return container.bit_count() if isinstance(container, int) else len(container)
+
+
+def _and(a, b):
+    if isinstance(a, int) and isinstance(b, int):
+        return a & b or None
+    if isinstance(a, int) or isinstance(b, int):
+        # the result is no larger than the array side, so it fits an array again
+        return _fit((a if isinstance(a, int) else _to_int(a)) & (b if isinstance(b, int) else _to_int(b)))
+    if len(a) > len(b):
+        a, b = b, a
+    result = array('H', filter(set(b).__contains__, a))
+    return result or None
+
+
+def _or(a, b):
+    if isinstance(a, int) or isinstance(b, int):
+        return (a if isinstance(a, int) else _to_int(a)) | (b if isinstance(b, int) else _to_int(b))
+    merged = sorted(set(a).union(b))
+    return _to_int(merged) if len(merged) > ARRAY_MAX else array('H', merged)
+
+
+class Bitmap:
+    __slots__ = ('chunks',)
+
+    def __init__(self, chunks=None):
+        self.chunks = chunks if chunks is not None else {}  # high bits -> array('H') or int
+
+    @classmethod
+    def from_ids(cls, ids):
+        grouped = {}
+        for pk in ids:
+            grouped.setdefault(pk >> CHUNK_BITS, []).append(pk & LOW_MASK)
+        chunks = {}
+        for high, lows in grouped.items():
+            lows = sorted(set(lows))
+            chunks[high] = _to_int(lows) if len(lows) > ARRAY_MAX else array('H', lows)
+        return cls(chunks)
+
+    def copy(self):
+        return Bitmap({high: c if isinstance(c, int) else array('H', c) for high, c in self.chunks.items()})
+
+    def __len__(self):
+        return sum(_count(c) for c in self.chunks.values())
+
+    def __bool__(self):
+        return bool(self.chunks)
+
+    def __contains__(self, pk):
+        container = self.chunks.get(pk >> CHUNK_BITS)
+        if container is None:
+            return False
+        low = pk & LOW_MASK
+        if isinstance(container, int):
+            return bool(container >> low & 1)
+        i = bisect_left(container, low)
+        return i < len(container) and container[i] == low
+
+    # ---------- Mutation ----------
+    def add(self, pk):
+        high, low = pk >> CHUNK_BITS, pk & LOW_MASK
+        container = self.chunks.get(high)
+        if container is None:
+            self.chunks[high] = array('H', [low])
+        elif isinstance(container, int):
+            self.chunks[high] = container | (1 << low)
+        else:
+            i = bisect_left(container, low)
+            if i == len(container) or container[i] != low:
+                container.insert(i, low)
+                if len(container) > ARRAY_MAX:
+                    self.chunks[high] = _to_int(container)
+
+    def discard(self, pk):
+        high, low = pk >> CHUNK_BITS, pk & LOW_MASK
+        container = self.chunks.get(high)
+        if container is None:
+            return
+        if isinstance(container, int):
+            container &= ~(1 << low)
+            if container.bit_count() <= ARRAY_MAX:
+                container = _fit(container)
+        else:
+            i = bisect_left(container, low)
+            if i < len(container) and container[i] == low:
+                del container[i]
+        if container:
+            self.chunks[high] = container
+        else:
+            del self.chunks[high]
+
+    # ---------- Set operations ----------
+    def __and__(self, other):
+        chunks = {}
+        for high in self.chunks.keys() & other.chunks.keys():
+            container = _and(self.chunks[high], other.chunks[high])
+            if container is not None:
+                chunks[high] = container
+        return Bitmap(chunks)
+
+    def __or__(self, other):
+        chunks = dict(self.chunks)
+        for high, container in other.chunks.items():
+            chunks[high] = _or(chunks[high], container) if high in chunks else container
+        return Bitmap(chunks)
+
+    def counter(self):
+        """
+        Return count(bitmap) -> len(bitmap & self) without building the
+        intersection. The alternate forms of this bitmap's chunks are made
+        once and shared by every call, which is what a facet's per-value counts need.
+        Array chunks are looked up in a numpy mask of this chunk when numpy is
+        installed, otherwise in a set of its ids.
+        """
+        as_int, as_set, as_mask = {}, {}, {}
+
+        def chunk_int(high):
+            if high not in as_int:
+                container = self.chunks[high]
+                as_int[high] = container if isinstance(container, int) else _to_int(container)
+            return as_int[high]
+
+        def chunk_set(high):
+            if high not in as_set:
+                container = self.chunks[high]
+                as_set[high] = set(_bits(container) if isinstance(container, int) else container)
+            return as_set[high]
+
+        def chunk_mask(high):
+            if high not in as_mask:
+                as_mask[high] = _mask(self.chunks[high])
+            return as_mask[high]
+
+        def count(bitmap):
+            total = 0
+            for high, container in bitmap.chunks.items():
+                if high not in self.chunks:
+                    continue
+                if isinstance(container, int):
+                    total += (container & chunk_int(high)).bit_count()
+                elif np is not None:
+                    total += int(np.count_nonzero(chunk_mask(high)[np.frombuffer(container, dtype=np.uint16)]))
+                else:
+                    total += len(chunk_set(high).intersection(container))
+            return total
+
+        return count
+
+    def ids_desc(self, before=None, limit=None):
+        """Up to `limit` ids below `before` (or all), highest first."""
+        ids = []
+        for high in sorted(self.chunks, reverse=True):
+            base = high << CHUNK_BITS
+            if before is not None and base >= before:
+                continue
+            container = self.chunks[high]
+            bound = before - base if before is not None and before - base <= LOW_MASK else None
+            if isinstance(container, int):
+                if bound is not None:
+                    container &= (1 << bound) - 1
+                while container and (limit is None or len(ids) < limit):
+                    top = container.bit_length() - 1
+                    ids.append(base + top)
+                    container ^= 1 << top
+            else:
+                end = bisect_left(container, bound) if bound is not None else len(container)
+                start = end - (limit - len(ids)) if limit is not None else 0
+                ids.extend(base + low for low in reversed(container[max(start, 0):end]))
+            if limit is not None and len(ids) >= limit:
+                break
+        return ids
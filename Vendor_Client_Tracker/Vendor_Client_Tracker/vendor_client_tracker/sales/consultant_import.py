@@ -0,0 +1,238 @@
+"""
+Set-based batch engine behind AddConsultant.
+
+Every record is mapped and validated up front without touching the database,
+duplicates are found with a handful of IN queries for the whole batch, and the
+accepted rows are written with bulk_create in chunks inside one transaction.
+A chunk that hits a unique constraint (a concurrent insert between the check
+and the write) is retried row by row. Each input record gets an entry in the
+returned per-row report.
+"""
+
+from django.db import IntegrityError, transaction
+from rest_framework import serializers
+
+from . import dedupe, facets, matching, search
+from .lookups import lookups
+from .models import Skill, Visa, Consultant, ConsultantAddress, ConsultantEducation
+from .serializers import ConsultantSerializer
+
+CHUNK_SIZE = 500
+DUPLICATE_REASONS = ('email', 'ssn')  # in Consultant.UNIQUE_KEY_FIELDS order
+
+# incoming PascalCase key -> model field
+FIELD_MAP = {
+    'Email': 'email',
+    'FirstName': 'first_name',
+    'MiddleName': 'middle_name',
+    'LastName': 'last_name',
+    'DOB': 'dob',
+    'SSN': 'ssn',
+    'PhoneNumber': 'phone_number',
+    'OtherPhoneNumber': 'other_phone_number',
+    'SkypeId': 'skype_id',
+    'SkillId': 'skill',
+    'ExpectedRate': 'expected_rate',
+    'VisaStatus': 'visa_status',
+    'PassportNumber': 'passport_number',
+    'Exp': 'exp',
+    'GK': 'gk',
+    'GKMoveInDate': 'gk_move_in_date',
+    'USEntryDate': 'us_entry_date',
+    'Recruiter': 'recruiter',
+    'Active': 'active',
+    'StreetAddress': 'street_address',
+    'PrefLocation': 'pref_location',
+}
+
+
+def map_consultant_record(data):
+    """Translate one AddConsultant payload record into ConsultantSerializer input."""
+    mapped = {field: data.get(key) for key, field in FIELD_MAP.items()}
+    mapped['priority'] = data.get('priority', 0)  # default if not provided
+
+    if 'AddrInfo' in data:
+        addr = data.get('AddrInfo') or {}
+        mapped['address'] = {
+            'street': addr.get('Street'),
+            'city': addr.get('City'),
+            'state': addr.get('State'),
+            'zipcode': addr.get('Zipcode'),
+        }
+
+    if 'ListOfEdu' in data:
+        mapped['education'] = [
+            {
+                'type': edu.get('Type'),
+                'university_name': edu.get('UniversityName'),
+                'major': edu.get('Major'),
+                'year_of_completion': edu.get('YearOfCompletion'),
+            }
+            for edu in data.get('ListOfEdu') or []
+        ]
+    return mapped
+
+
+class ConsultantBatchSerializer(ConsultantSerializer):
+    """
+    Validation-only variant of ConsultantSerializer: uniqueness and FK existence
+    are checked for the whole batch at once (FKs via the lookup cache), so per-row validation is pure Python.
+    """
+    skill = serializers.IntegerField(required=False, allow_null=True)
+    visa_status = serializers.IntegerField(required=False, allow_null=True)
+
+    def validate(self, attrs):
+        return attrs
+
+
+def _chunks(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _lookup_keys(data):
+    """(email_normalized, ssn_digits) of one validated record, as Consultant.save() derives them."""
+    return tuple(normalize(data.get(field))
+                 for field, normalize in (Consultant.LOOKUP_KEYS[column] for column in Consultant.UNIQUE_KEY_FIELDS))
+
+
+def _existing_lookup_keys(keys):
+    """The subset of each normalized column's values already taken, one indexed IN query per chunk."""
+    found = []
+    for column, values in zip(Consultant.UNIQUE_KEY_FIELDS, keys):
+        taken = set()
+        for chunk in _chunks(sorted(v for v in values if v is not None), CHUNK_SIZE):
+            taken.update(Consultant.objects.filter(**{f'{column}__in': chunk}).values_list(column, flat=True))
+        found.append(taken)
+    return found
+
+
+def _duplicate_reason(data):
+    keys = _lookup_keys(data)
+    taken = _existing_lookup_keys([key] for key in keys)
+    return next((reason for reason, key, found in zip(DUPLICATE_REASONS, keys, taken) if key in found), 'email')
+
+
+def import_consultants(records, chunk_size=CHUNK_SIZE, allow_similar=False):
+    """
+    Create consultants (with address and education) for a list of AddConsultant
+    records. Returns one result per record:
+        {'index', 'email', 'status': 'created' | 'duplicate' | 'invalid', ...}
+    Unless `allow_similar`, records that look like an existing consultant (or an
+    earlier record) under sales.dedupe are reported as reason='similar' with
+    their matches instead of being created.
+    """
+    results = []
+    valid = []  # (result, validated_data)
+
+    # ---------- Validate everything up front ----------
+    for index, record in enumerate(records):
+        data = map_consultant_record(record)
+        result = {'index': index, 'email': data.get('email')}
+        results.append(result)
+
+        serializer = ConsultantBatchSerializer(data=data)
+        if not serializer.is_valid():
+            result.update(status='invalid', errors=serializer.errors)
+            continue
+        valid.append((result, serializer.validated_data))
+
+    # ---------- Set-based FK and duplicate checks ----------
+    skill_ids = lookups.get_many(Skill, (v.get('skill') for _, v in valid)).keys()
+    visa_ids = lookups.get_many(Visa, (v.get('visa_status') for _, v in valid)).keys()
+    keys = [_lookup_keys(data) for _, data in valid]
+    existing = _existing_lookup_keys(zip(*keys))
+
+    accepted = []
+    seen = [set() for _ in DUPLICATE_REASONS]
+    for (result, data), record_keys in zip(valid, keys):
+        errors = {}
+        if data.get('skill') is not None and data['skill'] not in skill_ids:
+            errors['skill'] = [f'Invalid pk "{data["skill"]}" - object does not exist.']
+        if data.get('visa_status') is not None and data['visa_status'] not in visa_ids:
+            errors['visa_status'] = [f'Invalid pk "{data["visa_status"]}" - object does not exist.']
+        if errors:
+            result.update(status='invalid', errors=errors)
+            continue
+
+        reason = next((reason for reason, key, taken, batch in zip(DUPLICATE_REASONS, record_keys, existing, seen)
+                       if key is not None and (key in taken or key in batch)), None)
+        if reason:
+            result.update(status='duplicate', reason=reason)
+            continue
+        for key, batch in zip(record_keys, seen):
+            batch.add(key)
+        accepted.append((result, data))
+
+    # ---------- Fuzzy duplicate check ----------
+    if not allow_similar and accepted:
+        similar = dedupe.find_similar([dedupe.profile(data) for _, data in accepted])
+        kept = []
+        for (result, data), matches in zip(accepted, similar):
+            # earlier records of this batch are referred to by their input index
+            matches = [m if 'id' in m else {'index': accepted[m['index']][0]['index'], 'score': m['score']}
+                       for m in matches]
+            if matches:
+                result.update(status='duplicate', reason='similar', matches=matches)
+            else:
+                kept.append((result, data))
+        accepted = kept
+
+    # ---------- Bulk insert ----------
+    created = []
+    with transaction.atomic():
+        for chunk in _chunks(accepted, chunk_size):
+            try:
+                with transaction.atomic():
+                    created += _create_chunk(chunk)
+            except IntegrityError:
+                # taken concurrently after the duplicate check; find which rows, one savepoint each
+                for row in chunk:
+                    try:
+                        with transaction.atomic():
+                            created += _create_chunk([row])
+                    except IntegrityError:
+                        row[0].update(status='duplicate', reason=_duplicate_reason(row[1]))
+        # bulk_create sends no post_save, so index the new rows explicitly once they are committed
+        transaction.on_commit(lambda: _index(created))
+
+    return results
+
+
+def _index(consultants):
+    if consultants:
+        search.schedule_index(c.pk for c in consultants)
+        matching.snapshot.mark_dirty(c.pk for c in consultants)
+        facets.index.update(consultants)
+
+
+def _create_chunk(chunk):
+    """Insert one chunk (with addresses and education); returns the consultants."""
+    consultants = []
+    for _, data in chunk:
+        fields = {k: v for k, v in data.items() if k not in ('address', 'education', 'skill', 'visa_status')}
+        consultant = Consultant(skill_id=data.get('skill'), visa_status_id=data.get('visa_status'), **fields)
+        consultant.set_derived_fields()  # bulk_create bypasses save()
+        consultants.append(consultant)
+    Consultant.objects.bulk_create(consultants)
+
+    # MySQL does not return primary keys from bulk_create; look them up by email
+    if any(c.pk is None for c in consultants):
+        ids = dict(
+            Consultant.objects.filter(email__in=[c.email for c in consultants]).values_list('email', 'id')
+        )
+        for consultant in consultants:
+            consultant.pk = ids[consultant.email]
+
+    addresses, education = [], []
+    for (_, data), consultant in zip(chunk, consultants):
+        if data.get('address'):
+            addresses.append(ConsultantAddress(consultant=consultant, **data['address']))
+        for edu in data.get('education', []):
+            education.append(ConsultantEducation(consultant=consultant, **edu))
+
+    ConsultantAddress.objects.bulk_create(addresses)
+    ConsultantEducation.objects.bulk_create(education)
+    for (result, _), consultant in zip(chunk, consultants):
+        result.update(status='created', id=consultant.pk)
+    return consultants
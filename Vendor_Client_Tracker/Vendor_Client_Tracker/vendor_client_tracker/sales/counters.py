@@ -0,0 +1,183 @@
+"""
+Denormalized submission counters (SubmissionCounter) per consultant, vendor,
+end client and marketer: total, one count per vendor_response and the latest
+submission_date, so dashboard tiles read one row instead of counting Submission.
+
+sales.signals passes the stored and the saved state of every submission to
+apply_change(), which moves its contribution between counter rows with one
+F() UPDATE per affected row, inside the transaction of the write. Deleting a
+vendor, client or marketer nulls its submissions without saving them, so those
+(and any other drift) are repaired by reconcile().
+"""
+
+from collections import Counter, defaultdict
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Max, Q, Value
+from django.db.models.functions import Coalesce, Greatest
+
+from .models import Submission, SubmissionCounter
+
+ENTITIES = {
+    'consultant': 'consultant_id',
+    'vendor': 'vendor_id',
+    'end_client': 'end_client_id',
+    'marketer': 'marketer_id',
+}
+STATUS_COUNTERS = {
+    'ClientSubmitted': 'client_submitted',
+    'ClientRejected': 'client_rejected',
+    'ClientSelected': 'client_selected',
+}
+COUNTER_FIELDS = ('total', *STATUS_COUNTERS.values())
+STATE_FIELDS = ('submission_date', 'vendor_response', *ENTITIES.values())
+
+
+class CounterError(ValueError):
+    pass
+
+
+def submission_state(submission):
+    return {field: getattr(submission, field) for field in STATE_FIELDS}
+
+
+def _contributions(state):
+    """{(entity, entity_id): counter fields} one submission adds."""
+    if state is None:
+        return {}
+    fields = ['total']
+    if state['vendor_response'] in STATUS_COUNTERS:
+        fields.append(STATUS_COUNTERS[state['vendor_response']])
+    return {(entity, state[attr] or 0): fields for entity, attr in ENTITIES.items()}
+
+
+def apply_change(old, new):
+    """
+    Move a submission's contribution from its `old` state to its `new` one
+    (submission_state() dicts; None for a create or a delete).
+    """
+    if old == new:
+        return
+    removed, added = _contributions(old), _contributions(new)
+    deltas = defaultdict(Counter)
+    for key, fields in removed.items():
+        deltas[key].subtract(fields)
+    for key, fields in added.items():
+        deltas[key].update(fields)
+
+    for key, delta in deltas.items():
+        changes = {field: F(field) + value for field, value in delta.items() if value}
+        # the removed submission may have been the latest one; recount it from Submission
+        lost_latest = key in removed and (key not in added or old['submission_date'] != new['submission_date'])
+        latest = new['submission_date'] if key in added else None
+        if latest and not lost_latest:
+            changes['last_submission_at'] = Greatest(Coalesce('last_submission_at', Value(latest)), Value(latest))
+        if changes:
+            _update(key, changes, delta, latest)
+        if lost_latest:
+            _refresh_latest(key)
+
+
+def apply_created(states):
+    """
+    Add bulk-inserted submissions (submission_state() dicts): one UPDATE per
+    affected row, then the missing rows in one bulk insert.
+    """
+    deltas, latest = defaultdict(Counter), {}
+    for state in states:
+        for key, fields in _contributions(state).items():
+            deltas[key].update(fields)
+            latest[key] = max(latest.get(key, state['submission_date']), state['submission_date'])
+
+    missing = []
+    for (entity, entity_id), delta in deltas.items():
+        date = Value(latest[entity, entity_id])
+        changes = {field: F(field) + value for field, value in delta.items()}
+        changes['last_submission_at'] = Greatest(Coalesce('last_submission_at', date), date)
+        if not SubmissionCounter.objects.filter(entity=entity, entity_id=entity_id).update(**changes):
+            missing.append(((entity, entity_id), changes, delta))
+    try:
+        with transaction.atomic():
+            SubmissionCounter.objects.bulk_create([
+                SubmissionCounter(entity=key[0], entity_id=key[1], last_submission_at=latest[key], **delta)
+                for key, _, delta in missing
+            ])
+    except IntegrityError:
+        # some were created concurrently; fall back to the per-row path
+        for key, changes, delta in missing:
+            _update(key, changes, delta, latest[key])
+
+
+def _update(key, changes, delta, latest):
+    entity, entity_id = key
+    rows = SubmissionCounter.objects.filter(entity=entity, entity_id=entity_id)
+    if rows.update(**changes) or not any(value > 0 for value in delta.values()):
+        return
+    try:
+        with transaction.atomic():
+            rows.create(entity=entity, entity_id=entity_id, last_submission_at=latest,
+                        **{field: value for field, value in delta.items() if value > 0})
+    except IntegrityError:
+        # created concurrently by another writer
+        rows.update(**changes)
+
+
+def _refresh_latest(key):
+    entity, entity_id = key
+    attr = ENTITIES[entity]
+    submissions = Submission.objects.filter(**({attr: entity_id} if entity_id else {f'{attr}__isnull': True}))
+    SubmissionCounter.objects.filter(entity=entity, entity_id=entity_id).update(
+        last_submission_at=submissions.aggregate(latest=Max('submission_date'))['latest']
+    )
+
+
+# ---------- Reads ----------
+def counters(entity, ids):
+    """{id: {'total', 'client_submitted', ..., 'last_submission_at'}} with zeros for ids without submissions."""
+    if entity not in ENTITIES:
+        raise CounterError(f"Entity must be one of {', '.join(ENTITIES)}")
+    found = {
+        row.pop('entity_id'): row for row in
+        SubmissionCounter.objects.filter(entity=entity, entity_id__in=ids)
+        .values('entity_id', *COUNTER_FIELDS, 'last_submission_at')
+    }
+    empty = {**dict.fromkeys(COUNTER_FIELDS, 0), 'last_submission_at': None}
+    return {pk: found.get(pk, empty) for pk in ids}
+
+
+# ---------- Reconciliation ----------
+def expected_counters(entity):
+    """Counters of `entity` computed from Submission: {entity_id: {field: value}}."""
+    attr = ENTITIES[entity]
+    aggregates = {
+        'total': Count('id'),
+        **{field: Count('id', filter=Q(vendor_response=status)) for status, field in STATUS_COUNTERS.items()},
+        'last_submission_at': Max('submission_date'),
+    }
+    rows = Submission.objects.order_by().values(attr).annotate(**aggregates)
+    return {row.pop(attr) or 0: row for row in rows.iterator()}
+
+
+def reconcile(dry_run=False):
+    """Rewrite every counter row that differs from Submission. Returns the (entity, id) keys that drifted."""
+    drifted = []
+    for entity in ENTITIES:
+        expected = expected_counters(entity)
+        stored = {
+            row.pop('entity_id'): row for row in
+            SubmissionCounter.objects.filter(entity=entity).values('entity_id', *COUNTER_FIELDS, 'last_submission_at')
+        }
+        for entity_id in expected.keys() | stored.keys():
+            if expected.get(entity_id) != stored.get(entity_id):
+                drifted.append((entity, entity_id))
+                if not dry_run:
+                    _rewrite(entity, entity_id, expected.get(entity_id))
+    return drifted
+
+
+def _rewrite(entity, entity_id, values):
+    rows = SubmissionCounter.objects.filter(entity=entity, entity_id=entity_id)
+    if values is None:
+        rows.delete()
+    elif not rows.update(**values):
+        rows.create(entity=entity, entity_id=entity_id, **values)
@@ -0,0 +1,128 @@
+"""
+Fuzzy consultant deduplication.
+
+Consultants carry three indexed blocking keys (Consultant.email_key,
+phone_key, name_key: canonical email, E.164 phone, Soundex name + DOB). Only
+consultants sharing a key are compared, with string similarity over name and
+email plus exact phone/DOB agreement, so neither the on-insert check
+(AddConsultant) nor the batch scan (`manage.py find_duplicate_consultants`)
+ever compares the table pairwise.
+"""
+
+from collections import defaultdict
+from difflib import SequenceMatcher
+from itertools import combinations
+
+from django.db.models import Count
+
+from .models import Consultant
+from .normalization import normalize_name
+
+WEIGHTS = {'name': 0.4, 'email': 0.2, 'phone': 0.2, 'dob': 0.2}
+DUPLICATE_SCORE = 0.8
+MAX_BLOCK_SIZE = 500  # larger blocks (e.g. a shared office phone) are reported, not compared
+QUERY_CHUNK_SIZE = 500
+
+KEY_FIELDS = Consultant.DEDUPE_KEY_FIELDS
+PROFILE_FIELDS = ('id', 'first_name', 'last_name', 'email', 'phone_number', 'dob', *KEY_FIELDS)
+
+
+def profile(data):
+    """Comparable dict for validated AddConsultant data (no id yet)."""
+    keys = Consultant.dedupe_keys(
+        data.get('email'), data.get('phone_number'), data.get('first_name'), data.get('last_name'), data.get('dob')
+    )
+    return {
+        'id': None, 'first_name': data.get('first_name'), 'last_name': data.get('last_name'),
+        'email': data.get('email'), 'phone_number': data.get('phone_number'), 'dob': data.get('dob'),
+        **dict(zip(KEY_FIELDS, keys)),
+    }
+
+
+def _ratio(a, b):
+    return SequenceMatcher(None, a, b).ratio() if a and b else 0.0
+
+
+def similarity(a, b):
+    """Weighted 0..1 score of two profiles."""
+    name_a = normalize_name(f"{a['first_name']} {a['last_name']}")
+    name_b = normalize_name(f"{b['first_name']} {b['last_name']}")
+    swapped_b = normalize_name(f"{b['last_name']} {b['first_name']}")
+    if a['email_key'] and a['email_key'] == b['email_key']:
+        email = 1.0
+    else:
+        email = _ratio((a['email_key'] or '').split('@')[0], (b['email_key'] or '').split('@')[0])
+    parts = {
+        'name': max(_ratio(name_a, name_b), _ratio(name_a, swapped_b)),
+        'email': email,
+        'phone': 1.0 if a['phone_key'] and a['phone_key'] == b['phone_key'] else 0.0,
+        'dob': 1.0 if a['dob'] and str(a['dob']) == str(b['dob']) else 0.0,
+    }
+    return round(sum(WEIGHTS[k] * v for k, v in parts.items()), 4)
+
+
+def _chunks(items, size):
+    items = list(items)
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+# ---------- On-insert check ----------
+def find_similar(profiles, min_score=DUPLICATE_SCORE):
+    """
+    For each profile, the existing consultants and earlier profiles in the same
+    list that score at least `min_score`: [[{'id' or 'index', 'score'}], ...].
+    """
+    keys = {field: {p[field] for p in profiles if p[field]} for field in KEY_FIELDS}
+    blocks = defaultdict(dict)  # (field, key) -> {id: profile}
+    for field, values in keys.items():
+        for chunk in _chunks(values, QUERY_CHUNK_SIZE):
+            for row in Consultant.objects.filter(**{f'{field}__in': chunk}).values(*PROFILE_FIELDS):
+                blocks[field, row[field]][row['id']] = row
+
+    matches = []
+    batch_blocks = defaultdict(list)  # (field, key) -> earlier profile indexes
+    for index, p in enumerate(profiles):
+        candidates, earlier = {}, set()
+        for field in KEY_FIELDS:
+            if p[field]:
+                candidates.update(blocks.get((field, p[field]), {}))
+                earlier.update(batch_blocks[field, p[field]])
+                batch_blocks[field, p[field]].append(index)
+
+        found = [{'id': pk, 'score': similarity(p, row)} for pk, row in candidates.items()]
+        found += [{'index': i, 'score': similarity(p, profiles[i])} for i in sorted(earlier)]
+        matches.append(sorted((m for m in found if m['score'] >= min_score), key=lambda m: -m['score']))
+    return matches
+
+
+# ---------- Batch scan ----------
+def scan_duplicates(min_score=DUPLICATE_SCORE):
+    """
+    Yield ('pair', id_a, id_b, score, field) for every pair of consultants that
+    share a blocking key and score at least `min_score` (each pair once), and
+    ('oversized', field, key, size) for blocks too large to compare.
+    """
+    seen = set()
+    for field in KEY_FIELDS:
+        groups = (Consultant.objects.exclude(**{f'{field}__isnull': True})
+                  .values(field).annotate(size=Count('id')).filter(size__gt=1).order_by(field))
+        comparable = []
+        for group in groups.iterator():
+            if group['size'] > MAX_BLOCK_SIZE:
+                yield 'oversized', field, group[field], group['size']
+            else:
+                comparable.append(group[field])
+
+        for chunk in _chunks(comparable, QUERY_CHUNK_SIZE):
+            members = defaultdict(list)
+            for row in Consultant.objects.filter(**{f'{field}__in': chunk}).values(*PROFILE_FIELDS):
+                members[row[field]].append(row)
+            for rows in members.values():
+                for a, b in combinations(sorted(rows, key=lambda r: r['id']), 2):
+                    if (a['id'], b['id']) in seen:
+                        continue
+                    seen.add((a['id'], b['id']))
+                    score = similarity(a, b)
+                    if score >= min_score:
+                        yield 'pair', a['id'], b['id'], score, field
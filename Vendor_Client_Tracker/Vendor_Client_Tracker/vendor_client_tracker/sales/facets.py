@@ -0,0 +1,264 @@
+"""
+In-memory faceted index over the consultant bench.
+
+Every value of every facet (active, exp, gk, visa_status, skill,
+pref_location, priority) has a compressed bitmap of consultant ids
+(sales.bitmap): sparse 2**16-id chunks are sorted arrays, dense ones int
+bitsets, so the many small values of pref_location or skill cost a few bytes
+per member. Any AND/OR combination of facet values is a handful of bitmap
+operations, and the per-facet counts are intersection counts of the result
+with each value's bitmap.
+
+The index lives in each worker process. It is updated in place from
+sales.signals and the bulk write paths, catches up with writes made by other
+processes by polling Consultant.updated_on, and is rebuilt from the database
+every FULL_REBUILD_SECONDS (which also drops consultants deleted elsewhere).
+When settings.CONSULTANT_FACETS_SNAPSHOT_CACHE names a cache alias shared by
+the workers, every full build is stored there and a cold worker loads it
+instead of scanning the table; `manage.py rebuild_consultant_facets` stores
+one ahead of time. Without it (the per-process default cache would never be
+read by another worker) no snapshot is kept.
+"""
+
+import threading
+import time
+from array import array
+from collections import defaultdict
+from datetime import timedelta
+from itertools import repeat
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils import timezone
+
+from .bitmap import Bitmap
+from .models import Consultant
+
+REFRESH_INTERVAL = 5
+FULL_REBUILD_SECONDS = 30 * 60
+CLOCK_SKEW = timedelta(seconds=2)
+SNAPSHOT_KEY = 'facets:consultants:v2'
+
+
+class FacetError(ValueError):
+    pass
+
+
+def snapshot_cache():
+    """The shared cache holding the index snapshot, or None when none is configured."""
+    alias = getattr(settings, 'CONSULTANT_FACETS_SNAPSHOT_CACHE', None)
+    return caches[alias] if alias else None
+
+
+def _bool(value):
+    if isinstance(value, str):
+        return value.strip().lower() in ('true', '1', 'yes')
+    return bool(value)
+
+
+def _id(value):
+    return None if value in (None, '') else int(value)
+
+
+def _place(value):
+    if not value:
+        return None
+    return ' '.join(str(value).lower().split()) or None
+
+
+def _int(value):
+    return int(value or 0)
+
+
+# facet -> (Consultant attribute, normalizer applied to stored and queried values)
+FACETS = {
+    'active': ('active', _bool),
+    'exp': ('exp', _bool),
+    'gk': ('gk', _bool),
+    'visa_status': ('visa_status_id', _id),
+    'skill': ('skill_id', _id),
+    'pref_location': ('pref_location', _place),
+    'priority': ('priority', _int),
+}
+
+
+class FacetIndex:
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._clear()
+        self.built_at = None
+        self.checked_at = 0
+        self.watermark = None
+
+    def _clear(self):
+        self.values = {facet: [] for facet in FACETS}       # code -> value
+        self.codes = {facet: {} for facet in FACETS}        # value -> code
+        self.bitmaps = {facet: [] for facet in FACETS}      # code -> Bitmap
+        self.rows = {facet: array('i') for facet in FACETS}  # consultant id -> code (-1 = none)
+        self.all = Bitmap()
+
+    # ---------- Building ----------
+    def _code(self, facet, value):
+        code = self.codes[facet].get(value)
+        if code is None:
+            code = self.codes[facet][value] = len(self.values[facet])
+            self.values[facet].append(value)
+            self.bitmaps[facet].append(Bitmap())
+        return code
+
+    def _build_from_db(self):
+        started = timezone.now()
+        self._clear()
+        members = {facet: defaultdict(list) for facet in FACETS}
+        attrs = [attr for attr, _ in FACETS.values()]
+        ids = []
+        for row in Consultant.objects.values_list('id', *attrs).iterator(chunk_size=5000):
+            pk = row[0]
+            ids.append(pk)
+            for (facet, (_, normalize)), value in zip(FACETS.items(), row[1:]):
+                members[facet][self._code(facet, normalize(value))].append(pk)
+
+        size = max(ids) + 1 if ids else 0
+        for facet in FACETS:
+            rows = self.rows[facet] = array('i', repeat(-1, size))
+            for code, pks in members[facet].items():
+                self.bitmaps[facet][code] = Bitmap.from_ids(pks)
+                for pk in pks:
+                    rows[pk] = code
+        self.all = Bitmap.from_ids(ids)
+        self.watermark = started
+        self._save_snapshot()
+
+    def _save_snapshot(self):
+        cache = snapshot_cache()
+        if cache is None:
+            return
+        cache.set(SNAPSHOT_KEY, {
+            'watermark': self.watermark, 'values': self.values, 'bitmaps': self.bitmaps,
+            'rows': self.rows, 'all': self.all,
+        }, None)
+
+    def _load_snapshot(self):
+        cache = snapshot_cache()
+        snapshot = cache.get(SNAPSHOT_KEY) if cache is not None else None
+        if snapshot is None:
+            return False
+        self.values, self.bitmaps, self.rows = snapshot['values'], snapshot['bitmaps'], snapshot['rows']
+        self.codes = {facet: {v: code for code, v in enumerate(values)} for facet, values in self.values.items()}
+        self.all, self.watermark = snapshot['all'], snapshot['watermark']
+        return True
+
+    def rebuild(self):
+        with self._lock:
+            self._build_from_db()
+            self.built_at = self.checked_at = time.monotonic()
+            return len(self.all)
+
+    def _current(self):
+        now = time.monotonic()
+        if self.built_at is None:
+            if not self._load_snapshot():
+                self._build_from_db()
+            self.built_at = now
+            self._catch_up(now)
+        elif now - self.built_at > FULL_REBUILD_SECONDS:
+            self._build_from_db()
+            self.built_at = self.checked_at = now
+        elif now - self.checked_at > REFRESH_INTERVAL:
+            self._catch_up(now)
+
+    def _catch_up(self, now):
+        started = timezone.now()
+        attrs = [attr for attr, _ in FACETS.values()]
+        changed = Consultant.objects.filter(updated_on__gte=self.watermark - CLOCK_SKEW).values_list('id', *attrs)
+        for row in changed.iterator(chunk_size=5000):
+            self._set(row[0], dict(zip(FACETS, row[1:])))
+        self.watermark, self.checked_at = started, now
+
+    # ---------- Incremental updates ----------
+    def _set(self, pk, raw):
+        for facet, (_, normalize) in FACETS.items():
+            rows = self.rows[facet]
+            if pk >= len(rows):
+                rows.extend(repeat(-1, pk + 1 - len(rows)))
+            code, old = self._code(facet, normalize(raw[facet])), rows[pk]
+            if code == old:
+                continue
+            if old >= 0:
+                self.bitmaps[facet][old].discard(pk)
+            self.bitmaps[facet][code].add(pk)
+            rows[pk] = code
+        self.all.add(pk)
+
+    def update(self, consultants):
+        """Apply saved Consultant instances (ignored until the index is first built)."""
+        with self._lock:
+            if self.built_at is None:
+                return
+            for consultant in consultants:
+                self._set(consultant.pk, {facet: getattr(consultant, attr) for facet, (attr, _) in FACETS.items()})
+
+    def remove(self, pks):
+        with self._lock:
+            if self.built_at is None:
+                return
+            for pk in pks:
+                for facet in FACETS:
+                    rows = self.rows[facet]
+                    if pk < len(rows) and rows[pk] >= 0:
+                        self.bitmaps[facet][rows[pk]].discard(pk)
+                        rows[pk] = -1
+                self.all.discard(pk)
+
+    # ---------- Querying ----------
+    def _value_bitmap(self, facet, values):
+        normalize = FACETS[facet][1]
+        if not isinstance(values, list):
+            values = [values]
+        result = Bitmap()
+        for value in values:
+            try:
+                code = self.codes[facet].get(normalize(value))
+            except (TypeError, ValueError):
+                raise FacetError(f'Invalid value for {facet}: {value!r}')
+            if code is not None:
+                result |= self.bitmaps[facet][code]
+        return result
+
+    def _evaluate(self, node):
+        """
+        {facet: value or [values], ...}  ANDs facets, ORs the values of one facet;
+        {"and": [node, ...]} / {"or": [node, ...]} combine nested nodes.
+        """
+        if not isinstance(node, dict):
+            raise FacetError('Filter must be an object')
+        result = self.all
+        for key, value in node.items():
+            if key in ('and', 'or'):
+                if not isinstance(value, list) or not value:
+                    raise FacetError(f'"{key}" must be a non-empty list')
+                parts = [self._evaluate(child) for child in value]
+                combined = parts[0]
+                for part in parts[1:]:
+                    combined = combined & part if key == 'and' else combined | part
+                result &= combined
+            elif key in FACETS:
+                result &= self._value_bitmap(key, value)
+            else:
+                raise FacetError(f'Unknown facet: {key}')
+        return result
+
+    def query(self, node, limit, before=None):
+        """Return (total, {facet: [(value, count)]}, ids) for the consultants matching `node`."""
+        with self._lock:
+            self._current()
+            selected = self._evaluate(node or {})
+            count = selected.counter()
+            counts = {}
+            for facet, bitmaps in self.bitmaps.items():
+                pairs = [(self.values[facet][code], count(bm)) for code, bm in enumerate(bitmaps)]
+                counts[facet] = sorted([p for p in pairs if p[1]], key=lambda p: -p[1])
+            return len(selected), counts, selected.ids_desc(before, limit)
+
+
+index = FacetIndex()
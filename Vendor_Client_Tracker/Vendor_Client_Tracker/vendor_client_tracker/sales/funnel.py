@@ -0,0 +1,196 @@
+"""
+Submission status history and funnel metrics.
+
+Every save that creates a submission or changes its vendor_response or
+resume_passed_to_client appends a SubmissionEvent (see sales.signals), and in
+the same transaction the event is folded into the SubmissionFunnel rows of the
+submission's vendor, end client and marketer with F() deltas. Only the
+submission's own earlier events are read (a seek on (submission_id, ts)), so
+no query replays the history; rebuild_funnel() recomputes every counter from
+the log for backfills and drift repair.
+"""
+
+from collections import Counter, defaultdict
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from .analytics import DIMENSIONS as ANALYTICS_DIMENSIONS
+from .models import Submission, SubmissionEvent, SubmissionFunnel
+
+RESPONSES = {'ClientRejected': 'rejected', 'ClientSelected': 'selected'}
+DIMENSIONS = {'vendor': 'vendor_id', 'end_client': 'end_client_id', 'marketer': 'marketer_id'}
+COUNTERS = ('submitted', 'resume_passed', 'rejected', 'selected',
+            'response_count', 'response_seconds', 'selection_count', 'selection_seconds')
+BATCH_SIZE = 1000
+
+
+class FunnelError(ValueError):
+    pass
+
+
+def _deltas(submission_date, event, history):
+    """Counter increments for `event`, given the submission's earlier events."""
+    reached = {e.to_status for e in history}
+    deltas = Counter()
+    if not history:
+        deltas['submitted'] += 1
+    if event.resume_passed_to_client and not any(e.resume_passed_to_client for e in history):
+        deltas['resume_passed'] += 1
+
+    stage = RESPONSES.get(event.to_status)
+    if stage and event.to_status not in reached:
+        deltas[stage] += 1
+        # only observed transitions are timed: a creation (or backfilled) event
+        # says nothing about when the response actually came in
+        if event.from_status is not None:
+            seconds = max(0, int((event.ts - submission_date).total_seconds()))
+            if not reached & RESPONSES.keys():
+                deltas['response_count'] += 1
+                deltas['response_seconds'] += seconds
+            if stage == 'selected':
+                deltas['selection_count'] += 1
+                deltas['selection_seconds'] += seconds
+    return deltas
+
+
+def _apply(dimension_ids, deltas):
+    for dimension, dimension_id in dimension_ids.items():
+        key = {'dimension': dimension, 'dimension_id': dimension_id or 0}
+        rows = SubmissionFunnel.objects.filter(**key)
+        if rows.update(**{name: F(name) + value for name, value in deltas.items()}):
+            continue
+        try:
+            with transaction.atomic():
+                SubmissionFunnel.objects.create(**key, **deltas)
+        except IntegrityError:
+            # created concurrently by another writer
+            rows.update(**{name: F(name) + value for name, value in deltas.items()})
+
+
+def record_change(submission, previous, user=None):
+    """
+    Append the event for a saved submission whose stored status was `previous`
+    ((vendor_response, resume_passed_to_client), None for a new submission) and
+    update the funnel. Returns the event, or None if neither field changed.
+    """
+    current = (submission.vendor_response, submission.resume_passed_to_client)
+    if previous == current:
+        return None
+    with transaction.atomic():
+        history = list(SubmissionEvent.objects.filter(submission_id=submission.pk)
+                       .only('to_status', 'resume_passed_to_client'))
+        event = SubmissionEvent.objects.create(
+            submission_id=submission.pk, from_status=previous[0] if previous else None,
+            to_status=current[0], resume_passed_to_client=current[1], changed_by=user,
+        )
+        deltas = _deltas(submission.submission_date, event, history)
+        if deltas:
+            _apply({dimension: getattr(submission, attr) for dimension, attr in DIMENSIONS.items()}, deltas)
+    return event
+
+
+def record_created(submissions, user=None):
+    """Creation events for bulk-inserted submissions; one funnel UPDATE per affected row, missing rows bulk inserted."""
+    events = SubmissionEvent.objects.bulk_create([
+        SubmissionEvent(submission_id=s.pk, to_status=s.vendor_response,
+                        resume_passed_to_client=s.resume_passed_to_client, changed_by=user)
+        for s in submissions
+    ])
+    totals = defaultdict(Counter)
+    for submission, event in zip(submissions, events):
+        deltas = _deltas(submission.submission_date, event, [])
+        for dimension, attr in DIMENSIONS.items():
+            totals[dimension, getattr(submission, attr) or 0].update(deltas)
+    missing = [
+        (key, deltas) for key, deltas in totals.items()
+        if not SubmissionFunnel.objects.filter(dimension=key[0], dimension_id=key[1]).update(
+            **{name: F(name) + value for name, value in deltas.items()})
+    ]
+    try:
+        with transaction.atomic():
+            SubmissionFunnel.objects.bulk_create([
+                SubmissionFunnel(dimension=dimension, dimension_id=dimension_id, **deltas)
+                for (dimension, dimension_id), deltas in missing
+            ])
+    except IntegrityError:
+        # some were created concurrently; fall back to the per-row path
+        for (dimension, dimension_id), deltas in missing:
+            _apply({dimension: dimension_id}, deltas)
+
+
+def rebuild_funnel():
+    """Recompute every SubmissionFunnel row from the event log. Returns the number of rows written."""
+    submissions = {
+        row['id']: row for row in
+        Submission.objects.values('id', 'submission_date', *DIMENSIONS.values()).iterator(chunk_size=BATCH_SIZE)
+    }
+    totals = defaultdict(Counter)
+    history, current = [], None
+    events = SubmissionEvent.objects.order_by('submission_id', 'ts', 'id').iterator(chunk_size=BATCH_SIZE)
+    for event in events:
+        submission = submissions.get(event.submission_id)
+        if submission is None:  # events of deleted submissions cannot be attributed
+            continue
+        if event.submission_id != current:
+            history, current = [], event.submission_id
+        deltas = _deltas(submission['submission_date'], event, history)
+        history.append(event)
+        for dimension, attr in DIMENSIONS.items():
+            totals[dimension, submission[attr] or 0].update(deltas)
+
+    with transaction.atomic():
+        SubmissionFunnel.objects.all().delete()
+        SubmissionFunnel.objects.bulk_create(
+            [SubmissionFunnel(dimension=dimension, dimension_id=dimension_id, **counters)
+             for (dimension, dimension_id), counters in totals.items()],
+            batch_size=BATCH_SIZE,
+        )
+    return len(totals)
+
+
+# ---------- Reporting ----------
+def _ratio(part, whole):
+    return round(part / whole, 4) if whole else None
+
+
+def _average(seconds, count):
+    return round(seconds / count) if count else None
+
+
+def funnel_report(dimension, ids=None):
+    """Funnel counters, conversion rates and average response times per id of `dimension`."""
+    if dimension not in DIMENSIONS:
+        raise FunnelError(f"Dimension must be one of {', '.join(DIMENSIONS)}")
+    rows = SubmissionFunnel.objects.filter(dimension=dimension).order_by('-submitted', 'dimension_id')
+    if ids is not None:
+        rows = rows.filter(dimension_id__in=ids)
+    rows = list(rows.values('dimension_id', *COUNTERS))
+
+    _, model, name_field = ANALYTICS_DIMENSIONS[dimension]
+    names = dict(model.objects.filter(id__in=[r['dimension_id'] for r in rows]).values_list('id', name_field))
+    return [{
+        'id': row['dimension_id'] or None,
+        'name': names.get(row['dimension_id']),
+        'submitted': row['submitted'],
+        'resume_passed': row['resume_passed'],
+        'rejected': row['rejected'],
+        'selected': row['selected'],
+        'pass_rate': _ratio(row['resume_passed'], row['submitted']),
+        'selection_rate': _ratio(row['selected'], row['submitted']),
+        'avg_response_seconds': _average(row['response_seconds'], row['response_count']),
+        'avg_selection_seconds': _average(row['selection_seconds'], row['selection_count']),
+    } for row in rows]
+
+
+def submission_history(submission_id):
+    """Events of one submission, oldest first, each with how long the submission stayed in that state."""
+    events = list(SubmissionEvent.objects.filter(submission_id=submission_id).order_by('ts', 'id'))
+    return [{
+        'from_status': event.from_status,
+        'to_status': event.to_status,
+        'resume_passed_to_client': event.resume_passed_to_client,
+        'changed_by': event.changed_by_id,
+        'ts': event.ts,
+        'duration_seconds': int((following.ts - event.ts).total_seconds()) if following else None,
+    } for event, following in zip(events, events[1:] + [None])]
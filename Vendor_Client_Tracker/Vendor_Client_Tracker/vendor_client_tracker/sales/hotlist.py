@@ -0,0 +1,91 @@
+"""
+Bulk hotlist (Consultant.active) and priority operations.
+
+Each operation reads the current values of the requested consultants once
+(locked for the transaction), writes only the rows that actually change with
+a single UPDATE ... WHERE id IN (...) touching only the affected columns (plus
+updated_on, which the in-memory indexes follow), and records one
+ConsultantChange row per changed value.
+
+QuerySet.update() sends no post_save, so consultants_bulk_updated is sent after
+commit for the in-memory indexes (see sales.signals).
+"""
+
+import uuid
+
+from django.db import transaction
+from django.db.models import Case, IntegerField, Value, When
+from django.dispatch import Signal
+from django.utils import timezone
+
+from .models import Consultant, ConsultantChange
+
+# sent with ids=[...] and fields=[...] after a bulk update commits
+consultants_bulk_updated = Signal()
+
+
+def _audit(batch, user, action, field, changes):
+    ConsultantChange.objects.bulk_create([
+        ConsultantChange(batch=batch, consultant_id=pk, action=action, field=field,
+                         old_value=str(old), new_value=str(new), changed_by=user)
+        for pk, old, new in changes
+    ])
+
+
+def _notify(ids, fields):
+    if ids:
+        transaction.on_commit(
+            lambda: consultants_bulk_updated.send(sender=Consultant, ids=ids, fields=fields)
+        )
+
+
+def set_active(ids, active, user=None):
+    """Move consultants on (active=True) or off the hotlist. Returns {'batch', 'updated', 'unchanged', 'missing'}."""
+    ids = list(dict.fromkeys(ids))
+    batch = uuid.uuid4()
+    with transaction.atomic():
+        current = dict(Consultant.objects.select_for_update().filter(id__in=ids).values_list('id', 'active'))
+        changed = [pk for pk in ids if pk in current and current[pk] != active]
+        if changed:
+            Consultant.objects.filter(id__in=changed).update(active=active, updated_on=timezone.now())
+            _audit(batch, user, 'hotlist_add' if active else 'hotlist_remove', 'active',
+                   [(pk, current[pk], active) for pk in changed])
+        _notify(changed, ['active'])
+
+    return {
+        'batch': batch,
+        'updated': changed,
+        'unchanged': [pk for pk in ids if pk in current and pk not in changed],
+        'missing': [pk for pk in ids if pk not in current],
+    }
+
+
+def set_priorities(priorities, user=None):
+    """Apply {consultant id: priority} in one CASE UPDATE. Returns the same report as set_active."""
+    batch = uuid.uuid4()
+    with transaction.atomic():
+        current = dict(
+            Consultant.objects.select_for_update().filter(id__in=list(priorities)).values_list('id', 'priority')
+        )
+        changed = [pk for pk, priority in priorities.items() if pk in current and current[pk] != priority]
+        if changed:
+            Consultant.objects.filter(id__in=changed).update(
+                priority=Case(*[When(id=pk, then=Value(priorities[pk])) for pk in changed],
+                              output_field=IntegerField()),
+                updated_on=timezone.now(),
+            )
+            _audit(batch, user, 'rerank', 'priority', [(pk, current[pk], priorities[pk]) for pk in changed])
+        _notify(changed, ['priority'])
+
+    return {
+        'batch': batch,
+        'updated': changed,
+        'unchanged': [pk for pk in priorities if pk in current and pk not in changed],
+        'missing': [pk for pk in priorities if pk not in current],
+    }
+
+
+def ranking_priorities(ranking):
+    """[best, ..., worst] -> {id: priority} with the highest priority first (len(ranking) .. 1)."""
+    ranking = list(dict.fromkeys(ranking))
+    return {pk: len(ranking) - position for position, pk in enumerate(ranking)}
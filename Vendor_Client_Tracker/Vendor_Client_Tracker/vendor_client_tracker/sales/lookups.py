@@ -0,0 +1,135 @@
+"""
+Lookup cache for the small reference tables (Skill, Visa, Marketer, Recruiter).
+
+Rows are cached as {'id', 'name'} dicts keyed by model and primary key, so FK
+validation and name resolution in the serializers normally cost no query.
+Entries are dropped by post_save/post_delete signals (see sales.signals).
+
+settings.LOOKUP_CACHE selects the backend:
+    'local'  - bounded in-process LRU (default); fastest, per worker process.
+               Signals only reach the writing process, so entries expire after
+               LOCAL_TIMEOUT seconds to bound how long other workers serve a
+               renamed or deleted row.
+    'shared' - a Django cache alias (e.g. Redis/Memcached) shared by all workers
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+
+from adminpanel.models import Marketer, Recruiter
+from .models import Skill, Visa
+
+LOOKUP_MODELS = (Skill, Visa, Marketer, Recruiter)
+
+DEFAULTS = {
+    'BACKEND': 'local',
+    'MAX_ENTRIES': 5000,
+    'CACHE_ALIAS': 'default',
+    'TIMEOUT': 60 * 60,
+    'LOCAL_TIMEOUT': 5 * 60,
+}
+
+
+class LocalBackend:
+    def __init__(self, max_entries, local_timeout, **kwargs):
+        self.max_entries = max_entries
+        self.timeout = local_timeout
+        self._data = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+
+    def get_many(self, keys):
+        found = {}
+        now = time.monotonic()
+        with self._lock:
+            for key in keys:
+                entry = self._data.get(key)
+                if entry is None:
+                    continue
+                if entry[0] <= now:
+                    del self._data[key]
+                    continue
+                self._data.move_to_end(key)
+                found[key] = entry[1]
+        return found
+
+    def set_many(self, items):
+        expires_at = time.monotonic() + self.timeout
+        with self._lock:
+            for key, value in items.items():
+                self._data[key] = (expires_at, value)
+                self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+
+class SharedBackend:
+    def __init__(self, cache_alias, timeout, **kwargs):
+        self.cache = caches[cache_alias]
+        self.timeout = timeout
+
+    def get_many(self, keys):
+        return self.cache.get_many(keys)
+
+    def set_many(self, items):
+        self.cache.set_many(items, self.timeout)
+
+    def delete(self, key):
+        self.cache.delete(key)
+
+
+BACKENDS = {'local': LocalBackend, 'shared': SharedBackend}
+
+
+class LookupCache:
+    def __init__(self, backend):
+        self.backend = backend
+
+    @staticmethod
+    def key(model, pk):
+        return f'lookup:{model._meta.label_lower}:{pk}'
+
+    def get_many(self, model, pks):
+        """{pk: {'id', 'name'}} for the pks that exist; misses are read in one query."""
+        pks = {int(pk) for pk in pks if pk is not None}
+        keys = {self.key(model, pk): pk for pk in pks}
+        cached = self.backend.get_many(list(keys))
+        rows = {keys[k]: v for k, v in cached.items()}
+
+        missing = pks - rows.keys()
+        if missing:
+            loaded = {r['id']: r for r in model.objects.filter(pk__in=missing).values('id', 'name')}
+            self.backend.set_many({self.key(model, pk): row for pk, row in loaded.items()})
+            rows.update(loaded)
+        return rows
+
+    def get(self, model, pk):
+        if pk is None:
+            return None
+        return self.get_many(model, [pk]).get(int(pk))
+
+    def name(self, model, pk):
+        row = self.get(model, pk)
+        return row['name'] if row else None
+
+    def invalidate(self, model, pk):
+        self.backend.delete(self.key(model, pk))
+
+
+def _build():
+    config = {**DEFAULTS, **getattr(settings, 'LOOKUP_CACHE', {})}
+    backend = BACKENDS[config['BACKEND']](
+        max_entries=config['MAX_ENTRIES'], local_timeout=config['LOCAL_TIMEOUT'],
+        cache_alias=config['CACHE_ALIAS'], timeout=config['TIMEOUT'],
+    )
+    return LookupCache(backend)
+
+
+lookups = _build()
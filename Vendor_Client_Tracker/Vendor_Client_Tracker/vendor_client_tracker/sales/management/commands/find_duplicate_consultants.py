@@ -0,0 +1,25 @@
+import csv
+
+from django.core.management.base import BaseCommand
+
+from sales.dedupe import DUPLICATE_SCORE, scan_duplicates
+
+
+class Command(BaseCommand):
+    help = "List likely duplicate consultants as CSV (consultant_a, consultant_b, score, matched_on)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--min-score', type=float, default=DUPLICATE_SCORE)
+
+    def handle(self, *args, **options):
+        writer = csv.writer(self.stdout)
+        writer.writerow(['consultant_a', 'consultant_b', 'score', 'matched_on'])
+        pairs = 0
+        for kind, *row in scan_duplicates(options['min_score']):
+            if kind == 'pair':
+                writer.writerow(row)
+                pairs += 1
+            else:
+                field, key, size = row
+                self.stderr.write(f"Skipped {field}={key!r}: {size} consultants share it")
+        self.stderr.write(self.style.SUCCESS(f"{pairs} likely duplicate pairs"))
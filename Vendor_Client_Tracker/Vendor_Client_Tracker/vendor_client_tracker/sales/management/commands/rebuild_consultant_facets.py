@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from sales.facets import index, snapshot_cache
+
+
+class Command(BaseCommand):
+    help = "Rebuild the consultant bench facet index and store it in the shared snapshot cache for cold-starting workers."
+
+    def handle(self, *args, **options):
+        if snapshot_cache() is None:
+            raise CommandError(
+                "CONSULTANT_FACETS_SNAPSHOT_CACHE is not set; without a shared cache no worker could read the snapshot"
+            )
+        count = index.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Indexed {count} consultants"))
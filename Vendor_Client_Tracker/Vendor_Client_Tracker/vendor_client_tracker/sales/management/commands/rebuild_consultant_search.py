@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from sales.search import rebuild_index
+
+
+class Command(BaseCommand):
+    help = "Rebuild the consultant search index (documents and, off MySQL, the token table)."
+
+    def handle(self, *args, **options):
+        count = rebuild_index()
+        self.stdout.write(self.style.SUCCESS(f"Indexed {count} consultants"))
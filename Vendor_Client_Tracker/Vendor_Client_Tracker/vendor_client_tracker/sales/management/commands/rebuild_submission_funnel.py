@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from sales.funnel import rebuild_funnel
+
+
+class Command(BaseCommand):
+    help = "Recompute the submission funnel counters from the submission event log."
+
+    def handle(self, *args, **options):
+        rows = rebuild_funnel()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {rows} funnel rows"))
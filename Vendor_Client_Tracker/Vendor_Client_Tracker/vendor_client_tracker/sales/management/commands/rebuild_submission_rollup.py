@@ -0,0 +1,17 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand
+
+from sales.rollups import rebuild_rollup
+
+
+class Command(BaseCommand):
+    help = "Rebuild the daily submission rollup (whole table, or a --start/--end date range)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start', type=date.fromisoformat, help='First day to rebuild (YYYY-MM-DD).')
+        parser.add_argument('--end', type=date.fromisoformat, help='Last day to rebuild (YYYY-MM-DD).')
+
+    def handle(self, *args, **options):
+        rows = rebuild_rollup(options['start'], options['end'])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {rows} rollup rows"))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from sales.counters import reconcile
+
+
+class Command(BaseCommand):
+    help = "Recount SubmissionCounter rows from Submission and fix any that drifted."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Only report drifted rows.')
+
+    def handle(self, *args, **options):
+        drifted = reconcile(dry_run=options['dry_run'])
+        for entity, entity_id in drifted:
+            self.stdout.write(f"{entity} {entity_id or 'none'}")
+        verb = 'Found' if options['dry_run'] else 'Fixed'
+        self.stdout.write(self.style.SUCCESS(f"{verb} {len(drifted)} drifted counters"))
@@ -0,0 +1,231 @@
+"""
+Consultant-to-requirement matching.
+
+Active consultants are held in process memory as a column-oriented NumPy
+snapshot (skill, visa, rate, priority, location codes), so a requirement is
+scored against all of them in one vectorized pass and the top K are picked
+with argpartition. The snapshot is refreshed incrementally: every
+REFRESH_INTERVAL seconds consultants whose (indexed) updated_on moved are
+reloaded, and ids marked dirty by sales.signals (address changes, deletes,
+bulk writes) are reloaded on the next match. It is rebuilt in full every
+FULL_REBUILD_SECONDS as a safety net for writes that bypass both.
+
+Consultants already submitted to the requirement's end client are excluded
+through a per-client id set kept in the Django cache and dropped on
+submission writes. Requires numpy.
+"""
+
+import re
+import threading
+import time
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.utils import timezone
+
+from .models import Consultant, Submission
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+WEIGHTS = {'skill': 0.4, 'rate': 0.2, 'location': 0.2, 'priority': 0.2}
+RATE_TOLERANCE = 0.2  # consultants up to 20% above MaxRate still match, with a lower rate score
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 200
+
+REFRESH_INTERVAL = 5
+FULL_REBUILD_SECONDS = 15 * 60
+MAX_INCREMENTAL = 5000  # more changed ids than this triggers a full rebuild
+CLOCK_SKEW = timedelta(seconds=2)
+SUBMITTED_TIMEOUT = 10 * 60
+
+LOCATION_SPLIT_RE = re.compile(r'[,/;]')
+
+
+class MatchingUnavailable(RuntimeError):
+    pass
+
+
+def _norm(value):
+    return ' '.join(str(value).lower().split()) if value else ''
+
+
+def _first_place(value):
+    # "Dallas, TX" / "Dallas/Remote" -> "dallas"
+    return _norm(LOCATION_SPLIT_RE.split(value)[0]) if value else ''
+
+
+class ConsultantSnapshot:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._codes = {'': 0}
+        self._dirty = set()
+        self.columns = None
+        self.built_at = 0
+        self.checked_at = 0
+        self.watermark = None
+
+    # ---------- Location codes ----------
+    def _code(self, text):
+        return self._codes.setdefault(text, len(self._codes))
+
+    def location_codes(self, location):
+        """Codes of the comma-separated pieces of a requirement location that any consultant has."""
+        pieces = {_norm(p) for p in LOCATION_SPLIT_RE.split(location or '')} - {''}
+        return [self._codes[p] for p in pieces if p in self._codes]
+
+    # ---------- Loading ----------
+    def _load(self, queryset):
+        rows = queryset.filter(active=True).values_list(
+            'id', 'skill_id', 'visa_status_id', 'expected_rate', 'priority',
+            'pref_location', 'address__city', 'address__state',
+        )
+        ids, skills, visas, rates, priorities, prefs, cities, states = [], [], [], [], [], [], [], []
+        for pk, skill, visa, rate, priority, pref, city, state in rows.iterator(chunk_size=5000):
+            ids.append(pk)
+            skills.append(skill or 0)
+            visas.append(visa or 0)
+            rates.append(float(rate))
+            priorities.append(priority)
+            prefs.append(self._code(_first_place(pref)))
+            cities.append(self._code(_norm(city)))
+            states.append(self._code(_norm(state)))
+        return {
+            'id': np.array(ids, dtype=np.int64),
+            'skill': np.array(skills, dtype=np.int64),
+            'visa': np.array(visas, dtype=np.int64),
+            'rate': np.array(rates, dtype=np.float64),
+            'priority': np.array(priorities, dtype=np.float64),
+            'pref': np.array(prefs, dtype=np.int64),
+            'city': np.array(cities, dtype=np.int64),
+            'state': np.array(states, dtype=np.int64),
+        }
+
+    def mark_dirty(self, ids):
+        with self._lock:
+            self._dirty.update(ids)
+
+    def current(self):
+        """Columns of the active consultants, refreshed if due."""
+        with self._lock:
+            now = time.monotonic()
+            if self.columns is None or now - self.built_at > FULL_REBUILD_SECONDS:
+                self._rebuild(now)
+            elif self._dirty or now - self.checked_at > REFRESH_INTERVAL:
+                self._refresh(now)
+            return self.columns
+
+    def _rebuild(self, now):
+        started = timezone.now()
+        self._dirty.clear()
+        self.columns = self._load(Consultant.objects.all())
+        self.watermark, self.built_at, self.checked_at = started, now, now
+
+    def _refresh(self, now):
+        started = timezone.now()
+        changed = set(
+            Consultant.objects.filter(updated_on__gte=self.watermark - CLOCK_SKEW).values_list('id', flat=True)
+        )
+        changed |= self._dirty
+        if len(changed) > MAX_INCREMENTAL:
+            self._rebuild(now)
+            return
+        self._dirty.clear()
+        if changed:
+            keep = ~np.isin(self.columns['id'], np.fromiter(changed, dtype=np.int64))
+            fresh = self._load(Consultant.objects.filter(id__in=changed))
+            self.columns = {k: np.concatenate([v[keep], fresh[k]]) for k, v in self.columns.items()}
+        self.watermark, self.checked_at = started, now
+
+
+snapshot = ConsultantSnapshot()
+
+
+# ---------- Submitted-consultant sets ----------
+def _submitted_key(client_id):
+    return f'matching:submitted:{client_id}'
+
+
+def submitted_consultants(client_id):
+    ids = cache.get(_submitted_key(client_id))
+    if ids is None:
+        ids = sorted(set(
+            Submission.objects.filter(end_client_id=client_id).values_list('consultant_id', flat=True)
+        ))
+        cache.set(_submitted_key(client_id), ids, SUBMITTED_TIMEOUT)
+    return np.array(ids, dtype=np.int64)
+
+
+def forget_submitted(client_id):
+    if client_id:
+        cache.delete(_submitted_key(client_id))
+
+
+# ---------- Scoring ----------
+def match_consultants(skill_id=None, max_rate=None, visa_ids=None, location=None, end_client_id=None,
+                      limit=DEFAULT_LIMIT):
+    """
+    Return ([{'id', 'score', 'breakdown'}] best first, number of eligible consultants).
+    Visa and rate (within RATE_TOLERANCE) are hard filters, as is a previous
+    submission to end_client_id; skill, rate fit, location and hotlist
+    priority are weighted into the score.
+    """
+    if np is None:
+        raise MatchingUnavailable('Consultant matching requires numpy')
+
+    cols = snapshot.current()
+    ids = cols['id']
+    eligible = np.ones(len(ids), dtype=bool)
+    parts = {}
+
+    if visa_ids:
+        eligible &= np.isin(cols['visa'], visa_ids)
+    if end_client_id:
+        eligible &= ~np.isin(ids, submitted_consultants(end_client_id))
+
+    if skill_id:
+        parts['skill'] = (cols['skill'] == skill_id).astype(np.float64)
+    if max_rate:
+        ceiling = max_rate * (1 + RATE_TOLERANCE)
+        eligible &= cols['rate'] <= ceiling
+        parts['rate'] = np.clip((ceiling - cols['rate']) / (ceiling - max_rate), 0, 1)
+    if location:
+        codes = snapshot.location_codes(location)
+        parts['location'] = (
+            np.isin(cols['pref'], codes) | np.isin(cols['city'], codes) | np.isin(cols['state'], codes)
+        ).astype(np.float64)
+    top_priority = cols['priority'].max() if len(ids) else 0
+    if top_priority > 0:
+        parts['priority'] = np.clip(cols['priority'] / top_priority, 0, 1)
+
+    candidates = np.flatnonzero(eligible)
+    if not len(candidates):
+        return [], 0
+    score = np.zeros(len(candidates))
+    for name, values in parts.items():
+        score += WEIGHTS[name] * values[candidates]
+
+    candidate_ids = ids[candidates]
+    k = min(limit, len(candidates))
+    if k < len(candidates):
+        # argpartition finds the k-th best score; ties at that score are cut by lowest id
+        # so the result does not depend on snapshot row order
+        threshold = score[np.argpartition(-score, k - 1)[k - 1]]
+        above = np.flatnonzero(score > threshold)
+        ties = np.flatnonzero(score == threshold)
+        best = np.concatenate([above, ties[np.argsort(candidate_ids[ties])][:k - len(above)]])
+    else:
+        best = np.arange(len(candidates))
+    best = best[np.lexsort((candidate_ids[best], -score[best]))]
+
+    results = []
+    for i in best:
+        row = candidates[i]
+        results.append({
+            'id': int(ids[row]),
+            'score': round(float(score[i]), 4),
+            'breakdown': {name: round(float(values[row]), 4) for name, values in parts.items()},
+        })
+    return results, len(candidates)
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-17 22:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('adminpanel', '0001_initial'),
+        ('clients', '0007_clientaddress'),
+        ('sales', '0006_rename_technology_submission_skill'),
+        ('vendors', '0008_vendor_linkedin_url'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='submission',
+            index=models.Index(fields=['-submission_date', 'id'], name='sales_subm_date_id_idx'),
+        ),
+    ]
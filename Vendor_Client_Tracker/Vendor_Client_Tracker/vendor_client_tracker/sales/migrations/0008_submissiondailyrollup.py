@@ -0,0 +1,49 @@
+# Generated by Django 5.2.18 on 2026-10-17 22:59
+
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+
+
+def backfill_rollup(apps, schema_editor):
+    Submission = apps.get_model('sales', 'Submission')
+    SubmissionDailyRollup = apps.get_model('sales', 'SubmissionDailyRollup')
+    keys = ('consultant_id', 'vendor_id', 'end_client_id', 'marketer_id', 'skill_id')
+    groups = (Submission.objects.order_by()
+              .annotate(day=TruncDate('submission_date'))
+              .values('day', 'vendor_response', *keys)
+              .annotate(count=Count('id')))
+    SubmissionDailyRollup.objects.bulk_create(
+        [SubmissionDailyRollup(day=g['day'], vendor_response=g['vendor_response'] or '', count=g['count'],
+                               **{k: g[k] or 0 for k in keys})
+         for g in groups.iterator()],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sales', '0007_submission_date_id_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SubmissionDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('consultant_id', models.BigIntegerField()),
+                ('vendor_id', models.BigIntegerField(default=0)),
+                ('end_client_id', models.BigIntegerField(default=0)),
+                ('marketer_id', models.BigIntegerField(default=0)),
+                ('skill_id', models.BigIntegerField(default=0)),
+                ('vendor_response', models.CharField(max_length=50)),
+                ('count', models.IntegerField(default=0)),
+            ],
+            options={
+                'unique_together': {('day', 'consultant_id', 'vendor_id', 'end_client_id', 'marketer_id', 'skill_id', 'vendor_response')},
+            },
+        ),
+        migrations.RunPython(backfill_rollup, migrations.RunPython.noop),
+    ]
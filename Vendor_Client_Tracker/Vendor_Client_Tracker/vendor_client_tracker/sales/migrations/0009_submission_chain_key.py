@@ -0,0 +1,58 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:01
+
+import hashlib
+
+from django.db import migrations, models
+
+
+def chain_key(*parts):
+    raw = '|'.join('-' if part is None else str(int(part)) for part in parts)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def backfill_chain_key(apps, schema_editor):
+    """
+    Fill chain_key for existing rows. When a chain already has several
+    submissions, the oldest keeps the key and the rest are flagged
+    is_duplicate with chain_key left NULL so the unique index can be built.
+    """
+    Submission = apps.get_model('sales', 'Submission')
+    seen = set()
+    keyed, duplicates = [], []
+    rows = Submission.objects.order_by('id').values_list(
+        'id', 'consultant_id', 'vendor_id', 'prime_vendor_id', 'implementation_partner_id', 'end_client_id'
+    )
+    for pk, *parts in rows.iterator(chunk_size=2000):
+        key = chain_key(*parts)
+        if key in seen:
+            duplicates.append(Submission(id=pk, is_duplicate=True))
+        else:
+            seen.add(key)
+            keyed.append(Submission(id=pk, chain_key=key))
+    Submission.objects.bulk_update(keyed, ['chain_key'], batch_size=1000)
+    Submission.objects.bulk_update(duplicates, ['is_duplicate'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sales', '0008_submissiondailyrollup'),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='submission',
+            unique_together=set(),
+        ),
+        migrations.AddField(
+            model_name='submission',
+            name='chain_key',
+            field=models.CharField(editable=False, max_length=64, null=True),
+        ),
+        migrations.RunPython(backfill_chain_key, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='submission',
+            name='chain_key',
+            field=models.CharField(editable=False, max_length=64, null=True, unique=True),
+        ),
+    ]
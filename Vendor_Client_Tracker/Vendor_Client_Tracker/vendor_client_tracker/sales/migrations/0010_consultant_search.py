@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:08
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def add_fulltext_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'mysql':
+        schema_editor.execute(
+            'ALTER TABLE sales_consultantsearchdocument ADD FULLTEXT INDEX sales_consultant_search_ft (document)'
+        )
+
+
+def drop_fulltext_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'mysql':
+        schema_editor.execute('ALTER TABLE sales_consultantsearchdocument DROP INDEX sales_consultant_search_ft')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sales', '0009_submission_chain_key'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ConsultantSearchDocument',
+            fields=[
+                ('consultant', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='search_document', serialize=False, to='sales.consultant')),
+                ('document', models.TextField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ConsultantSearchToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.CharField(max_length=64)),
+                ('weight', models.PositiveSmallIntegerField()),
+                ('consultant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_tokens', to='sales.consultant')),
+            ],
+            options={
+                'unique_together': {('token', 'consultant')},
+            },
+        ),
+        migrations.RunPython(add_fulltext_index, drop_fulltext_index),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sales', '0010_consultant_search'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='consultant',
+            name='updated_on',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:20
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sales', '0011_consultant_updated_on_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ConsultantChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('batch', models.UUIDField(db_index=True)),
+                ('consultant_id', models.BigIntegerField()),
+                ('action', models.CharField(choices=[('hotlist_add', 'Moved to Hotlist'), ('hotlist_remove', 'Removed from Hotlist'), ('rerank', 'Priority re-ranked')], max_length=20)),
+                ('field', models.CharField(max_length=50)),
+                ('old_value', models.CharField(blank=True, max_length=100, null=True)),
+                ('new_value', models.CharField(blank=True, max_length=100, null=True)),
+                ('changed_at', models.DateTimeField(auto_now_add=True)),
+                ('changed_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['consultant_id', 'changed_at'], name='sales_cons_change_idx')],
+            },
+        ),
+    ]
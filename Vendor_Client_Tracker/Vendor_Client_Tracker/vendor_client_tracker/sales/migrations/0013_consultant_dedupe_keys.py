@@ -0,0 +1,109 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:23
+
+import re
+
+from django.db import migrations, models
+
+# frozen copy of sales.normalization as of this migration
+DEFAULT_COUNTRY_CODE = '1'
+EXTENSION_RE = re.compile(r'\s*(?:x|ext\.?|extension)\s*\d+\s*$', re.IGNORECASE)
+GMAIL_DOMAINS = {'gmail.com', 'googlemail.com'}
+SOUNDEX_CODES = {
+    **dict.fromkeys('bfpv', '1'), **dict.fromkeys('cgjkqsxz', '2'), **dict.fromkeys('dt', '3'),
+    'l': '4', **dict.fromkeys('mn', '5'), 'r': '6',
+}
+
+
+def normalize_email(email):
+    email = (email or '').strip().lower()
+    return email or None
+
+
+def canonical_email(email):
+    email = normalize_email(email)
+    if not email or '@' not in email:
+        return email
+    local, domain = email.rsplit('@', 1)
+    local = local.split('+', 1)[0]
+    if domain in GMAIL_DOMAINS:
+        local, domain = local.replace('.', ''), 'gmail.com'
+    return f'{local}@{domain}'
+
+
+def normalize_phone(phone):
+    phone = EXTENSION_RE.sub('', (phone or '').strip())
+    digits = re.sub(r'\D', '', phone)
+    if phone.startswith('+'):
+        pass
+    elif phone.startswith('00'):
+        digits = digits[2:]
+    elif len(digits) == 10:
+        digits = DEFAULT_COUNTRY_CODE + digits
+    elif not (len(digits) == 11 and digits.startswith(DEFAULT_COUNTRY_CODE)):
+        return None
+    if not 8 <= len(digits) <= 15:
+        return None
+    return '+' + digits
+
+
+def soundex(name):
+    letters = [c for c in (name or '').lower() if 'a' <= c <= 'z']
+    if not letters:
+        return ''
+    code, previous = letters[0].upper(), SOUNDEX_CODES.get(letters[0], '')
+    for c in letters[1:]:
+        digit = SOUNDEX_CODES.get(c, '')
+        if digit and digit != previous:
+            code += digit
+            if len(code) == 4:
+                break
+        if c not in 'hw':
+            previous = digit
+    return code.ljust(4, '0')
+
+
+def name_key(first_name, last_name, dob):
+    if not last_name or not dob:
+        return None
+    return f"{soundex(last_name)}{soundex(first_name)}{str(dob)[:10].replace('-', '')}"
+
+
+def backfill_dedupe_keys(apps, schema_editor):
+    Consultant = apps.get_model('sales', 'Consultant')
+    batch = []
+    consultants = Consultant.objects.only('email', 'phone_number', 'first_name', 'last_name', 'dob')
+    for consultant in consultants.iterator(chunk_size=2000):
+        consultant.email_key = canonical_email(consultant.email)
+        consultant.phone_key = normalize_phone(consultant.phone_number)
+        consultant.name_key = name_key(consultant.first_name, consultant.last_name, consultant.dob)
+        batch.append(consultant)
+        if len(batch) >= 2000:
+            Consultant.objects.bulk_update(batch, ['email_key', 'phone_key', 'name_key'])
+            batch = []
+    Consultant.objects.bulk_update(batch, ['email_key', 'phone_key', 'name_key'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sales', '0012_consultantchange'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='consultant',
+            name='email_key',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=254, null=True),
+        ),
+        migrations.AddField(
+            model_name='consultant',
+            name='name_key',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=20, null=True),
+        ),
+        migrations.AddField(
+            model_name='consultant',
+            name='phone_key',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=16, null=True),
+        ),
+        migrations.RunPython(backfill_dedupe_keys, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,86 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:34
+
+import re
+
+from django.db import migrations, models
+
+# frozen copy of sales.normalization as of this migration
+DEFAULT_COUNTRY_CODE = '1'
+EXTENSION_RE = re.compile(r'\s*(?:x|ext\.?|extension)\s*\d+\s*$', re.IGNORECASE)
+
+
+def normalize_email(email):
+    email = (email or '').strip().lower()
+    return email or None
+
+
+def normalize_phone(phone):
+    phone = EXTENSION_RE.sub('', (phone or '').strip())
+    digits = re.sub(r'\D', '', phone)
+    if phone.startswith('+'):
+        pass
+    elif phone.startswith('00'):
+        digits = digits[2:]
+    elif len(digits) == 10:
+        digits = DEFAULT_COUNTRY_CODE + digits
+    elif not (len(digits) == 11 and digits.startswith(DEFAULT_COUNTRY_CODE)):
+        return None
+    if not 8 <= len(digits) <= 15:
+        return None
+    return '+' + digits
+
+
+def ssn_digits(ssn):
+    digits = re.sub(r'\D', '', ssn or '')
+    return digits or None
+
+
+def backfill_lookup_keys(apps, schema_editor):
+    # the oldest consultant keeps a contested value; later duplicates are left NULL
+    # (find them with `manage.py find_duplicate_consultants`)
+    Consultant = apps.get_model('sales', 'Consultant')
+    fields = ['email_normalized', 'phone_e164', 'ssn_digits']
+    taken = {field: set() for field in fields}
+    batch = []
+    consultants = Consultant.objects.only('email', 'phone_number', 'ssn').order_by('id')
+    for consultant in consultants.iterator(chunk_size=2000):
+        values = {
+            'email_normalized': normalize_email(consultant.email),
+            'phone_e164': normalize_phone(consultant.phone_number),
+            'ssn_digits': ssn_digits(consultant.ssn),
+        }
+        for field, value in values.items():
+            if value is not None and value not in taken[field]:
+                taken[field].add(value)
+                setattr(consultant, field, value)
+        batch.append(consultant)
+        if len(batch) >= 2000:
+            Consultant.objects.bulk_update(batch, fields)
+            batch = []
+    Consultant.objects.bulk_update(batch, fields)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sales', '0013_consultant_dedupe_keys'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='consultant',
+            name='email_normalized',
+            field=models.CharField(blank=True, editable=False, max_length=254, null=True, unique=True),
+        ),
+        migrations.AddField(
+            model_name='consultant',
+            name='phone_e164',
+            field=models.CharField(blank=True, editable=False, max_length=16, null=True, unique=True),
+        ),
+        migrations.AddField(
+            model_name='consultant',
+            name='ssn_digits',
+            field=models.CharField(blank=True, editable=False, max_length=15, null=True, unique=True),
+        ),
+        migrations.RunPython(backfill_lookup_keys, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,79 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:38
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def backfill_events(apps, schema_editor):
+    # history before this migration is unknown: one creation event per submission
+    # with its current status, and untimed funnel counters
+    Submission = apps.get_model('sales', 'Submission')
+    SubmissionEvent = apps.get_model('sales', 'SubmissionEvent')
+    SubmissionFunnel = apps.get_model('sales', 'SubmissionFunnel')
+    rows = Submission.objects.order_by('id').values_list(
+        'id', 'vendor_response', 'resume_passed_to_client', 'submission_date')
+    SubmissionEvent.objects.bulk_create(
+        (SubmissionEvent(submission_id=pk, to_status=status, resume_passed_to_client=passed, ts=ts)
+         for pk, status, passed, ts in rows.iterator(chunk_size=1000)),
+        batch_size=1000,
+    )
+    for dimension in ('vendor', 'end_client', 'marketer'):
+        groups = (Submission.objects.order_by().values(f'{dimension}_id').annotate(
+            submitted=Count('id'),
+            resume_passed=Count('id', filter=Q(resume_passed_to_client=True)),
+            rejected=Count('id', filter=Q(vendor_response='ClientRejected')),
+            selected=Count('id', filter=Q(vendor_response='ClientSelected')),
+        ))
+        SubmissionFunnel.objects.bulk_create(
+            [SubmissionFunnel(dimension=dimension, dimension_id=g.pop(f'{dimension}_id') or 0, **g) for g in groups],
+            batch_size=1000,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sales', '0014_consultant_lookup_keys'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SubmissionFunnel',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dimension', models.CharField(choices=[('vendor', 'Vendor'), ('end_client', 'End Client'), ('marketer', 'Marketer')], max_length=20)),
+                ('dimension_id', models.BigIntegerField(default=0)),
+                ('submitted', models.IntegerField(default=0)),
+                ('resume_passed', models.IntegerField(default=0)),
+                ('rejected', models.IntegerField(default=0)),
+                ('selected', models.IntegerField(default=0)),
+                ('response_count', models.IntegerField(default=0)),
+                ('response_seconds', models.BigIntegerField(default=0)),
+                ('selection_count', models.IntegerField(default=0)),
+                ('selection_seconds', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'unique_together': {('dimension', 'dimension_id')},
+            },
+        ),
+        migrations.CreateModel(
+            name='SubmissionEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('submission_id', models.BigIntegerField()),
+                ('from_status', models.CharField(blank=True, max_length=50, null=True)),
+                ('to_status', models.CharField(max_length=50)),
+                ('resume_passed_to_client', models.BooleanField(default=False)),
+                ('ts', models.DateTimeField(default=django.utils.timezone.now)),
+                ('changed_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['submission_id', 'ts'], name='sales_subm_event_subm_idx'), models.Index(fields=['ts'], name='sales_subm_event_ts_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_events, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:39
+
+from django.db import migrations, models
+from django.db.models import Count, Max, Q
+
+
+def backfill_counters(apps, schema_editor):
+    Submission = apps.get_model('sales', 'Submission')
+    SubmissionCounter = apps.get_model('sales', 'SubmissionCounter')
+    statuses = {'ClientSubmitted': 'client_submitted', 'ClientRejected': 'client_rejected',
+                'ClientSelected': 'client_selected'}
+    for entity in ('consultant', 'vendor', 'end_client', 'marketer'):
+        groups = Submission.objects.order_by().values(f'{entity}_id').annotate(
+            total=Count('id'),
+            last_submission_at=Max('submission_date'),
+            **{field: Count('id', filter=Q(vendor_response=status)) for status, field in statuses.items()},
+        )
+        SubmissionCounter.objects.bulk_create(
+            [SubmissionCounter(entity=entity, entity_id=g.pop(f'{entity}_id') or 0, **g) for g in groups],
+            batch_size=1000,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sales', '0015_submission_events'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SubmissionCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('entity', models.CharField(choices=[('consultant', 'Consultant'), ('vendor', 'Vendor'), ('end_client', 'End Client'), ('marketer', 'Marketer')], max_length=20)),
+                ('entity_id', models.BigIntegerField(default=0)),
+                ('total', models.IntegerField(default=0)),
+                ('client_submitted', models.IntegerField(default=0)),
+                ('client_rejected', models.IntegerField(default=0)),
+                ('client_selected', models.IntegerField(default=0)),
+                ('last_submission_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'unique_together': {('entity', 'entity_id')},
+            },
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
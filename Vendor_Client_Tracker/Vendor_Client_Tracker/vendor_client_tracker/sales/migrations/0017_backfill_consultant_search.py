@@ -0,0 +1,76 @@
+# Generated by Django 5.2.18 on 2026-10-18 00:20
+
+import re
+
+from django.conf import settings
+from django.db import migrations
+
+# frozen copy of sales.search's tokenizer as of this migration
+NAME, CONTACT, SKILL, PROFILE, EDUCATION = 5, 4, 3, 2, 1
+MAX_TOKEN_LENGTH = 64
+TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+
+def tokenize(text):
+    return [t[:MAX_TOKEN_LENGTH] for t in TOKEN_RE.findall(str(text).lower())] if text else []
+
+
+def phone_tokens(phone):
+    digits = re.sub(r'\D', '', phone or '')
+    return list(dict.fromkeys([digits, digits[-10:]])) if digits else []
+
+
+def consultant_tokens(consultant, skills, visas):
+    weighted = [
+        (NAME, [consultant.first_name, consultant.middle_name, consultant.last_name]),
+        (CONTACT, [consultant.email]),
+        (SKILL, [skills.get(consultant.skill_id)]),
+        (PROFILE, [visas.get(consultant.visa_status_id), consultant.pref_location]),
+        (EDUCATION, [value for edu in consultant.education.all() for value in (edu.university_name, edu.major)]),
+    ]
+    tokens = {}
+    for weight, values in weighted:
+        for value in values:
+            for token in tokenize(value):
+                tokens[token] = max(weight, tokens.get(token, 0))
+    for phone in (consultant.phone_number, consultant.other_phone_number):
+        for token in phone_tokens(phone):
+            tokens[token] = max(CONTACT, tokens.get(token, 0))
+    return tokens
+
+
+def backfill_search_index(apps, schema_editor):
+    """Index the consultants that existed before the search tables (0010) and were never indexed."""
+    Consultant = apps.get_model('sales', 'Consultant')
+    Skill = apps.get_model('sales', 'Skill')
+    Visa = apps.get_model('sales', 'Visa')
+    ConsultantSearchDocument = apps.get_model('sales', 'ConsultantSearchDocument')
+    ConsultantSearchToken = apps.get_model('sales', 'ConsultantSearchToken')
+
+    with_tokens = not (schema_editor.connection.vendor == 'mysql'
+                       and getattr(settings, 'CONSULTANT_SEARCH_FULLTEXT', True))
+    skills = dict(Skill.objects.values_list('id', 'name'))
+    visas = dict(Visa.objects.values_list('id', 'name'))
+    ids = list(Consultant.objects.filter(search_document__isnull=True).order_by('id').values_list('id', flat=True))
+    for start in range(0, len(ids), 500):
+        documents, postings = [], []
+        for consultant in Consultant.objects.filter(id__in=ids[start:start + 500]).prefetch_related('education'):
+            tokens = consultant_tokens(consultant, skills, visas)
+            document = ' '.join(' '.join([token] * weight) for token, weight in tokens.items())
+            documents.append(ConsultantSearchDocument(consultant_id=consultant.id, document=document))
+            if with_tokens:
+                postings.extend(ConsultantSearchToken(token=token, consultant_id=consultant.id, weight=weight)
+                                for token, weight in tokens.items())
+        ConsultantSearchDocument.objects.bulk_create(documents)
+        ConsultantSearchToken.objects.bulk_create(postings, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sales', '0016_submissioncounter'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_search_index, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.18 on 2026-10-18 00:20
+
+import re
+
+from django.db import migrations, models
+
+# frozen copy of sales.normalization as of this migration
+DEFAULT_COUNTRY_CODE = '1'
+EXTENSION_RE = re.compile(r'\s*(?:x|ext\.?|extension)\s*\d+\s*$', re.IGNORECASE)
+
+
+def normalize_phone(phone):
+    phone = EXTENSION_RE.sub('', (phone or '').strip())
+    digits = re.sub(r'\D', '', phone)
+    if phone.startswith('+'):
+        pass
+    elif phone.startswith('00'):
+        digits = digits[2:]
+    elif len(digits) == 10:
+        digits = DEFAULT_COUNTRY_CODE + digits
+    elif not (len(digits) == 11 and digits.startswith(DEFAULT_COUNTRY_CODE)):
+        return None
+    if not 8 <= len(digits) <= 15:
+        return None
+    return '+' + digits
+
+
+def fill_shared_phone_keys(apps, schema_editor):
+    # 0014 left later holders of a shared phone NULL; a phone may be shared now
+    Consultant = apps.get_model('sales', 'Consultant')
+    batch = []
+    consultants = Consultant.objects.filter(phone_e164__isnull=True).only('phone_number').order_by('id')
+    for consultant in consultants.iterator(chunk_size=2000):
+        consultant.phone_e164 = normalize_phone(consultant.phone_number)
+        if consultant.phone_e164 is not None:
+            batch.append(consultant)
+    Consultant.objects.bulk_update(batch, ['phone_e164'], batch_size=2000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sales', '0017_backfill_consultant_search'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='consultant',
+            name='phone_e164',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=16, null=True),
+        ),
+        migrations.RunPython(fill_shared_phone_keys, migrations.RunPython.noop),
+    ]
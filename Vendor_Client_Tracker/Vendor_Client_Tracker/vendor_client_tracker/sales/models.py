@@ -1,9 +1,12 @@
+import hashlib
+
 from django.db import models
 from django.conf import settings
 from django.utils import timezone
 from vendors.models import Vendor
 from clients.models import Client
 from adminpanel.models import Marketer
+from . import normalization
 
 
 class Skill(models.Model):
@@ -43,11 +46,86 @@ class Consultant(models.Model):
     pref_location = models.CharField(max_length=100, blank=True, null=True)
     priority = models.IntegerField(default=0)
     created_on = models.DateTimeField(auto_now_add=True)
-    updated_on = models.DateTimeField(auto_now=True)
+    updated_on = models.DateTimeField(auto_now=True, db_index=True)  # change feed for sales.matching
+
+    # Normalized lookup columns (lowercase email, E.164 phone, SSN digits): duplicate
+    # checks and contact lookups are index seeks on these. Email and SSN are unique;
+    # a phone may be shared. Derived in save() when their source field changes; NULL
+    # for values that do not normalize and for legacy rows that collided on backfill.
+    email_normalized = models.CharField(max_length=254, unique=True, blank=True, null=True, editable=False)
+    phone_e164 = models.CharField(max_length=16, blank=True, null=True, editable=False, db_index=True)
+    ssn_digits = models.CharField(max_length=15, unique=True, blank=True, null=True, editable=False)
+
+    # Blocking keys for fuzzy duplicate detection (sales.dedupe): only consultants
+    # sharing one of these are ever compared. Derived from the fields below in save().
+    email_key = models.CharField(max_length=254, blank=True, null=True, editable=False, db_index=True)
+    phone_key = models.CharField(max_length=16, blank=True, null=True, editable=False, db_index=True)
+    name_key = models.CharField(max_length=20, blank=True, null=True, editable=False, db_index=True)
+
+    LOOKUP_SOURCE_FIELDS = {'email', 'phone_number', 'ssn'}
+    LOOKUP_KEY_FIELDS = ('email_normalized', 'phone_e164', 'ssn_digits')
+    # lookup key -> (source field, normalizer)
+    LOOKUP_KEYS = {
+        'email_normalized': ('email', normalization.normalize_email),
+        'phone_e164': ('phone_number', normalization.normalize_phone),
+        'ssn_digits': ('ssn', normalization.ssn_digits),
+    }
+    UNIQUE_KEY_FIELDS = ('email_normalized', 'ssn_digits')
+    DEDUPE_SOURCE_FIELDS = {'email', 'phone_number', 'first_name', 'last_name', 'dob'}
+    DEDUPE_KEY_FIELDS = ('email_key', 'phone_key', 'name_key')
 
     def __str__(self):
         return f"{self.first_name} {self.last_name}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # remembered so save() only re-derives lookup keys whose source changed
+        instance._loaded_lookup_sources = {
+            field: getattr(instance, field) for field in cls.LOOKUP_SOURCE_FIELDS if field in field_names
+        }
+        return instance
+
+    @staticmethod
+    def dedupe_keys(email, phone_number, first_name, last_name, dob):
+        """(email_key, phone_key, name_key): canonical email, E.164 phone, Soundex of last+first name + DOB."""
+        return (normalization.canonical_email(email), normalization.normalize_phone(phone_number),
+                normalization.name_key(first_name, last_name, dob))
+
+    def set_dedupe_keys(self):
+        self.email_key, self.phone_key, self.name_key = self.dedupe_keys(
+            self.email, self.phone_number, self.first_name, self.last_name, self.dob
+        )
+
+    def set_lookup_keys(self):
+        """
+        Derive the lookup keys whose source field's normalized value changed. A
+        stored key is kept as is otherwise, so a legacy duplicate left NULL by the
+        backfill stays NULL (and saveable) until its email/phone/SSN is edited.
+        """
+        loaded = getattr(self, '_loaded_lookup_sources', {})
+        for key, (field, normalize) in self.LOOKUP_KEYS.items():
+            value = normalize(getattr(self, field))
+            if field not in loaded or normalize(loaded[field]) != value:
+                setattr(self, key, value)
+
+    def set_derived_fields(self):
+        self.set_lookup_keys()
+        self.set_dedupe_keys()
+
+    def save(self, *args, **kwargs):
+        self.set_derived_fields()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            update_fields = set(update_fields)
+            if self.LOOKUP_SOURCE_FIELDS & update_fields:
+                update_fields.update(self.LOOKUP_KEY_FIELDS)
+            if self.DEDUPE_SOURCE_FIELDS & update_fields:
+                update_fields.update(self.DEDUPE_KEY_FIELDS)
+            kwargs['update_fields'] = update_fields
+        super().save(*args, **kwargs)
+        self._loaded_lookup_sources = {field: getattr(self, field) for field in self.LOOKUP_SOURCE_FIELDS}
+
 
 class ConsultantAddress(models.Model):
     consultant = models.OneToOneField(Consultant, on_delete=models.CASCADE, related_name='address')
@@ -86,9 +164,185 @@ class Submission(models.Model):
     resume_passed_to_client = models.BooleanField(default=False)
     is_duplicate = models.BooleanField(default=False)
 
+    # Fingerprint of the consultant → vendor → prime vendor → implementation partner → client
+    # chain with NULL hashed as a real value. unique_together on the nullable FKs never held
+    # on MySQL (NULLs are distinct); this one index backs both the duplicate check and the
+    # uniqueness guarantee. NULL only for historical duplicates flagged with is_duplicate.
+    chain_key = models.CharField(max_length=64, unique=True, null=True, editable=False)
+    CHAIN_KEY_FIELDS = ('consultant', 'vendor', 'prime_vendor', 'implementation_partner', 'end_client')
+
     class Meta:
-        unique_together = ('consultant', 'vendor', 'prime_vendor', 'implementation_partner', 'end_client')
         ordering = ['-submission_date']
+        indexes = [
+            # backs the keyset pagination of GetAllSubmissions
+            models.Index(fields=['-submission_date', 'id'], name='sales_subm_date_id_idx'),
+        ]
 
     def __str__(self):
-        return f"{self.consultant.first_name} → {self.vendor.name if self.vendor else 'N/A'}"
\ No newline at end of file
+        return f"{self.consultant.first_name} → {self.vendor.name if self.vendor else 'N/A'}"
+
+    @staticmethod
+    def compute_chain_key(consultant_id, vendor_id, prime_vendor_id, implementation_partner_id, end_client_id):
+        parts = (consultant_id, vendor_id, prime_vendor_id, implementation_partner_id, end_client_id)
+        raw = '|'.join('-' if part is None else str(int(part)) for part in parts)
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        chain_changed = update_fields is None or any(
+            field in update_fields or f'{field}_id' in update_fields for field in self.CHAIN_KEY_FIELDS
+        )
+        if not self.is_duplicate and chain_changed:
+            self.chain_key = self.compute_chain_key(
+                *(getattr(self, f'{field}_id') for field in self.CHAIN_KEY_FIELDS)
+            )
+            if update_fields is not None:
+                kwargs['update_fields'] = set(update_fields) | {'chain_key'}
+        super().save(*args, **kwargs)
+
+class SubmissionDailyRollup(models.Model):
+    """
+    Submission counts per day and dimension, maintained incrementally by
+    sales.signals and rebuilt with `manage.py rebuild_submission_rollup`.
+    Dimension ids are plain integers with 0 meaning "none", so the unique key
+    also holds for submissions without a vendor/client/marketer/skill
+    (MySQL treats NULLs in a unique index as distinct).
+    """
+    day = models.DateField()
+    consultant_id = models.BigIntegerField()
+    vendor_id = models.BigIntegerField(default=0)
+    end_client_id = models.BigIntegerField(default=0)
+    marketer_id = models.BigIntegerField(default=0)
+    skill_id = models.BigIntegerField(default=0)
+    vendor_response = models.CharField(max_length=50)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        # day leads the unique index, so it also serves the report's day range scans
+        unique_together = ('day', 'consultant_id', 'vendor_id', 'end_client_id', 'marketer_id', 'skill_id', 'vendor_response')
+
+
+class ConsultantSearchDocument(models.Model):
+    """
+    Searchable text of one consultant (names, email, phone, skill, visa,
+    preferred location, education), maintained by sales.search. On MySQL the
+    column carries a FULLTEXT index (migration 0010) and answers the search.
+    """
+    consultant = models.OneToOneField(Consultant, on_delete=models.CASCADE, primary_key=True,
+                                      related_name='search_document')
+    document = models.TextField()
+
+
+class ConsultantSearchToken(models.Model):
+    """
+    Inverted index (token -> consultant) used for search where FULLTEXT is not
+    available. The unique index leads with token, so prefix lookups are range
+    scans; weight is the highest field weight the token appeared in.
+    """
+    token = models.CharField(max_length=64)
+    consultant = models.ForeignKey(Consultant, on_delete=models.CASCADE, related_name='search_tokens')
+    weight = models.PositiveSmallIntegerField()
+
+    class Meta:
+        unique_together = ('token', 'consultant')
+
+
+class ConsultantChange(models.Model):
+    """
+    Audit row for one field of one consultant changed by a bulk hotlist/priority
+    operation (sales.hotlist). Rows written by the same call share `batch`.
+    """
+    ACTION_CHOICES = [
+        ('hotlist_add', 'Moved to Hotlist'),
+        ('hotlist_remove', 'Removed from Hotlist'),
+        ('rerank', 'Priority re-ranked'),
+    ]
+
+    batch = models.UUIDField(db_index=True)
+    consultant_id = models.BigIntegerField()  # plain id, so the audit outlives the consultant
+    action = models.CharField(max_length=20, choices=ACTION_CHOICES)
+    field = models.CharField(max_length=50)
+    old_value = models.CharField(max_length=100, blank=True, null=True)
+    new_value = models.CharField(max_length=100, blank=True, null=True)
+    changed_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True)
+    changed_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['consultant_id', 'changed_at'], name='sales_cons_change_idx'),
+        ]
+
+
+class SubmissionEvent(models.Model):
+    """
+    Append-only log of Submission status changes (vendor_response and
+    resume_passed_to_client), written by sales.funnel on every save that changes
+    either. from_status is NULL for the event recording the submission's creation.
+    """
+    submission_id = models.BigIntegerField()  # plain id, so the history outlives the submission
+    from_status = models.CharField(max_length=50, blank=True, null=True)
+    to_status = models.CharField(max_length=50)
+    resume_passed_to_client = models.BooleanField(default=False)
+    changed_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True)
+    ts = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['submission_id', 'ts'], name='sales_subm_event_subm_idx'),
+            models.Index(fields=['ts'], name='sales_subm_event_ts_idx'),
+        ]
+
+
+class SubmissionFunnel(models.Model):
+    """
+    Funnel counters per vendor, end client or marketer, maintained incrementally
+    from SubmissionEvent by sales.funnel. Stage counts count each submission once
+    per stage it ever reached; the *_seconds totals (submission_date to first
+    response / to selection) cover the *_count events they were timed on.
+    dimension_id 0 means "none" (see SubmissionDailyRollup).
+    """
+    DIMENSION_CHOICES = [
+        ('vendor', 'Vendor'),
+        ('end_client', 'End Client'),
+        ('marketer', 'Marketer'),
+    ]
+
+    dimension = models.CharField(max_length=20, choices=DIMENSION_CHOICES)
+    dimension_id = models.BigIntegerField(default=0)
+    submitted = models.IntegerField(default=0)
+    resume_passed = models.IntegerField(default=0)
+    rejected = models.IntegerField(default=0)
+    selected = models.IntegerField(default=0)
+    response_count = models.IntegerField(default=0)
+    response_seconds = models.BigIntegerField(default=0)
+    selection_count = models.IntegerField(default=0)
+    selection_seconds = models.BigIntegerField(default=0)
+
+    class Meta:
+        unique_together = ('dimension', 'dimension_id')
+
+
+class SubmissionCounter(models.Model):
+    """
+    Submission totals per consultant, vendor, end client and marketer, kept
+    current with F() deltas in the transaction of every submission create,
+    update and delete (sales.counters) and repaired by
+    `manage.py reconcile_submission_counters`. entity_id 0 means "none".
+    """
+    ENTITY_CHOICES = [
+        ('consultant', 'Consultant'),
+        ('vendor', 'Vendor'),
+        ('end_client', 'End Client'),
+        ('marketer', 'Marketer'),
+    ]
+
+    entity = models.CharField(max_length=20, choices=ENTITY_CHOICES)
+    entity_id = models.BigIntegerField(default=0)
+    total = models.IntegerField(default=0)
+    client_submitted = models.IntegerField(default=0)
+    client_rejected = models.IntegerField(default=0)
+    client_selected = models.IntegerField(default=0)
+    last_submission_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        unique_together = ('entity', 'entity_id')
@@ -0,0 +1,91 @@
+"""
+Normalizers for consultant identity fields: emails, phone numbers (E.164)
+and names (Soundex). Pure functions; the migrations that backfill these keys
+carry frozen copies, so changes here do not alter them.
+"""
+
+import re
+
+DEFAULT_COUNTRY_CODE = '1'  # numbers without a country code are taken as US/Canada
+
+EXTENSION_RE = re.compile(r'\s*(?:x|ext\.?|extension)\s*\d+\s*$', re.IGNORECASE)
+GMAIL_DOMAINS = {'gmail.com', 'googlemail.com'}
+SOUNDEX_CODES = {
+    **dict.fromkeys('bfpv', '1'), **dict.fromkeys('cgjkqsxz', '2'), **dict.fromkeys('dt', '3'),
+    'l': '4', **dict.fromkeys('mn', '5'), 'r': '6',
+}
+
+
+def normalize_email(email):
+    """Trimmed, lowercased address (None for blank)."""
+    email = (email or '').strip().lower()
+    return email or None
+
+
+def canonical_email(email):
+    """
+    Mailbox identity of an address: lowercased, "+tag" dropped from the local
+    part and, for Gmail, dots ignored - so Jane.Doe+jobs@GMail.com and
+    janedoe@gmail.com compare equal.
+    """
+    email = normalize_email(email)
+    if not email or '@' not in email:
+        return email
+    local, domain = email.rsplit('@', 1)
+    local = local.split('+', 1)[0]
+    if domain in GMAIL_DOMAINS:
+        local, domain = local.replace('.', ''), 'gmail.com'
+    return f'{local}@{domain}'
+
+
+def normalize_phone(phone, default_country_code=DEFAULT_COUNTRY_CODE):
+    """
+    E.164 form (+15551234567) of a phone number in any common format, or
+    None when it has too few digits to be a phone number.
+    """
+    phone = EXTENSION_RE.sub('', (phone or '').strip())
+    digits = re.sub(r'\D', '', phone)
+    if phone.startswith('+'):
+        pass
+    elif phone.startswith('00'):
+        digits = digits[2:]
+    elif len(digits) == 10:
+        digits = default_country_code + digits
+    elif not (len(digits) == 11 and digits.startswith(default_country_code)):
+        return None
+    if not 8 <= len(digits) <= 15:
+        return None
+    return '+' + digits
+
+
+def ssn_digits(ssn):
+    digits = re.sub(r'\D', '', ssn or '')
+    return digits or None
+
+
+def soundex(name):
+    """American Soundex code (R163 for Robert/Rupert), '' for names without letters."""
+    letters = [c for c in (name or '').lower() if 'a' <= c <= 'z']
+    if not letters:
+        return ''
+    code, previous = letters[0].upper(), SOUNDEX_CODES.get(letters[0], '')
+    for c in letters[1:]:
+        digit = SOUNDEX_CODES.get(c, '')
+        if digit and digit != previous:
+            code += digit
+            if len(code) == 4:
+                break
+        if c not in 'hw':  # h/w do not separate letters with the same code
+            previous = digit
+    return code.ljust(4, '0')
+
+
+def normalize_name(name):
+    return ' '.join(re.sub(r'[^a-z\s]', '', (name or '').lower()).split())
+
+
+def name_key(first_name, last_name, dob):
+    """Soundex of last + first name followed by the birth date, e.g. S530J50019900101."""
+    if not last_name or not dob:
+        return None
+    return f"{soundex(last_name)}{soundex(first_name)}{str(dob)[:10].replace('-', '')}"
@@ -0,0 +1,119 @@
+"""
+Incremental maintenance of SubmissionDailyRollup.
+
+Every submission contributes +1 to the rollup row for its (day, consultant,
+vendor, end_client, marketer, skill, vendor_response) key. Saves and deletes
+apply +1/-1 deltas with F() updates; rebuild_rollup() recomputes a day range
+from scratch for backfills and drift repair. Deleting a vendor, client,
+marketer or skill SET_NULLs its submissions with a plain UPDATE that sends no
+signals, so its rows are folded into the 0 ("none") key beforehand (see
+move_to_none and sales.signals).
+"""
+
+from collections import Counter
+from datetime import datetime, time, timedelta
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import Submission, SubmissionDailyRollup
+
+KEY_FIELDS = ('consultant_id', 'vendor_id', 'end_client_id', 'marketer_id', 'skill_id')
+BATCH_SIZE = 1000
+
+
+def rollup_key(submission_date, vendor_response, **ids):
+    key = {name: ids.get(name) or 0 for name in KEY_FIELDS}
+    key['day'] = timezone.localdate(submission_date)
+    key['vendor_response'] = vendor_response or ''
+    return key
+
+
+def submission_rollup_key(submission):
+    return rollup_key(
+        submission.submission_date, submission.vendor_response,
+        **{name: getattr(submission, name) for name in KEY_FIELDS}
+    )
+
+
+def apply_delta(key, delta):
+    rows = SubmissionDailyRollup.objects.filter(**key)
+    if rows.update(count=F('count') + delta) or delta < 0:
+        return
+    try:
+        with transaction.atomic():
+            SubmissionDailyRollup.objects.create(count=delta, **key)
+    except IntegrityError:
+        # created concurrently by another writer
+        rows.update(count=F('count') + delta)
+
+
+def apply_created(submissions):
+    """
+    Deltas for bulk-inserted submissions: one +n UPDATE per distinct rollup key,
+    then the missing rows in one bulk insert.
+    """
+    keys = Counter(tuple(submission_rollup_key(s).items()) for s in submissions)
+    missing = [
+        (dict(key), count) for key, count in keys.items()
+        if not SubmissionDailyRollup.objects.filter(**dict(key)).update(count=F('count') + count)
+    ]
+    try:
+        with transaction.atomic():
+            SubmissionDailyRollup.objects.bulk_create([SubmissionDailyRollup(count=n, **key) for key, n in missing])
+    except IntegrityError:
+        # some were created concurrently; fall back to the per-row path
+        for key, count in missing:
+            apply_delta(key, count)
+
+
+def move_to_none(field, pk):
+    """Fold the rows keyed by `field` = pk (a KEY_FIELDS dimension about to be deleted) into `field` = 0."""
+    rows = SubmissionDailyRollup.objects.filter(**{field: pk})
+    moved = Counter()
+    for row in rows.values('day', 'vendor_response', 'count', *KEY_FIELDS).iterator(chunk_size=BATCH_SIZE):
+        count = row.pop('count')
+        row[field] = 0
+        moved[tuple(row.items())] += count
+    rows.delete()
+    for key, count in moved.items():
+        apply_delta(dict(key), count)
+
+
+def rebuild_rollup(start=None, end=None):
+    """Recompute rollup rows for [start, end] (dates, inclusive; None = open ended)."""
+    submissions = Submission.objects.all()
+    rollups = SubmissionDailyRollup.objects.all()
+    if start:
+        submissions = submissions.filter(submission_date__gte=_day_start(start))
+        rollups = rollups.filter(day__gte=start)
+    if end:
+        submissions = submissions.filter(submission_date__lt=_day_start(end + timedelta(days=1)))
+        rollups = rollups.filter(day__lte=end)
+
+    groups = (submissions.order_by()
+              .annotate(day=TruncDate('submission_date'))
+              .values('day', 'vendor_response', *KEY_FIELDS)
+              .annotate(count=Count('id')))
+
+    with transaction.atomic():
+        rollups.delete()
+        batch, total = [], 0
+        for group in groups.iterator(chunk_size=BATCH_SIZE):
+            row = {name: group[name] or 0 for name in KEY_FIELDS}
+            batch.append(SubmissionDailyRollup(
+                day=group['day'], vendor_response=group['vendor_response'] or '', count=group['count'], **row
+            ))
+            if len(batch) >= BATCH_SIZE:
+                SubmissionDailyRollup.objects.bulk_create(batch)
+                total += len(batch)
+                batch = []
+        SubmissionDailyRollup.objects.bulk_create(batch)
+        total += len(batch)
+    return total
+
+
+def _day_start(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
@@ -0,0 +1,188 @@
+"""
+Consultant search over names, email, phone, skill, visa, preferred location
+and education (university, major).
+
+Every consultant has a ConsultantSearchDocument row; on MySQL its FULLTEXT
+index answers queries in boolean mode (`+term*` per term). Elsewhere (SQLite
+in tests, or CONSULTANT_SEARCH_FULLTEXT = False) the ConsultantSearchToken
+inverted index is maintained instead and prefix terms become index range
+scans. All query terms must match; results are ranked by field weight, with
+exact token matches counting double.
+
+The index is updated on commit by sales.signals and the AddConsultant batch
+path; `manage.py rebuild_consultant_search` (re)builds it from scratch.
+"""
+
+import re
+from functools import partial
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import BooleanField, Case, F, FloatField, IntegerField, Max, Q, Sum, When
+from django.db.models.expressions import RawSQL
+
+from .lookups import lookups
+from .models import Consultant, ConsultantSearchDocument, ConsultantSearchToken, Skill, Visa
+
+NAME, CONTACT, SKILL, PROFILE, EDUCATION = 5, 4, 3, 2, 1
+MIN_PREFIX_LENGTH = 2  # shorter terms only match whole tokens
+MAX_TERMS = 8
+MAX_TOKEN_LENGTH = 64
+INDEX_CHUNK_SIZE = 500
+CANDIDATE_LIMIT = 2000  # a term matching at most this many consultants drives the token query
+
+TOKEN_RE = re.compile(r'[a-z0-9]+')
+PHONE_QUERY_RE = re.compile(r'[\d\s()+.\-]+')
+
+
+def uses_fulltext():
+    return connection.vendor == 'mysql' and getattr(settings, 'CONSULTANT_SEARCH_FULLTEXT', True)
+
+
+def tokenize(text):
+    return [t[:MAX_TOKEN_LENGTH] for t in TOKEN_RE.findall(str(text).lower())] if text else []
+
+
+def _phone_tokens(phone):
+    digits = re.sub(r'\D', '', phone or '')
+    if not digits:
+        return []
+    # stored with and without a country code, so local-number prefixes match either way
+    return list(dict.fromkeys([digits, digits[-10:]]))
+
+
+def consultant_tokens(consultant, education):
+    """{token: weight} for one consultant; a token keeps the highest weight it appears with."""
+    weighted = [
+        (NAME, [consultant.first_name, consultant.middle_name, consultant.last_name]),
+        (CONTACT, [consultant.email]),
+        (SKILL, [lookups.name(Skill, consultant.skill_id)]),
+        (PROFILE, [lookups.name(Visa, consultant.visa_status_id), consultant.pref_location]),
+        (EDUCATION, [value for edu in education for value in (edu.university_name, edu.major)]),
+    ]
+    tokens = {}
+    for weight, values in weighted:
+        for value in values:
+            for token in tokenize(value):
+                tokens[token] = max(weight, tokens.get(token, 0))
+    for phone in (consultant.phone_number, consultant.other_phone_number):
+        for token in _phone_tokens(phone):
+            tokens[token] = max(CONTACT, tokens.get(token, 0))
+    return tokens
+
+
+def _document(tokens):
+    # repeating a token by its weight raises its term frequency, which is what
+    # the FULLTEXT relevance score ranks on
+    return ' '.join(' '.join([token] * weight) for token, weight in tokens.items())
+
+
+# ---------- Indexing ----------
+def index_consultants(ids):
+    """Rebuild the search rows of the given consultants (ids that no longer exist are dropped)."""
+    ids = list(dict.fromkeys(ids))
+    with_tokens = not uses_fulltext()
+    for start in range(0, len(ids), INDEX_CHUNK_SIZE):
+        chunk = ids[start:start + INDEX_CHUNK_SIZE]
+        documents, postings = [], []
+        for consultant in Consultant.objects.filter(id__in=chunk).prefetch_related('education'):
+            tokens = consultant_tokens(consultant, consultant.education.all())
+            documents.append(ConsultantSearchDocument(consultant_id=consultant.id, document=_document(tokens)))
+            if with_tokens:
+                postings.extend(
+                    ConsultantSearchToken(token=token, consultant_id=consultant.id, weight=weight)
+                    for token, weight in tokens.items()
+                )
+
+        with transaction.atomic():
+            ConsultantSearchDocument.objects.filter(consultant_id__in=chunk).delete()
+            ConsultantSearchToken.objects.filter(consultant_id__in=chunk).delete()
+            ConsultantSearchDocument.objects.bulk_create(documents)
+            ConsultantSearchToken.objects.bulk_create(postings, batch_size=1000)
+
+
+def schedule_index(ids):
+    """Re-index after the current transaction commits (immediately in autocommit)."""
+    ids = list(ids)
+    if ids:
+        transaction.on_commit(partial(index_consultants, ids))
+
+
+def rebuild_index():
+    ConsultantSearchToken.objects.all().delete()
+    ConsultantSearchDocument.objects.all().delete()
+    ids = list(Consultant.objects.order_by('id').values_list('id', flat=True))
+    index_consultants(ids)
+    return len(ids)
+
+
+# ---------- Querying ----------
+def parse_terms(query):
+    query = (query or '').strip()
+    if PHONE_QUERY_RE.fullmatch(query):
+        digits = re.sub(r'\D', '', query)
+        return [digits] if digits else []
+    return list(dict.fromkeys(tokenize(query)))[:MAX_TERMS]
+
+
+def _prefix_filter(term):
+    if len(term) < MIN_PREFIX_LENGTH:
+        return Q(token=term)
+    # tokens are [a-z0-9], so bumping the last character gives the exclusive upper bound
+    return Q(token__gte=term, token__lt=term[:-1] + chr(ord(term[-1]) + 1))
+
+
+def search_consultants(query, limit, offset=0):
+    """[(consultant_id, score)] best first; every term of `query` must match."""
+    terms = parse_terms(query)
+    if not terms:
+        return []
+    if uses_fulltext():
+        return _search_fulltext(terms, limit, offset)
+    return _search_tokens(terms, limit, offset)
+
+
+def _search_fulltext(terms, limit, offset):
+    against = ' '.join(f'+{term}*' for term in terms)
+    sql, params = 'MATCH (document) AGAINST (%s IN BOOLEAN MODE)', [against]
+    rows = (ConsultantSearchDocument.objects
+            .filter(RawSQL(sql, params, output_field=BooleanField()))
+            .annotate(score=RawSQL(sql, params, output_field=FloatField()))
+            .order_by('-score', 'consultant_id')
+            .values_list('consultant_id', 'score'))
+    return list(rows[offset:offset + limit])
+
+
+def _search_tokens(terms, limit, offset):
+    filters = [_prefix_filter(term) for term in terms]
+    matched = {f'term_{i}': Max(Case(When(f, then=1), default=0, output_field=IntegerField()))
+               for i, f in enumerate(filters)}
+    any_term = Q()
+    for f in filters:
+        any_term |= f
+
+    postings = ConsultantSearchToken.objects.filter(any_term)
+    if len(filters) > 1:
+        # only consultants matching the most selective term can match them all, so
+        # broad terms (a skill, a city) are aggregated for those candidates only
+        candidates = _candidates(filters)
+        if candidates is not None:
+            postings = postings.filter(consultant_id__in=candidates)
+
+    rows = (postings
+            .values('consultant_id')
+            .annotate(score=Sum(Case(When(token__in=terms, then=F('weight') * 2), default=F('weight'),
+                                     output_field=IntegerField())), **matched)
+            .filter(**{name: 1 for name in matched})
+            .order_by('-score', 'consultant_id')
+            .values_list('consultant_id', 'score'))
+    return list(rows[offset:offset + limit])
+
+
+def _candidates(filters):
+    best = None
+    for f in filters:
+        ids = list(ConsultantSearchToken.objects.filter(f).values_list('consultant_id', flat=True)[:CANDIDATE_LIMIT + 1])
+        if len(ids) <= CANDIDATE_LIMIT and (best is None or len(ids) < len(best)):
+            best = ids
+    return best
@@ -1,6 +1,66 @@
+from django.db import transaction
 from rest_framework import serializers
+from adminpanel.models import Marketer
+from vendor_client_tracker.fieldsets import model_field_map
+from . import search
+from .lookups import lookups
 from .models import Skill, Visa, Consultant, ConsultantAddress, ConsultantEducation, Submission
 
+
+class CachedLookupField(serializers.PrimaryKeyRelatedField):
+    """FK to a lookup table (Skill, Visa, Marketer) validated against the lookup cache."""
+
+    def __init__(self, model, **kwargs):
+        self.model = model
+        kwargs.setdefault('queryset', model.objects.all())
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        if isinstance(data, bool):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        try:
+            pk = int(data)
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        row = lookups.get(self.model, pk)
+        if row is None:
+            self.fail('does_not_exist', pk_value=data)
+        instance = self.model(**row)
+        instance._state.adding = False
+        instance._state.db = self.get_queryset().db
+        return instance
+
+
+class LookupNameField(serializers.Field):
+    """Read-only name of a lookup-table FK, resolved from the lookup cache instead of a join."""
+
+    def __init__(self, model, attname, **kwargs):
+        self.model = model
+        self.attname = attname
+        kwargs.update(source='*', read_only=True)
+        super().__init__(**kwargs)
+
+    def to_representation(self, instance):
+        pk = getattr(instance, self.attname)
+        names = self.context.get('lookup_names', {}).get(self.model)
+        if names is not None and pk in names:
+            return names[pk]
+        return lookups.name(self.model, pk)
+
+
+class LookupListSerializer(serializers.ListSerializer):
+    """Resolves every LookupNameField for the whole list with one cache read per model."""
+
+    def to_representation(self, data):
+        data = list(data.all() if hasattr(data, 'all') else data)
+        names = self.context.setdefault('lookup_names', {})
+        for field in self.child.fields.values():
+            if isinstance(field, LookupNameField):
+                ids = {getattr(item, field.attname) for item in data}
+                rows = lookups.get_many(field.model, ids)
+                names[field.model] = {pk: row['name'] for pk, row in rows.items()}
+        return super().to_representation(data)
+
 class SkillSerializer(serializers.ModelSerializer):
     class Meta:
         model = Skill
@@ -19,12 +79,17 @@ class ConsultantAddressSerializer(serializers.ModelSerializer):
 
 
 class ConsultantEducationSerializer(serializers.ModelSerializer):
+    # optional on input: targets an existing row when updating (see ConsultantSerializer.update)
+    id = serializers.IntegerField(required=False, allow_null=True)
+
     class Meta:
         model = ConsultantEducation
-        fields = ['type', 'university_name', 'major', 'year_of_completion']
+        fields = ['id', 'type', 'university_name', 'major', 'year_of_completion']
 
 
 class ConsultantSerializer(serializers.ModelSerializer):
+    skill = CachedLookupField(Skill, required=False, allow_null=True)
+    visa_status = CachedLookupField(Visa, required=False, allow_null=True)
     address = ConsultantAddressSerializer(required=False)
     education = ConsultantEducationSerializer(many=True, required=False)
 
@@ -37,6 +102,31 @@ class ConsultantSerializer(serializers.ModelSerializer):
             'us_entry_date', 'recruiter', 'active', 'street_address', 'pref_location',
             'priority', 'address', 'education'
         ]
+        # uniqueness is checked on the normalized columns in validate()
+        extra_kwargs = {
+            'email': {'validators': []},
+            'ssn': {'validators': []},
+        }
+
+    def validate(self, attrs):
+        # only values that change are checked, so a legacy duplicate (left without
+        # a key by the backfill) can still be edited as long as it keeps its value
+        errors = {}
+        for column in Consultant.UNIQUE_KEY_FIELDS:
+            field, normalize = Consultant.LOOKUP_KEYS[column]
+            value = normalize(attrs.get(field))
+            if value is None:
+                continue
+            if self.instance is not None and normalize(getattr(self.instance, field)) == value:
+                continue
+            taken = Consultant.objects.filter(**{column: value})
+            if self.instance is not None:
+                taken = taken.exclude(pk=self.instance.pk)
+            if taken.exists():
+                errors[field] = [f'consultant with this {field.replace("_", " ")} already exists.']
+        if errors:
+            raise serializers.ValidationError(errors)
+        return attrs
 
     def create(self, validated_data):
         address_data = validated_data.pop('address', None)
@@ -45,34 +135,115 @@ class ConsultantSerializer(serializers.ModelSerializer):
         if address_data:
             ConsultantAddress.objects.create(consultant=consultant, **address_data)
         for edu in education_data:
+            edu.pop('id', None)
             ConsultantEducation.objects.create(consultant=consultant, **edu)
         return consultant
 
     def update(self, instance, validated_data):
+        """Write only what differs: changed consultant columns, address fields and education rows."""
         address_data = validated_data.pop('address', None)
-        education_data = validated_data.pop('education', [])
-        for attr, value in validated_data.items():
-            setattr(instance, attr, value)
-        instance.save()
-        if address_data:
-            ConsultantAddress.objects.update_or_create(consultant=instance, defaults=address_data)
-        if education_data:
-            instance.education.all().delete()
-            for edu in education_data:
-                ConsultantEducation.objects.create(consultant=instance, **edu)
+        education_data = validated_data.pop('education', None)
+
+        with transaction.atomic():
+            changed = []
+            for attr, value in validated_data.items():
+                field = instance._meta.get_field(attr)
+                new = value.pk if field.is_relation and value is not None else value
+                if getattr(instance, field.attname) != new:
+                    setattr(instance, attr, value)
+                    changed.append(attr)
+            if changed:
+                instance.save(update_fields=changed + ['updated_on'])
+
+            if address_data:
+                self._sync_address(instance, address_data)
+            if education_data is not None and self._sync_education(instance, education_data):
+                # bulk writes send no post_save, so refresh the search document here
+                search.schedule_index([instance.pk])
         return instance
 
+    def _sync_address(self, instance, address_data):
+        try:
+            address = instance.address
+        except ConsultantAddress.DoesNotExist:
+            ConsultantAddress.objects.create(consultant=instance, **address_data)
+            return
+        changed = [attr for attr, value in address_data.items() if getattr(address, attr) != value]
+        for attr in changed:
+            setattr(address, attr, address_data[attr])
+        if changed:
+            address.save(update_fields=changed)
+
+    def _sync_education(self, instance, education_data):
+        """
+        Diff the incoming list against the stored rows: items with a known id update that
+        row, items identical to a stored row keep it, remaining items overwrite the remaining
+        rows in order, and the surplus is inserted or deleted. Returns True if anything changed.
+        """
+        fields = [f for f in ConsultantEducationSerializer.Meta.fields if f != 'id']
+
+        def content(edu):
+            return tuple(edu[f] if isinstance(edu, dict) else getattr(edu, f) for f in fields)
+
+        stored = {edu.pk: edu for edu in instance.education.order_by('pk')}
+        kept, pending, updates = set(), [], []
+
+        for item in education_data:
+            pk = item.pop('id', None)
+            if pk in stored and pk not in kept:
+                kept.add(pk)
+                updates.append((stored[pk], item))
+            else:
+                pending.append(item)
+
+        unchanged = {}
+        for pk, edu in stored.items():
+            if pk not in kept:
+                unchanged.setdefault(content(edu), []).append(pk)
+        rest = []
+        for item in pending:
+            same = unchanged.get(content(item))
+            if same:
+                kept.add(same.pop(0))
+            else:
+                rest.append(item)
+
+        leftovers = [edu for pk, edu in stored.items() if pk not in kept]
+        updates.extend(zip(leftovers, rest))
+        to_create = [ConsultantEducation(consultant=instance, **item) for item in rest[len(leftovers):]]
+        to_delete = [edu.pk for edu in leftovers[len(rest):]]
+
+        to_update, update_fields = [], set()
+        for edu, item in updates:
+            diff = [f for f in fields if getattr(edu, f) != item[f]]
+            for f in diff:
+                setattr(edu, f, item[f])
+            if diff:
+                to_update.append(edu)
+                update_fields.update(diff)
+
+        if to_delete:
+            ConsultantEducation.objects.filter(pk__in=to_delete).delete()
+        if to_update:
+            ConsultantEducation.objects.bulk_update(to_update, sorted(update_fields))
+        if to_create:
+            ConsultantEducation.objects.bulk_create(to_create)
+        return bool(to_delete or to_update or to_create)
+
 class SubmissionSerializer(serializers.ModelSerializer):
     consultant_name = serializers.CharField(source='consultant.first_name', read_only=True)
     vendor_name = serializers.CharField(source='vendor.name', read_only=True)
     prime_vendor_name = serializers.CharField(source='prime_vendor.name', read_only=True)
     implementation_partner_name = serializers.CharField(source='implementation_partner.name', read_only=True)
     end_client_name = serializers.CharField(source='end_client.name', read_only=True)
-    marketer_name = serializers.CharField(source='marketer.username', read_only=True)
-    skill_name = serializers.CharField(source='skill.name', read_only=True)
+    marketer = CachedLookupField(Marketer, required=False, allow_null=True)
+    marketer_name = LookupNameField(Marketer, 'marketer_id')
+    skill = CachedLookupField(Skill, required=False, allow_null=True)
+    skill_name = LookupNameField(Skill, 'skill_id')
 
     class Meta:
         model = Submission
+        list_serializer_class = LookupListSerializer
         fields = [
             'id',
             'consultant',
@@ -94,4 +265,19 @@ class SubmissionSerializer(serializers.ModelSerializer):
             'vendor_response',
             'resume_passed_to_client',
             'is_duplicate',
-        ]
\ No newline at end of file
+        ]
+
+
+# Output field -> ORM lookup for the .values() list path (?fields= / ?exclude=)
+CONSULTANT_VALUES = model_field_map(Consultant, ConsultantSerializer.Meta.fields)
+
+SUBMISSION_VALUES = {
+    **model_field_map(Submission, SubmissionSerializer.Meta.fields),
+    'consultant_name': 'consultant__first_name',
+    'vendor_name': 'vendor__name',
+    'prime_vendor_name': 'prime_vendor__name',
+    'implementation_partner_name': 'implementation_partner__name',
+    'end_client_name': 'end_client__name',
+    'marketer_name': 'marketer__name',
+    'skill_name': 'skill__name',
+}
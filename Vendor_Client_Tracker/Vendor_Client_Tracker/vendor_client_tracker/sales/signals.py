@@ -0,0 +1,242 @@
+from django.db.models import Q
+from django.db.models.signals import pre_save, post_save, pre_delete, post_delete
+from django.dispatch import receiver
+
+from adminpanel.models import Marketer
+from clients.graph import CHAIN_FIELDS, SUBMISSION, chain_edges, graph
+from clients.models import Client
+from vendors.models import Vendor
+from vendor_client_tracker.catalog import bump_catalog
+from .lookups import lookups
+from .models import Skill, Visa, Consultant, ConsultantAddress, ConsultantEducation, Submission
+from . import analytics, counters, facets, funnel, hotlist, matching, rollups, search, submission_batch
+
+
+# ---------- Catalog versions ----------
+@receiver(post_save, sender=Skill)
+@receiver(post_delete, sender=Skill)
+def bump_skill_catalog(sender, **kwargs):
+    bump_catalog('skills')
+
+
+@receiver(post_save, sender=Visa)
+@receiver(post_delete, sender=Visa)
+def bump_visa_catalog(sender, **kwargs):
+    bump_catalog('visas')
+
+
+# ---------- Lookup cache ----------
+@receiver(post_save, sender=Skill)
+@receiver(post_delete, sender=Skill)
+@receiver(post_save, sender=Visa)
+@receiver(post_delete, sender=Visa)
+def invalidate_lookup(sender, instance, **kwargs):
+    lookups.invalidate(sender, instance.pk)
+
+
+# ---------- Consultant search index ----------
+@receiver(post_save, sender=Consultant)
+def index_consultant(sender, instance, **kwargs):
+    search.schedule_index([instance.pk])
+
+
+@receiver(post_save, sender=ConsultantEducation)
+@receiver(post_delete, sender=ConsultantEducation)
+def index_consultant_education(sender, instance, **kwargs):
+    search.schedule_index([instance.consultant_id])
+
+
+@receiver(post_save, sender=Skill)
+@receiver(pre_delete, sender=Skill)
+def reindex_skill_consultants(sender, instance, created=False, **kwargs):
+    if not created:
+        search.schedule_index(Consultant.objects.filter(skill=instance).values_list('id', flat=True))
+
+
+@receiver(post_save, sender=Visa)
+@receiver(pre_delete, sender=Visa)
+def reindex_visa_consultants(sender, instance, created=False, **kwargs):
+    if not created:
+        search.schedule_index(Consultant.objects.filter(visa_status=instance).values_list('id', flat=True))
+
+
+# ---------- Bench facets ----------
+@receiver(post_save, sender=Consultant)
+def update_consultant_facets(sender, instance, **kwargs):
+    facets.index.update([instance])
+
+
+@receiver(post_delete, sender=Consultant)
+def remove_consultant_facets(sender, instance, **kwargs):
+    facets.index.remove([instance.pk])
+
+
+# ---------- Bulk hotlist / priority updates ----------
+@receiver(hotlist.consultants_bulk_updated)
+def refresh_bulk_updated_consultants(sender, ids, **kwargs):
+    facets.index.update(Consultant.objects.filter(id__in=ids))
+    matching.snapshot.mark_dirty(ids)
+
+
+# ---------- Matching snapshot ----------
+@receiver(post_save, sender=Consultant)
+@receiver(post_delete, sender=Consultant)
+def refresh_matching_consultant(sender, instance, **kwargs):
+    matching.snapshot.mark_dirty([instance.pk])
+
+
+@receiver(post_save, sender=ConsultantAddress)
+@receiver(post_delete, sender=ConsultantAddress)
+def refresh_matching_address(sender, instance, **kwargs):
+    matching.snapshot.mark_dirty([instance.consultant_id])
+
+
+@receiver(post_save, sender=Submission)
+@receiver(post_delete, sender=Submission)
+def forget_submitted_consultants(sender, instance, **kwargs):
+    matching.forget_submitted(instance.end_client_id)
+
+
+# ---------- Stored submission state ----------
+STORED_SUBMISSION_FIELDS = tuple(dict.fromkeys((
+    'submission_date', 'vendor_response', 'resume_passed_to_client', *rollups.KEY_FIELDS, *counters.STATE_FIELDS,
+    *CHAIN_FIELDS,
+)))
+
+
+@receiver(pre_save, sender=Submission)
+def remember_stored_submission(sender, instance, **kwargs):
+    # one read of the row as stored serves the rollup, funnel and counter updates below
+    instance._stored = (Submission.objects.filter(pk=instance.pk).values(*STORED_SUBMISSION_FIELDS).first()
+                        if instance.pk else None)
+
+
+# ---------- Submission rollup ----------
+@receiver(post_save, sender=Submission)
+def update_rollup_on_save(sender, instance, created, **kwargs):
+    stored = getattr(instance, '_stored', None)
+    old_key = rollups.rollup_key(**stored) if stored else None
+    new_key = rollups.submission_rollup_key(instance)
+    if old_key == new_key:
+        return
+    if old_key:
+        rollups.apply_delta(old_key, -1)
+    rollups.apply_delta(new_key, 1)
+
+
+@receiver(post_delete, sender=Submission)
+def update_rollup_on_delete(sender, instance, **kwargs):
+    rollups.apply_delta(rollups.submission_rollup_key(instance), -1)
+
+
+# ---------- Status events / funnel ----------
+@receiver(post_save, sender=Submission)
+def record_status_event(sender, instance, **kwargs):
+    stored = getattr(instance, '_stored', None)
+    previous = (stored['vendor_response'], stored['resume_passed_to_client']) if stored else None
+    # views set _changed_by to attribute the change to the requesting user
+    funnel.record_change(instance, previous, getattr(instance, '_changed_by', None))
+
+
+# ---------- Submission counters ----------
+@receiver(post_save, sender=Submission)
+def update_counters_on_save(sender, instance, **kwargs):
+    stored = getattr(instance, '_stored', None)
+    old = {field: stored[field] for field in counters.STATE_FIELDS} if stored else None
+    counters.apply_change(old, counters.submission_state(instance))
+
+
+@receiver(post_delete, sender=Submission)
+def update_counters_on_delete(sender, instance, **kwargs):
+    counters.apply_change(counters.submission_state(instance), None)
+
+
+# ---------- Client-vendor graph ----------
+def _chain(values):
+    return [(edge, SUBMISSION) for edge in chain_edges(**values)]
+
+
+def _submission_chain(submission):
+    return _chain({field: getattr(submission, field) for field in CHAIN_FIELDS})
+
+
+@receiver(post_save, sender=Submission)
+def update_graph_on_save(sender, instance, **kwargs):
+    stored = getattr(instance, '_stored', None)
+    graph.apply_on_commit(
+        removed=_chain(stored) if stored else [],
+        added=_submission_chain(instance),
+    )
+
+
+@receiver(post_delete, sender=Submission)
+def update_graph_on_delete(sender, instance, **kwargs):
+    graph.apply_on_commit(removed=_submission_chain(instance))
+
+
+# ---------- Chain keys of orphaned submissions ----------
+@receiver(pre_delete, sender=Vendor)
+@receiver(pre_delete, sender=Client)
+def rekey_orphaned_submissions(sender, instance, **kwargs):
+    # the delete SET_NULLs these FKs with a plain UPDATE; re-derive chain_key for the
+    # nulled chain first, and flag rows whose nulled chain already exists as duplicates
+    fields = ('end_client',) if sender is Client else ('vendor', 'prime_vendor', 'implementation_partner')
+    columns = [f'{field}_id' for field in Submission.CHAIN_KEY_FIELDS]
+    condition = Q()
+    for field in fields:
+        condition |= Q(**{field: instance.pk})
+    rows = Submission.objects.filter(condition, is_duplicate=False).values_list('id', *columns)
+
+    keys = {}
+    for pk, *values in rows:
+        values = [None if field in fields and value == instance.pk else value
+                  for field, value in zip(Submission.CHAIN_KEY_FIELDS, values)]
+        keys[pk] = Submission.compute_chain_key(*values)
+    if not keys:
+        return
+
+    taken = set(Submission.objects.filter(chain_key__in=set(keys.values())).exclude(id__in=keys)
+                .values_list('chain_key', flat=True))
+    rekeyed, duplicates = [], []
+    for pk, key in sorted(keys.items()):
+        if key in taken:
+            duplicates.append(pk)
+        else:
+            taken.add(key)
+            rekeyed.append(Submission(id=pk, chain_key=key))
+    Submission.objects.filter(id__in=duplicates).update(is_duplicate=True, chain_key=None)
+    Submission.objects.bulk_update(rekeyed, ['chain_key'], batch_size=500)
+
+
+# ---------- Rollup rows of deleted dimensions ----------
+ROLLUP_DIMENSION_FIELDS = {Vendor: 'vendor_id', Client: 'end_client_id', Marketer: 'marketer_id', Skill: 'skill_id'}
+
+
+@receiver(pre_delete, sender=Vendor)
+@receiver(pre_delete, sender=Client)
+@receiver(pre_delete, sender=Marketer)
+@receiver(pre_delete, sender=Skill)
+def move_orphaned_rollups(sender, instance, **kwargs):
+    # the SET_NULL UPDATE sends no Submission signals; move the counts to the "none" key with it
+    rollups.move_to_none(ROLLUP_DIMENSION_FIELDS[sender], instance.pk)
+    analytics.bump_version()
+
+
+# ---------- Bulk submissions ----------
+@receiver(submission_batch.submissions_bulk_created)
+def apply_bulk_created_submissions(sender, submissions, user=None, **kwargs):
+    # runs inside the bulk insert's transaction, like the post_save handlers above
+    rollups.apply_created(submissions)
+    funnel.record_created(submissions, user)
+    counters.apply_created(counters.submission_state(s) for s in submissions)
+    graph.apply_on_commit(added=[edge for s in submissions for edge in _submission_chain(s)])
+    for client_id in {s.end_client_id for s in submissions}:
+        matching.forget_submitted(client_id)
+    analytics.bump_version()
+
+
+# ---------- Analytics cache ----------
+@receiver(post_save, sender=Submission)
+@receiver(post_delete, sender=Submission)
+def invalidate_analytics(sender, **kwargs):
+    analytics.bump_version()
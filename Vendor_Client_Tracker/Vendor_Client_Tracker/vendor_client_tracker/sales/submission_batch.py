@@ -0,0 +1,147 @@
+"""
+Bulk submission of one consultant to many vendor chains (BulkAddSubmission).
+
+With UseClientLinks the client's vendor links are read once (they supply the
+prime vendor and implementation partner of chains that do not name one, as in
+AddSubmission). The vendors of every chain are checked with one IN query,
+duplicates with one chain_key IN query, and the accepted submissions are
+written with a single bulk_create. bulk_create sends no post_save, so submissions_bulk_created is
+sent inside the same transaction for the rollup, funnel and counters (see
+sales.signals).
+"""
+
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.dispatch import Signal
+
+from clients.models import ClientVendorLink
+from vendors.models import Vendor
+from .models import Submission
+
+MAX_CHAINS = 100
+
+# ClientVendorLink role (matched case-insensitively) -> Submission field it supplies when a chain leaves it out
+LINK_ROLES = {'prime vendor': 'prime_vendor', 'implementation partner': 'implementation_partner'}
+
+# sent with submissions=[...] (saved, with pks) and user inside the bulk insert's transaction
+submissions_bulk_created = Signal()
+
+
+def client_link_defaults(client_id):
+    """{'prime_vendor': id, 'implementation_partner': id} from the client's vendor links (oldest link per role)."""
+    defaults, roles = {}, Q()
+    for role in LINK_ROLES:
+        roles |= Q(role__iexact=role)
+    links = ClientVendorLink.objects.filter(roles, client_id=client_id).order_by('id').values_list('role', 'vendor_id')
+    for role, vendor_id in links:
+        defaults.setdefault(LINK_ROLES[role.lower()], vendor_id)
+    return defaults
+
+
+def _optional_id(chain, key):
+    value = chain.get(key)
+    if value in (None, ''):
+        return None
+    if isinstance(value, bool):
+        raise ValueError(f'{key} must be an integer')
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f'{key} must be an integer')
+
+
+def _chain_ids(chain, defaults):
+    if not isinstance(chain, dict):
+        raise ValueError('Chain must be an object')
+    vendor = _optional_id(chain, 'VendorId')
+    if vendor is None:
+        raise ValueError('VendorId is required')
+    return {
+        'vendor': vendor,
+        'prime_vendor': _optional_id(chain, 'PrimeVendorId') or defaults.get('prime_vendor'),
+        'implementation_partner': (_optional_id(chain, 'ImplementationPartnerId')
+                                   or defaults.get('implementation_partner')),
+    }
+
+
+def submit_chains(base, chains, user=None, use_client_links=False):
+    """
+    Submit the consultant in `base` (validated SubmissionSerializer data shared by
+    every chain: consultant, end_client, skill, marketer, comments) to each of
+    `chains` ([{'VendorId', 'PrimeVendorId', 'ImplementationPartnerId', 'Comments'}]).
+    With use_client_links, the client's links fill in a missing prime vendor or
+    implementation partner. Returns one result per chain:
+        {'index', 'vendor', 'status': 'accepted' | 'blocked' | 'invalid', ...}
+    """
+    defaults = client_link_defaults(base['end_client'].pk) if use_client_links else {}
+    results, parsed = [], []
+    for index, chain in enumerate(chains):
+        result = {'index': index, 'vendor': chain.get('VendorId') if isinstance(chain, dict) else None}
+        results.append(result)
+        try:
+            parsed.append((result, _chain_ids(chain, defaults), chain.get('Comments')))
+        except ValueError as exc:
+            result.update(status='invalid', error=str(exc))
+
+    # ---------- One query for every vendor of every chain ----------
+    vendor_ids = {pk for _, ids, _ in parsed for pk in ids.values() if pk}
+    known = set(Vendor.objects.filter(id__in=vendor_ids).values_list('id', flat=True))
+
+    candidates = []
+    for result, ids, comments in parsed:
+        unknown = [pk for pk in ids.values() if pk and pk not in known]
+        if unknown:
+            result.update(status='invalid', error=f'Vendor {unknown[0]} does not exist')
+            continue
+        submission = Submission(**base, **{f'{field}_id': pk for field, pk in ids.items()})
+        if comments is not None:
+            submission.comments = comments
+        submission.chain_key = Submission.compute_chain_key(
+            submission.consultant_id, submission.vendor_id, submission.prime_vendor_id,
+            submission.implementation_partner_id, submission.end_client_id,
+        )
+        candidates.append((result, submission))
+
+    # ---------- Duplicate check and insert ----------
+    for attempt in range(2):
+        accepted = _accept(candidates)
+        try:
+            with transaction.atomic():
+                _insert([submission for _, submission in accepted], user)
+            break
+        except IntegrityError:
+            # a chain was submitted concurrently; the unique chain_key index caught it
+            if attempt:
+                raise
+    for result, submission in accepted:
+        result.update(status='accepted', id=submission.pk)
+    return results
+
+
+def _accept(candidates):
+    """Mark already submitted (or repeated) chains as blocked; returns the rest."""
+    existing = set(Submission.objects.filter(chain_key__in=[s.chain_key for _, s in candidates])
+                   .values_list('chain_key', flat=True))
+    accepted, seen = [], set()
+    for result, submission in candidates:
+        if submission.chain_key in existing or submission.chain_key in seen:
+            result.update(status='blocked', reason='duplicate')
+            continue
+        seen.add(submission.chain_key)
+        result.pop('status', None)
+        result.pop('reason', None)
+        accepted.append((result, submission))
+    return accepted
+
+
+def _insert(submissions, user):
+    if not submissions:
+        return
+    Submission.objects.bulk_create(submissions)
+    # MySQL does not return primary keys from bulk_create; chain_key is unique
+    if any(s.pk is None for s in submissions):
+        ids = dict(Submission.objects.filter(chain_key__in=[s.chain_key for s in submissions])
+                   .values_list('chain_key', 'id'))
+        for submission in submissions:
+            submission.pk = ids[submission.chain_key]
+    submissions_bulk_created.send(sender=Submission, submissions=submissions, user=user)
@@ -9,9 +9,17 @@ urlpatterns = [
     path('AddConsultant/', views.add_consultant, name='add_consultant'),
     path('GetAllConsultants/', views.get_all_consultants, name='get_all_consultants'),
     path('GetConsultantByID/', views.get_consultant_by_id, name='get_consultant_by_id'),
+    path('GetConsultantsByIds/', views.get_consultants_by_ids, name='get_consultants_by_ids'),
+    path('GetConsultantByContact/', views.get_consultant_by_contact, name='get_consultant_by_contact'),
+    path('SearchConsultants/', views.search_consultants, name='search_consultants'),
+    path('FilterConsultants/', views.filter_consultants, name='filter_consultants'),
+    path('MatchConsultants/', views.match_consultants, name='match_consultants'),
     path('UpdateConsultant/', views.update_consultant, name='update_consultant'),
     path('UpdateConsultantStatus/', views.update_consultant_status, name='update_consultant_status'),
+    path('BulkUpdateHotlist/', views.bulk_update_hotlist, name='bulk_update_hotlist'),
+    path('RerankHotlist/', views.rerank_hotlist, name='rerank_hotlist'),
     path('AddSubmission/', views.add_submission, name='add_submission'),
+    path('BulkAddSubmission/', views.bulk_add_submission, name='bulk_add_submission'),
     path('UpdateSubmission/', views.update_submission, name='update_submission'),
     path('GetAllSubmissions/', views.get_all_submissions, name='get_all_submissions'),
     path('GetSubmissionByID/', views.get_submission_by_id, name='get_submission_by_id'),
@@ -19,8 +27,13 @@ urlpatterns = [
     path('GetSubmissionByClient/', views.get_submissions_by_client, name='get_submissions_by_client'),
     path('GetSubmissionByMarketer/', views.get_submissions_by_marketer, name='get_submissions_by_marketer'),
     path('GetSubmissionByConsultant/', views.get_submissions_by_consultant, name='get_submissions_by_consultant'),
+    path('QuerySubmissions/', views.query_submissions, name='query_submissions'),
     path('UpdateVendorResponse/', views.update_vendor_response, name='update_vendor_response'),
     path('GetSubmissionReport/', views.submission_report, name='get_submission_report'),
+    path('GetSubmissionAnalytics/', views.submission_analytics, name='get_submission_analytics'),
+    path('GetSubmissionFunnel/', views.submission_funnel, name='get_submission_funnel'),
+    path('GetSubmissionCounters/', views.submission_counters, name='get_submission_counters'),
+    path('GetSubmissionHistory/', views.submission_history, name='get_submission_history'),
 
     
     
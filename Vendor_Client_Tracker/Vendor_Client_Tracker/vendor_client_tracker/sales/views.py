@@ -3,12 +3,24 @@ from django.shortcuts import render
 # Create your views here.
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
-from rest_framework import status
-from clients.models import ClientVendorLink
-from django.utils.timezone import now, timedelta
-from django.db.models import Count
-from .models import Skill, Visa, Consultant, Submission
-from .serializers import SkillSerializer, VisaSerializer, ConsultantSerializer, SubmissionSerializer
+from rest_framework import serializers, status
+from datetime import datetime
+from django.utils.timezone import now, timedelta, make_aware
+from django.db import IntegrityError, transaction
+from django.db.models import Sum
+from vendor_client_tracker.pagination import (
+    MAX_PAGE_SIZE, InvalidCursor, decode_cursor, encode_cursor, keyset_queryset, paginate_keyset, parse_limit,
+    stream_json_list
+)
+from .lookups import lookups
+from .models import Skill, Visa, Consultant, Submission, SubmissionDailyRollup
+from vendor_client_tracker.catalog import catalog_response
+from vendor_client_tracker.fieldsets import FieldsetError, prune, render_rows, requested_fields, sparse_values
+from .serializers import (
+    SkillSerializer, VisaSerializer, ConsultantSerializer, SubmissionSerializer, CONSULTANT_VALUES, SUBMISSION_VALUES
+)
+from .consultant_import import import_consultants
+from . import analytics, counters, facets, funnel, hotlist, matching, normalization, search, submission_batch
 
 
 # ---------- SKILL ----------
@@ -23,9 +35,10 @@ def add_skill(request):
 
 @api_view(['GET'])
 def get_skills(request):
-    skills = Skill.objects.all().order_by('name')
-    serializer = SkillSerializer(skills, many=True)
-    return Response({'skills': serializer.data}, status=status.HTTP_200_OK)
+    def build():
+        skills = Skill.objects.all().order_by('name')
+        return {'skills': SkillSerializer(skills, many=True).data}
+    return catalog_response(request, 'skills', build)
 
 
 # ---------- VISA ----------
@@ -40,9 +53,10 @@ def add_visa(request):
 
 @api_view(['GET'])
 def get_visas(request):
-    visas = Visa.objects.all().order_by('name')
-    serializer = VisaSerializer(visas, many=True)
-    return Response({'visas': serializer.data}, status=status.HTTP_200_OK)
+    def build():
+        visas = Visa.objects.all().order_by('name')
+        return {'visas': VisaSerializer(visas, many=True).data}
+    return catalog_response(request, 'visas', build)
 
 @api_view(['POST'])
 def add_consultant(request):
@@ -50,101 +64,253 @@ def add_consultant(request):
     if not data_list:
         return Response({'error': 'No consultant data provided'}, status=status.HTTP_400_BAD_REQUEST)
 
-    created, duplicates = [], []
-
-    for data in data_list:
-        # ---------- Main field mapping ----------
-        data['email'] = data.pop('Email', None)
-        data['first_name'] = data.pop('FirstName', None)
-        data['middle_name'] = data.pop('MiddleName', None)
-        data['last_name'] = data.pop('LastName', None)
-        data['dob'] = data.pop('DOB', None)
-        data['ssn'] = data.pop('SSN', None)
-        data['phone_number'] = data.pop('PhoneNumber', None)
-        data['other_phone_number'] = data.pop('OtherPhoneNumber', None)
-        data['skype_id'] = data.pop('SkypeId', None)
-        data['skill'] = data.pop('SkillId', None)
-        data['expected_rate'] = data.pop('ExpectedRate', None)
-        data['visa_status'] = data.pop('VisaStatus', None)
-        data['passport_number'] = data.pop('PassportNumber', None)
-        data['exp'] = data.pop('Exp', None)
-        data['gk'] = data.pop('GK', None)
-        data['gk_move_in_date'] = data.pop('GKMoveInDate', None)
-        data['us_entry_date'] = data.pop('USEntryDate', None)
-        data['recruiter'] = data.pop('Recruiter', None)
-        data['active'] = data.pop('Active', None)
-        data['street_address'] = data.pop('StreetAddress', None)
-        data['pref_location'] = data.pop('PrefLocation', None)
-        data['priority'] = data.pop('priority', 0)  # default if not provided
-
-        # ---------- Nested mapping ----------
-        if 'AddrInfo' in data:
-            addr = data.pop('AddrInfo', {})
-            data['address'] = {
-                'street': addr.get('Street'),
-                'city': addr.get('City'),
-                'state': addr.get('State'),
-                'zipcode': addr.get('Zipcode'),
-            }
-
-        if 'ListOfEdu' in data:
-            edu_list = data.pop('ListOfEdu', [])
-            data['education'] = []
-            for edu in edu_list:
-                data['education'].append({
-                    'type': edu.get('Type'),
-                    'university_name': edu.get('UniversityName'),
-                    'major': edu.get('Major'),
-                    'year_of_completion': edu.get('YearOfCompletion'),
-                })
-
-        # ---------- Duplicate email check ----------
-        email = data.get('email')
-        if email and Consultant.objects.filter(email__iexact=email).exists():
-            duplicates.append(email)
-            continue
-
-        # ---------- Create consultant ----------
-        serializer = ConsultantSerializer(data=data)
-        if serializer.is_valid():
-            serializer.save()
-            created.append(serializer.data)
-        else:
-            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    # AllowSimilar: true creates records that only fuzzy-match an existing consultant
+    results = import_consultants(data_list, allow_similar=request.data.get('AllowSimilar') is True)
+    # 'data'/'created' keep carrying the serialized consultants, in input order; 'results' is per record
+    created_ids = [r['id'] for r in results if r['status'] == 'created']
+    profiles = consultant_profile_queryset().in_bulk(created_ids)
+    created = ConsultantSerializer([profiles[pk] for pk in created_ids], many=True).data
+    duplicates = [r['email'] for r in results if r['status'] == 'duplicate']
+    invalid = [r for r in results if r['status'] == 'invalid']
 
     # ---------- Final response ----------
-    if duplicates and not created:
+    if not created and invalid:
         return Response(
-            {'message': 'Duplicate email(s) found. No new consultants created.', 'duplicates': duplicates},
+            {'message': 'Invalid consultant data. No new consultants created.', 'results': results},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    elif not created:
+        return Response(
+            {'message': 'Duplicate email(s) found. No new consultants created.',
+             'duplicates': duplicates, 'results': results},
             status=status.HTTP_409_CONFLICT
         )
-    elif duplicates:
+    elif duplicates or invalid:
         return Response(
-            {'message': 'Some consultants added. Some duplicates skipped.',
-             'created': created, 'duplicates': duplicates},
+            {'message': 'Some consultants added. Some duplicates or invalid records skipped.',
+             'created': created, 'duplicates': duplicates, 'results': results},
             status=status.HTTP_207_MULTI_STATUS
         )
     else:
-        return Response({'message': 'Consultants added successfully', 'data': created}, status=status.HTTP_201_CREATED)
+        return Response({'message': 'Consultants added successfully', 'data': created, 'results': results},
+                        status=status.HTTP_201_CREATED)
+
+CONSULTANT_ORDERING = ('-id',)
+
+
+def consultant_profile_queryset():
+    # address joined, education prefetched: a page of full profiles costs two queries
+    return Consultant.objects.select_related('address').prefetch_related('education')
+
 
 @api_view(['GET'])
 def get_all_consultants(request):
-    consultants = Consultant.objects.all().order_by('-id')
-    serializer = ConsultantSerializer(consultants, many=True)
-    return Response({'consultants': serializer.data}, status=status.HTTP_200_OK)
+    """
+    Newest first. ?limit= and/or ?cursor= switch to keyset pages with a `next_cursor`;
+    ?fields= / ?exclude= limit the columns returned.
+    """
+    try:
+        fields = requested_fields(request, ConsultantSerializer.Meta.fields)
+    except FieldsetError as exc:
+        return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+    if fields and set(fields) <= set(CONSULTANT_VALUES):
+        consultants = sparse_values(Consultant.objects.all(), CONSULTANT_VALUES, fields, extra=('id',))
+        serialize = lambda rows: render_rows(rows, CONSULTANT_VALUES, fields)
+    else:
+        consultants = consultant_profile_queryset()
+        serialize = lambda rows: prune(ConsultantSerializer(rows, many=True).data, fields) if fields \
+            else ConsultantSerializer(rows, many=True).data
+
+    cursor = request.query_params.get('cursor')
+    if not cursor and not request.query_params.get('limit'):
+        return Response({'consultants': serialize(consultants.order_by(*CONSULTANT_ORDERING))}, status=status.HTTP_200_OK)
+
+    try:
+        limit = parse_limit(request.query_params.get('limit'))
+        page, next_cursor = paginate_keyset(consultants, CONSULTANT_ORDERING, cursor, limit)
+    except InvalidCursor:
+        return Response({'error': 'Invalid cursor'}, status=status.HTTP_400_BAD_REQUEST)
+    return Response({'consultants': serialize(page), 'next_cursor': next_cursor}, status=status.HTTP_200_OK)
 
 
 @api_view(['POST'])
 def get_consultant_by_id(request):
     consl_id = request.data.get('Id')
     try:
-        consultant = Consultant.objects.get(id=consl_id)
+        consultant = consultant_profile_queryset().get(id=consl_id)
     except Consultant.DoesNotExist:
         return Response({'error': 'Consultant not found'}, status=status.HTTP_404_NOT_FOUND)
     serializer = ConsultantSerializer(consultant)
     return Response({'consultant': serializer.data}, status=status.HTTP_200_OK)
 
 
+@api_view(['POST'])
+def get_consultants_by_ids(request):
+    """
+    Body: {"Ids": [3, 7, 9]} -> full profiles in the requested order, plus any ids not found.
+    Replaces calling GetConsultantByID in a loop.
+    """
+    ids = request.data.get('Ids')
+    if not isinstance(ids, list) or not ids:
+        return Response({'error': 'Ids must be a non-empty list'}, status=status.HTTP_400_BAD_REQUEST)
+    if len(ids) > MAX_PAGE_SIZE:
+        return Response({'error': f'At most {MAX_PAGE_SIZE} ids per request'}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        ids = list(dict.fromkeys(int(i) for i in ids))
+    except (TypeError, ValueError):
+        return Response({'error': 'Ids must be integers'}, status=status.HTTP_400_BAD_REQUEST)
+
+    found = {c.id: c for c in consultant_profile_queryset().filter(id__in=ids)}
+    consultants = [found[i] for i in ids if i in found]
+    return Response({
+        'consultants': ConsultantSerializer(consultants, many=True).data,
+        'missing': [i for i in ids if i not in found],
+    }, status=status.HTTP_200_OK)
+
+
+# request key -> (normalized column, normalizer)
+CONTACT_LOOKUPS = {
+    'Email': ('email_normalized', normalization.normalize_email),
+    'PhoneNumber': ('phone_e164', normalization.normalize_phone),
+    'SSN': ('ssn_digits', normalization.ssn_digits),
+}
+
+
+@api_view(['POST'])
+def get_consultant_by_contact(request):
+    """
+    Body: one of {"Email"}, {"PhoneNumber"} or {"SSN"} in any format
+    ("(555) 123-4567", "+1 555.123.4567", "123-45-6789") -> that consultant's profile.
+    A phone number may be shared; several matches give 409 with their ids.
+    """
+    for key, (column, normalize) in CONTACT_LOOKUPS.items():
+        if request.data.get(key):
+            value = normalize(str(request.data[key]))
+            break
+    else:
+        return Response({'error': 'Email, PhoneNumber or SSN is required'}, status=status.HTTP_400_BAD_REQUEST)
+    if value is None:
+        return Response({'error': f'Invalid {key}'}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        consultant = consultant_profile_queryset().get(**{column: value})
+    except Consultant.DoesNotExist:
+        return Response({'error': 'Consultant not found'}, status=status.HTTP_404_NOT_FOUND)
+    except Consultant.MultipleObjectsReturned:
+        ids = list(Consultant.objects.filter(**{column: value}).order_by('id').values_list('id', flat=True))
+        return Response({'error': f'Several consultants have this {key}', 'ids': ids}, status=status.HTTP_409_CONFLICT)
+    return Response({'consultant': ConsultantSerializer(consultant).data}, status=status.HTTP_200_OK)
+
+
+# ---------- Search Consultants ----------
+SEARCH_PAGE_SIZE = 20
+SEARCH_MAX_PAGE_SIZE = 100
+
+
+@api_view(['POST'])
+def search_consultants(request):
+    """
+    Body: {"Query": "jane python", "Limit": 20, "Offset": 0}. Every term must match
+    a name, email, phone, skill, visa, preferred location or education field
+    (terms are prefixes); results are ranked best first.
+    """
+    query = (request.data.get('Query') or '').strip()
+    if not query:
+        return Response({'error': 'Query is required'}, status=status.HTTP_400_BAD_REQUEST)
+    limit = parse_limit(request.data.get('Limit'), SEARCH_PAGE_SIZE, SEARCH_MAX_PAGE_SIZE)
+    try:
+        offset = max(0, int(request.data.get('Offset') or 0))
+    except (TypeError, ValueError):
+        return Response({'error': 'Offset must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+
+    hits = search.search_consultants(query, limit + 1, offset)
+    has_more = len(hits) > limit
+    hits = hits[:limit]
+
+    found = {c.id: c for c in consultant_profile_queryset().filter(id__in=[pk for pk, _ in hits])}
+    results = []
+    for pk, score in hits:
+        if pk in found:
+            results.append({**ConsultantSerializer(found[pk]).data, 'score': score})
+    return Response({'query': query, 'results': results, 'has_more': has_more}, status=status.HTTP_200_OK)
+
+
+# ---------- Bench Facets ----------
+FACET_LABELS = {'skill': Skill, 'visa_status': Visa}
+
+
+@api_view(['POST'])
+def filter_consultants(request):
+    """
+    Body: {"Filter": {"active": true, "skill": [1, 2], "or": [{"gk": true}, {"priority": [3, 4]}]},
+           "Limit": 100, "Cursor": "..."}
+    Facets are ANDed, the values listed for one facet ORed; "and"/"or" nest. Returns the
+    total, per-facet value counts for the matching set and a page of profiles (newest first).
+    """
+    limit = parse_limit(request.data.get('Limit'))
+    before = None
+    if request.data.get('Cursor'):
+        try:
+            before = int(decode_cursor(request.data['Cursor'], 1)[0])
+        except (InvalidCursor, TypeError, ValueError):
+            return Response({'error': 'Invalid cursor'}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        total, counts, ids = facets.index.query(request.data.get('Filter'), limit, before)
+    except facets.FacetError as exc:
+        return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+    facet_counts = {}
+    for facet, pairs in counts.items():
+        model = FACET_LABELS.get(facet)
+        facet_counts[facet] = [
+            {'value': value, 'count': count, **({'label': lookups.name(model, value)} if model else {})}
+            for value, count in pairs
+        ]
+    found = {c.id: c for c in consultant_profile_queryset().filter(id__in=ids)}
+    consultants = [found[pk] for pk in ids if pk in found]
+    return Response({
+        'total': total,
+        'facets': facet_counts,
+        'consultants': ConsultantSerializer(consultants, many=True).data,
+        'next_cursor': encode_cursor([ids[-1]]) if len(ids) == limit else None,
+    }, status=status.HTTP_200_OK)
+
+
+# ---------- Match Consultants ----------
+@api_view(['POST'])
+def match_consultants(request):
+    """
+    Body: {"SkillId": 3, "MaxRate": 65, "AcceptedVisas": [1, 2], "Location": "Dallas, TX",
+           "ClientId": 7, "Limit": 20}  (all optional)
+    Returns the best-scoring active consultants not yet submitted to ClientId.
+    """
+    data = request.data
+    try:
+        skill_id = int(data['SkillId']) if data.get('SkillId') else None
+        max_rate = float(data['MaxRate']) if data.get('MaxRate') else None
+        client_id = int(data['ClientId']) if data.get('ClientId') else None
+        visa_ids = [int(v) for v in data.get('AcceptedVisas') or []]
+    except (TypeError, ValueError):
+        return Response({'error': 'SkillId, ClientId and AcceptedVisas must be ids; MaxRate a number'},
+                        status=status.HTTP_400_BAD_REQUEST)
+    limit = parse_limit(data.get('Limit'), matching.DEFAULT_LIMIT, matching.MAX_LIMIT)
+
+    try:
+        matches, eligible = matching.match_consultants(
+            skill_id=skill_id, max_rate=max_rate, visa_ids=visa_ids, location=data.get('Location'),
+            end_client_id=client_id, limit=limit,
+        )
+    except matching.MatchingUnavailable as exc:
+        return Response({'error': str(exc)}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+
+    found = {c.id: c for c in consultant_profile_queryset().filter(id__in=[m['id'] for m in matches], active=True)}
+    results = [
+        {**ConsultantSerializer(found[m['id']]).data, 'score': m['score'], 'breakdown': m['breakdown']}
+        for m in matches if m['id'] in found
+    ]
+    return Response({'eligible': eligible, 'results': results}, status=status.HTTP_200_OK)
+
+
 @api_view(['PUT'])
 def update_consultant(request):
     consl_id = request.data.get('id')
@@ -197,6 +363,7 @@ def update_consultant(request):
         data['education'] = []
         for edu in edu_list:
             data['education'].append({
+                'id': edu.get('Id'),
                 'type': edu.get('Type'),
                 'university_name': edu.get('UniversityName'),
                 'major': edu.get('Major'),
@@ -218,34 +385,106 @@ def update_consultant_status(request):
     status_flag = request.data.get('Status')
 
     try:
-        consultant = Consultant.objects.get(id=consl_id)
-    except Consultant.DoesNotExist:
+        consl_id = int(consl_id)
+    except (TypeError, ValueError):
         return Response({'error': 'Consultant not found'}, status=status.HTTP_404_NOT_FOUND)
+    try:
+        status_flag = serializers.BooleanField().to_internal_value(status_flag)
+    except serializers.ValidationError:
+        return Response({'error': 'Status must be true or false'}, status=status.HTTP_400_BAD_REQUEST)
 
-    consultant.active = status_flag
-    consultant.save()
+    # one UPDATE of `active` (plus an audit row) instead of a full-row save()
+    report = hotlist.set_active([consl_id], status_flag, _audit_user(request))
+    if report['missing']:
+        return Response({'error': 'Consultant not found'}, status=status.HTTP_404_NOT_FOUND)
 
     msg = "Moved to Hotlist" if status_flag else "Removed from Hotlist"
     return Response({'message': msg, 'consultant_id': consl_id})
 
+
+def _audit_user(request):
+    return request.user if request.user.is_authenticated else None
+
+
+def _id_list(value, key='ConsultantIds'):
+    if not isinstance(value, list) or not value:
+        raise ValueError(f'{key} must be a non-empty list')
+    if len(value) > MAX_PAGE_SIZE:
+        raise ValueError(f'At most {MAX_PAGE_SIZE} {key} per request')
+    try:
+        return [int(i) for i in value]
+    except (TypeError, ValueError):
+        raise ValueError(f'{key} must be integers')
+
+
+# ---------- Bulk Hotlist ----------
+@api_view(['POST'])
+def bulk_update_hotlist(request):
+    """Body: {"ConsultantIds": [3, 7, 9], "Status": true} -> move all of them on (true) or off the hotlist."""
+    if not isinstance(request.data.get('Status'), bool):
+        return Response({'error': 'Status must be true or false'}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        ids = _id_list(request.data.get('ConsultantIds'))
+    except ValueError as exc:
+        return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+    report = hotlist.set_active(ids, request.data['Status'], _audit_user(request))
+    msg = "Moved to Hotlist" if request.data['Status'] else "Removed from Hotlist"
+    return Response({'message': msg, **report}, status=status.HTTP_200_OK)
+
+
+@api_view(['POST'])
+def rerank_hotlist(request):
+    """
+    Body: {"Ranking": [9, 3, 7]}  -> priorities len..1, best first, or
+          {"Priorities": {"9": 10, "3": 5}} -> explicit priorities.
+    """
+    try:
+        if request.data.get('Ranking') is not None:
+            priorities = hotlist.ranking_priorities(_id_list(request.data['Ranking']))
+        else:
+            raw = request.data.get('Priorities')
+            if not isinstance(raw, dict) or not raw:
+                raise ValueError('Ranking or Priorities is required')
+            if len(raw) > MAX_PAGE_SIZE:
+                raise ValueError(f'At most {MAX_PAGE_SIZE} consultants per request')
+            priorities = {int(pk): int(priority) for pk, priority in raw.items()}
+    except (TypeError, ValueError) as exc:
+        return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+    report = hotlist.set_priorities(priorities, _audit_user(request))
+    return Response({'message': 'Priorities updated', **report}, status=status.HTTP_200_OK)
+
 # ---------- Add Submission ----------
+DUPLICATE_CHAIN_RESPONSE = {"message": "Consultant already submitted to this client chain. Duplicate blocked."}
+
+
+def _use_client_links(data):
+    """The UseClientLinks flag of a request (default False), or None when it is not a boolean."""
+    try:
+        return serializers.BooleanField().to_internal_value(data.get("UseClientLinks", False))
+    except serializers.ValidationError:
+        return None
+
+
 @api_view(['POST'])
 def add_submission(request):
     data = request.data.copy()
     client_id = data.get("ClientId")
+    use_client_links = _use_client_links(data)
+    if use_client_links is None:
+        return Response({'error': 'UseClientLinks must be a boolean'}, status=status.HTTP_400_BAD_REQUEST)
 
-    # get attached vendors by role
-    attached_vendors = ClientVendorLink.objects.filter(client_id=client_id)
-    prime_vendor = attached_vendors.filter(role__iexact="Prime Vendor").first()
-    impl_partner = attached_vendors.filter(role__iexact="Implementation Partner").first()
+    # on request, the client's prime vendor / implementation partner links fill in a chain that leaves them out
+    link_defaults = submission_batch.client_link_defaults(client_id) if use_client_links and client_id else {}
 
     # Map incoming PascalCase keys to your model fields
     mapped_data = {
         "consultant": data.get("consultant") or data.get("ConsultantId"),
         "skill": data.get("SkillId"), 
         "vendor": data.get("vendor") or data.get("VendorId"),
-        "prime_vendor": data.get("PrimeVendorId"),
-        "implementation_partner": data.get("ImplementationPartnerId"),
+        "prime_vendor": data.get("PrimeVendorId") or link_defaults.get("prime_vendor"),
+        "implementation_partner": data.get("ImplementationPartnerId") or link_defaults.get("implementation_partner"),
         "end_client": data.get("ClientId"),
         "marketer": data.get("Marketer"),
         "comments": data.get("Comments"),
@@ -253,28 +492,78 @@ def add_submission(request):
         "resume_passed_to_client": False
     }
 
-    # Prevent duplicates where resume already passed to client
-    existing = Submission.objects.filter(
-        consultant_id=mapped_data["consultant"],
-        vendor_id=mapped_data["vendor"],
-        prime_vendor_id=mapped_data["prime_vendor"],
-        implementation_partner_id=mapped_data["implementation_partner"],
-        end_client_id=mapped_data["end_client"],
-        resume_passed_to_client=True
-    ).exists()
-
-    if existing:
-        return Response(
-            {"message": "Consultant already submitted to this client chain. Duplicate blocked."},
-            status=status.HTTP_409_CONFLICT
-        )
-
     serializer = SubmissionSerializer(data=mapped_data)
-    if serializer.is_valid():
-        serializer.save()
-        return Response({"message": "Submission added successfully"}, status=status.HTTP_201_CREATED)
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    # Prevent duplicates: one indexed lookup on the chain fingerprint
+    validated = serializer.validated_data
+    chain_key = Submission.compute_chain_key(*(
+        getattr(validated.get(field), 'pk', None)
+        for field in ('consultant', 'vendor', 'prime_vendor', 'implementation_partner', 'end_client')
+    ))
+    if Submission.objects.filter(chain_key=chain_key).exists():
+        return Response(DUPLICATE_CHAIN_RESPONSE, status=status.HTTP_409_CONFLICT)
+
+    try:
+        with transaction.atomic():
+            serializer.save()
+    except IntegrityError:
+        # same chain inserted concurrently; the unique chain_key index caught it
+        return Response(DUPLICATE_CHAIN_RESPONSE, status=status.HTTP_409_CONFLICT)
+    return Response({"message": "Submission added successfully"}, status=status.HTTP_201_CREATED)
+
+# ---------- Bulk Add Submission ----------
+@api_view(['POST'])
+def bulk_add_submission(request):
+    """
+    Body: {"ConsultantId", "ClientId", "SkillId", "Marketer", "Comments", "UseClientLinks",
+           "Chains": [{"VendorId", "PrimeVendorId", "ImplementationPartnerId", "Comments"}, ...]}
+    -> submits the consultant to every chain and reports each one as accepted, blocked or invalid.
+    With "UseClientLinks": true the client's links fill in a chain's missing prime vendor
+    and implementation partner, as in AddSubmission.
+    """
+    data = request.data
+    use_client_links = _use_client_links(data)
+    if use_client_links is None:
+        return Response({'error': 'UseClientLinks must be a boolean'}, status=status.HTTP_400_BAD_REQUEST)
+    chains = data.get("Chains")
+    if not isinstance(chains, list) or not chains:
+        return Response({'error': 'Chains must be a non-empty list'}, status=status.HTTP_400_BAD_REQUEST)
+    if len(chains) > submission_batch.MAX_CHAINS:
+        return Response({'error': f'At most {submission_batch.MAX_CHAINS} chains per request'},
+                        status=status.HTTP_400_BAD_REQUEST)
+    if not data.get("ClientId"):
+        return Response({'error': 'ClientId is required'}, status=status.HTTP_400_BAD_REQUEST)
+
+    serializer = SubmissionSerializer(data={
+        "consultant": data.get("ConsultantId"),
+        "skill": data.get("SkillId"),
+        "end_client": data.get("ClientId"),
+        "marketer": data.get("Marketer"),
+        "comments": data.get("Comments"),
+    })
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    results = submission_batch.submit_chains(serializer.validated_data, chains, _audit_user(request), use_client_links)
+    accepted = [r for r in results if r['status'] == 'accepted']
+    blocked = [r for r in results if r['status'] == 'blocked']
+    if not accepted and not blocked:
+        response_status = status.HTTP_400_BAD_REQUEST
+    elif not accepted:
+        response_status = status.HTTP_409_CONFLICT
+    elif len(accepted) < len(results):
+        response_status = status.HTTP_207_MULTI_STATUS
+    else:
+        response_status = status.HTTP_201_CREATED
+    return Response({
+        'message': f'{len(accepted)} of {len(results)} submissions added',
+        'accepted': len(accepted),
+        'blocked': len(blocked),
+        'results': results,
+    }, status=response_status)
 
-    return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 # ---------- Update Submission ----------
 @api_view(['PUT'])
@@ -287,19 +576,63 @@ def update_submission(request):
 
     serializer = SubmissionSerializer(submission, data=request.data, partial=True)
     if serializer.is_valid():
-        serializer.save()
+        submission._changed_by = _audit_user(request)
+        try:
+            with transaction.atomic():
+                serializer.save()
+        except IntegrityError:
+            return Response(DUPLICATE_CHAIN_RESPONSE, status=status.HTTP_409_CONFLICT)
         return Response({'message': 'Submission updated successfully', 'data': serializer.data})
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
 # ---------- Get All Submissions ----------
+SUBMISSION_ORDERING = ('-submission_date', 'id')
+SUBMISSION_RELATED = (
+    'consultant', 'vendor', 'prime_vendor', 'implementation_partner', 'end_client'
+)
+
+
+def submission_queryset():
+    # joins the FKs SubmissionSerializer renders a name for, so a page costs one query;
+    # marketer/skill names come from the lookup cache (sales.lookups)
+    return Submission.objects.select_related(*SUBMISSION_RELATED)
+
+
 @api_view(['GET'])
 def get_all_submissions(request):
-    submissions = Submission.objects.all().select_related(
-        'consultant', 'vendor', 'prime_vendor', 'implementation_partner', 'end_client', 'marketer'
-    )
-    serializer = SubmissionSerializer(submissions, many=True)
-    return Response({'submissions': serializer.data})
+    """
+    Newest first. ?limit= and/or ?cursor= switch to keyset pages by
+    (-submission_date, id) with a `next_cursor`; ?stream=true streams every row
+    (starting after ?cursor= if given) in chunks.
+    ?fields= / ?exclude= limit the columns returned.
+    """
+    try:
+        fields = requested_fields(request, SubmissionSerializer.Meta.fields)
+    except FieldsetError as exc:
+        return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+    if fields:
+        submissions = sparse_values(submission_queryset(), SUBMISSION_VALUES, fields, extra=('submission_date', 'id'))
+        serialize = lambda rows: render_rows(rows, SUBMISSION_VALUES, fields)
+    else:
+        submissions = submission_queryset()
+        serialize = lambda rows: SubmissionSerializer(rows, many=True).data
+    cursor = request.query_params.get('cursor')
+    if not cursor and not request.query_params.get('limit') and request.query_params.get('stream') != 'true':
+        return Response({'submissions': serialize(submissions.order_by(*SUBMISSION_ORDERING))})
+
+    try:
+        if request.query_params.get('stream') == 'true':
+            submissions = keyset_queryset(submissions, SUBMISSION_ORDERING, cursor)
+            return stream_json_list('submissions', submissions, serialize)
+
+        limit = parse_limit(request.query_params.get('limit'))
+        page, next_cursor = paginate_keyset(submissions, SUBMISSION_ORDERING, cursor, limit)
+    except InvalidCursor:
+        return Response({'error': 'Invalid cursor'}, status=status.HTTP_400_BAD_REQUEST)
+
+    return Response({'submissions': serialize(page), 'next_cursor': next_cursor})
 
 
 @api_view(['POST'])
@@ -308,7 +641,7 @@ def get_submission_by_id(request):
     if not submission_id:
         return Response({'error': 'SubmissionId is required'}, status=status.HTTP_400_BAD_REQUEST)
     try:
-        submission = Submission.objects.get(id=submission_id)
+        submission = submission_queryset().get(id=submission_id)
     except Submission.DoesNotExist:
         return Response({'error': 'Submission not found'}, status=status.HTTP_404_NOT_FOUND)
     serializer = SubmissionSerializer(submission)
@@ -320,7 +653,7 @@ def get_submissions_by_vendor(request):
     vendor_id = request.data.get('VendorId')
     if not vendor_id:
         return Response({'error': 'VendorId is required'}, status=status.HTTP_400_BAD_REQUEST)
-    submissions = Submission.objects.filter(vendor_id=vendor_id)
+    submissions = submission_queryset().filter(vendor_id=vendor_id)
     serializer = SubmissionSerializer(submissions, many=True)
     return Response({'vendor_submissions': serializer.data}, status=status.HTTP_200_OK)
 
@@ -333,7 +666,7 @@ def get_submissions_by_client(request):
     if not client_id:
         return Response({'error': 'ClientId is required'}, status=status.HTTP_400_BAD_REQUEST)
 
-    submissions = Submission.objects.filter(end_client_id=client_id)
+    submissions = submission_queryset().filter(end_client_id=client_id)
     serializer = SubmissionSerializer(submissions, many=True)
     return Response({'client_submissions': serializer.data}, status=status.HTTP_200_OK)
 
@@ -344,7 +677,7 @@ def get_submissions_by_marketer(request):
     if not marketer_id:
         return Response({'error': 'MarketerId is required'}, status=status.HTTP_400_BAD_REQUEST)
 
-    submissions = Submission.objects.filter(marketer_id=marketer_id)
+    submissions = submission_queryset().filter(marketer_id=marketer_id)
     serializer = SubmissionSerializer(submissions, many=True)
     return Response({'marketer_submissions': serializer.data}, status=status.HTTP_200_OK)
 
@@ -356,10 +689,72 @@ def get_submissions_by_consultant(request):
     if not consultant_id:
         return Response({'error': 'ConsultantId is required'}, status=status.HTTP_400_BAD_REQUEST)
 
-    submissions = Submission.objects.filter(consultant_id=consultant_id)
+    submissions = submission_queryset().filter(consultant_id=consultant_id)
     serializer = SubmissionSerializer(submissions, many=True)
     return Response({'consultant_submissions': serializer.data}, status=status.HTTP_200_OK)
 
+# ---------- Query Submissions ----------
+SUBMISSION_QUERY_FILTERS = {
+    'ConsultantId': 'consultant_id',
+    'VendorId': 'vendor_id',
+    'PrimeVendorId': 'prime_vendor_id',
+    'ImplementationPartnerId': 'implementation_partner_id',
+    'ClientId': 'end_client_id',
+    'MarketerId': 'marketer_id',
+    'SkillId': 'skill_id',
+}
+
+
+@api_view(['POST'])
+def query_submissions(request):
+    """
+    One filtered, cursor-paginated submission query replacing the GetSubmissionBy* calls.
+    Body (all optional, ids may be a single value or a list):
+    {"ConsultantId", "VendorId", "PrimeVendorId", "ImplementationPartnerId", "ClientId",
+     "MarketerId", "SkillId", "VendorResponse", "StartDate": "YYYY-MM-DD", "EndDate": "YYYY-MM-DD",
+     "Cursor", "Limit"}
+    """
+    data = request.data
+    submissions = submission_queryset()
+
+    try:
+        for key, field in SUBMISSION_QUERY_FILTERS.items():
+            value = data.get(key)
+            if value in (None, '', []):
+                continue
+            if isinstance(value, list):
+                submissions = submissions.filter(**{f'{field}__in': [int(v) for v in value]})
+            else:
+                submissions = submissions.filter(**{field: int(value)})
+    except (TypeError, ValueError):
+        return Response({'error': 'Ids must be integers'}, status=status.HTTP_400_BAD_REQUEST)
+
+    vendor_response = data.get('VendorResponse')
+    if isinstance(vendor_response, list):
+        submissions = submissions.filter(vendor_response__in=vendor_response)
+    elif vendor_response:
+        submissions = submissions.filter(vendor_response=vendor_response)
+
+    try:
+        if data.get('StartDate'):
+            start = datetime.strptime(data['StartDate'], '%Y-%m-%d')
+            submissions = submissions.filter(submission_date__gte=make_aware(start))
+        if data.get('EndDate'):
+            end = datetime.strptime(data['EndDate'], '%Y-%m-%d') + timedelta(days=1)
+            submissions = submissions.filter(submission_date__lt=make_aware(end))
+    except (TypeError, ValueError):
+        return Response({'error': 'StartDate and EndDate must be YYYY-MM-DD'}, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        page, next_cursor = paginate_keyset(
+            submissions, SUBMISSION_ORDERING, data.get('Cursor'), parse_limit(data.get('Limit'))
+        )
+    except InvalidCursor:
+        return Response({'error': 'Invalid cursor'}, status=status.HTTP_400_BAD_REQUEST)
+
+    serializer = SubmissionSerializer(page, many=True)
+    return Response({'submissions': serializer.data, 'next_cursor': next_cursor}, status=status.HTTP_200_OK)
+
 # ---------- Update Vendor Response ----------
 @api_view(['POST'])
 def update_vendor_response(request):
@@ -367,6 +762,13 @@ def update_vendor_response(request):
     response_status = request.data.get('VendorResponse')
     resume_passed = request.data.get('ResumePassedToClient', False)
 
+    if response_status not in dict(Submission._meta.get_field('vendor_response').choices):
+        return Response({'error': 'Invalid VendorResponse'}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        resume_passed = serializers.BooleanField().to_internal_value(resume_passed)
+    except serializers.ValidationError:
+        return Response({'error': 'ResumePassedToClient must be a boolean'}, status=status.HTTP_400_BAD_REQUEST)
+
     try:
         submission = Submission.objects.get(id=submission_id)
     except Submission.DoesNotExist:
@@ -374,10 +776,54 @@ def update_vendor_response(request):
 
     submission.vendor_response = response_status
     submission.resume_passed_to_client = resume_passed
-    submission.save()
+    submission._changed_by = _audit_user(request)
+    with transaction.atomic():  # the status event and funnel counters commit with the change
+        submission.save(update_fields=['vendor_response', 'resume_passed_to_client'])
     return Response({'message': 'Vendor response updated', 'data': SubmissionSerializer(submission).data})
 
 
+# ---------- Submission Funnel ----------
+@api_view(['POST'])
+def submission_funnel(request):
+    """
+    Body: {"Dimension": "vendor" | "end_client" | "marketer", "Ids": [optional]} ->
+    funnel counts, pass/selection rates and average response times per id.
+    """
+    ids = request.data.get('Ids')
+    if ids is not None:
+        try:
+            ids = _id_list(ids, 'Ids')
+        except ValueError as exc:
+            return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        results = funnel.funnel_report(request.data.get('Dimension', 'vendor'), ids)
+    except funnel.FunnelError as exc:
+        return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+    return Response({'results': results}, status=status.HTTP_200_OK)
+
+
+@api_view(['POST'])
+def submission_counters(request):
+    """
+    Body: {"Entity": "consultant" | "vendor" | "end_client" | "marketer", "Ids": [...]} ->
+    total, per-status counts and last_submission_at for each id, read from SubmissionCounter.
+    """
+    try:
+        ids = _id_list(request.data.get('Ids'), 'Ids')
+        results = counters.counters(request.data.get('Entity'), ids)
+    except (ValueError, counters.CounterError) as exc:
+        return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+    return Response({'results': [{'id': pk, **row} for pk, row in results.items()]}, status=status.HTTP_200_OK)
+
+
+@api_view(['POST'])
+def submission_history(request):
+    submission_id = request.data.get('SubmissionId')
+    if not submission_id:
+        return Response({'error': 'SubmissionId is required'}, status=status.HTTP_400_BAD_REQUEST)
+    return Response({'events': funnel.submission_history(submission_id)}, status=status.HTTP_200_OK)
+
+
 # ---------- Submission Report (day/week/month/year) ----------
 @api_view(['POST'])
 def submission_report(request):
@@ -395,9 +841,19 @@ def submission_report(request):
     else:
         return Response({'error': 'Invalid Period'}, status=status.HTTP_400_BAD_REQUEST)
 
-    submissions = Submission.objects.filter(submission_date__date__gte=start_date)
-    total = submissions.count()
-    summary = submissions.values('consultant__first_name').annotate(count=Count('id')).order_by('-count')
+    # served from the daily rollup instead of scanning Submission
+    rows = SubmissionDailyRollup.objects.filter(day__gte=start_date)
+    total = rows.aggregate(total=Sum('count'))['total'] or 0
+    counts = list(rows.values('consultant_id').annotate(count=Sum('count')).filter(count__gt=0).order_by('-count'))
+
+    names = dict(
+        Consultant.objects.filter(id__in=[c['consultant_id'] for c in counts])
+        .values_list('id', 'first_name')
+    )
+    summary = [
+        {'consultant_id': c['consultant_id'], 'consultant__first_name': names.get(c['consultant_id']), 'count': c['count']}
+        for c in counts
+    ]
 
     return Response({
         'period': period,
@@ -405,3 +861,18 @@ def submission_report(request):
         'consultant_summary': summary
     }, status=status.HTTP_200_OK)
 
+
+# ---------- Submission Analytics ----------
+@api_view(['POST'])
+def submission_analytics(request):
+    """
+    Body: {"StartDate": "2025-01-01", "EndDate": "2025-03-31",
+           "GroupBy": ["vendor", "marketer"], "Bucket": "week"}
+    GroupBy: consultant, vendor, prime_vendor, implementation_partner, end_client,
+    marketer, skill, vendor_response. Bucket: day, week, month (optional).
+    """
+    try:
+        start, end, group_by, bucket = analytics.parse_query(request.data)
+    except analytics.AnalyticsError as exc:
+        return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+    return Response(analytics.submission_analytics(start, end, group_by, bucket), status=status.HTTP_200_OK)
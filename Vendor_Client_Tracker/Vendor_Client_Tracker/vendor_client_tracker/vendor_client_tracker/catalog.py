@@ -0,0 +1,69 @@
+"""
+Versioned, pre-rendered responses for the small catalog endpoints
+(skills, visas, marketers, recruiters, states, domains).
+
+Each catalog has a version counter (a Version row, so every worker process
+sees the same one) that model signals bump on every write, in the write's own
+transaction. The rendered JSON body is cached per version and served with an
+ETag / Last-Modified pair; a conditional request whose validators still match
+gets a 304 after one primary-key read, without the catalog being queried or
+rendered.
+"""
+
+import time
+
+from django.core.cache import cache
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.http import http_date, parse_etags, parse_http_date_safe
+from rest_framework.renderers import JSONRenderer
+
+from .models import Version
+
+STARTED_AT = time.time()
+
+
+def catalog_version(name):
+    """Return (version, modified timestamp) for a catalog, initialising it on first use."""
+    version, modified = Version.current(f'catalog:{name}')
+    return version, modified.timestamp()
+
+
+def bump_catalog(name):
+    Version.bump(f'catalog:{name}')
+
+
+def _not_modified(request, etag, modified):
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+    if if_none_match:
+        etags = parse_etags(if_none_match)
+        return '*' in etags or etag in etags
+    if_modified_since = parse_http_date_safe(request.META.get('HTTP_IF_MODIFIED_SINCE', ''))
+    return if_modified_since is not None and int(modified) <= if_modified_since
+
+
+def catalog_response(request, name, build, static=False):
+    """
+    Serve catalog `name`. `build()` returns the response data and is only
+    called when the current version has not been rendered yet. Static
+    catalogs (constants in code) never change while the process runs.
+    """
+    if static:
+        version, modified = 'static', STARTED_AT
+    else:
+        version, modified = catalog_version(name)
+
+    etag = f'"{name}-{version}"'
+    if _not_modified(request, etag, modified):
+        response = HttpResponseNotModified()
+    else:
+        body_key = f'catalog:{name}:body:{version}'
+        body = cache.get(body_key)
+        if body is None:
+            body = JSONRenderer().render(build())
+            cache.set(body_key, body, None if static else 24 * 60 * 60)
+        response = HttpResponse(body, content_type='application/json')
+
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(modified)
+    response['Cache-Control'] = 'private, no-cache'
+    return response
@@ -0,0 +1,75 @@
+"""
+Sparse fieldsets (?fields=a,b / ?exclude=c) for the read-only list APIs.
+
+When a client asks for a subset of columns the list is read with .values()
+and rendered as plain dicts, skipping ModelSerializer per-object overhead and
+only selecting the columns (and joins) that were asked for. Values are
+rendered the way the DRF serializers render them, so the payload shape does
+not depend on which path served it.
+"""
+
+from datetime import date, datetime
+from decimal import Decimal
+
+from django.utils import timezone
+
+
+class FieldsetError(ValueError):
+    pass
+
+
+def _split(value):
+    return [f.strip() for f in value.split(',') if f.strip()]
+
+
+def requested_fields(request, available):
+    """
+    Return the list of output fields requested via ?fields= / ?exclude=
+    (in `available` order), or None when the client asked for everything.
+    """
+    fields = request.query_params.get('fields')
+    exclude = request.query_params.get('exclude')
+    if not fields and not exclude:
+        return None
+
+    wanted = _split(fields) if fields else list(available)
+    unwanted = set(_split(exclude)) if exclude else set()
+    unknown = [f for f in list(wanted) + list(unwanted) if f not in available]
+    if unknown:
+        raise FieldsetError(f"Unknown field(s): {', '.join(unknown)}")
+    return [f for f in available if f in wanted and f not in unwanted]
+
+
+def model_field_map(model, fields=None):
+    """{output name: ORM lookup} for a model's concrete fields (FKs as <name>_id)."""
+    result = {}
+    for field in model._meta.concrete_fields:
+        if fields is None or field.name in fields:
+            result[field.name] = field.attname
+    return result
+
+
+def sparse_values(queryset, field_map, fields, extra=()):
+    """queryset.values() limited to the requested fields plus `extra` lookups (e.g. paging keys)."""
+    lookups = list(dict.fromkeys([field_map[f] for f in fields] + list(extra)))
+    return queryset.values(*lookups)
+
+
+def _plain(value):
+    if isinstance(value, datetime):
+        value = timezone.localtime(value).isoformat() if timezone.is_aware(value) else value.isoformat()
+        return value[:-6] + 'Z' if value.endswith('+00:00') else value
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def render_rows(rows, field_map, fields):
+    return [{f: _plain(row[field_map[f]]) for f in fields} for row in rows]
+
+
+def prune(data, fields):
+    """Trim full serializer output down to `fields` (used for nested fields .values() can't produce)."""
+    return [{f: item[f] for f in fields} for item in data]
@@ -0,0 +1,168 @@
+"""
+Idempotency-Key support for the write endpoints.
+
+A client that sends `Idempotency-Key: <unique value>` with a POST/PUT/PATCH/
+DELETE under one of IDEMPOTENCY['PATHS'] can retry it safely: the first
+response is stored (with a fingerprint of the request) in an IdempotencyRecord
+row for IDEMPOTENCY['TTL'] seconds, and a retry with the same key and the same
+request gets the stored response back, marked `Idempotent-Replayed: true`,
+without the view running again. The table is shared by every worker process;
+`manage.py purge_idempotency_keys` deletes expired rows.
+
+- The same key with a different request (method, path, query or body) is
+  rejected with 422.
+- A retry that arrives while the first request is still running gets 409.
+  The record is claimed with an INSERT on its unique key before the view
+  runs, under a random token that the final write and the release filter on.
+  A background thread extends the claim every LOCK_TTL / 3 seconds while the
+  view runs, so only a claim whose worker died (not renewed for
+  IDEMPOTENCY['LOCK_TTL']) is taken over.
+- Keys are scoped by the raw Authorization header, so two users cannot
+  collide. The middleware runs before DRF authentication, so it cannot scope
+  by user id: a retry sent after a JWT refresh carries a new header and runs
+  the request again.
+- 5xx responses and auth failures are not stored; the key can be retried.
+"""
+
+import hashlib
+import secrets
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.http import HttpResponse, JsonResponse
+from django.utils import timezone
+
+from .models import IdempotencyRecord
+
+HEADER = 'HTTP_IDEMPOTENCY_KEY'
+REPLAY_HEADER = 'Idempotent-Replayed'
+METHODS = {'POST', 'PUT', 'PATCH', 'DELETE'}
+MAX_KEY_LENGTH = 255
+UNSTORED_STATUSES = {401, 403, 429}
+
+DEFAULTS = {
+    'TTL': 24 * 60 * 60,
+    'LOCK_TTL': 60,  # how long an in-flight claim lasts without being renewed
+    'PATHS': ('/sale/', '/client/', '/vendor/'),
+}
+
+
+def _config():
+    return {**DEFAULTS, **getattr(settings, 'IDEMPOTENCY', {})}
+
+
+def _fingerprint(request):
+    digest = hashlib.sha256()
+    for part in (request.method, request.get_full_path(), request.content_type or ''):
+        digest.update(part.encode())
+        digest.update(b'\0')
+    if (request.content_type or '').startswith('multipart/'):
+        # uploads are not read into memory here; their size stands in for the body
+        digest.update(request.META.get('CONTENT_LENGTH', '').encode())
+    else:
+        digest.update(request.body)
+    return digest.hexdigest()
+
+
+def _claim(key, fingerprint, token, lock_ttl):
+    """
+    Claim `key` for a new request under `token`. Returns None when claimed,
+    otherwise the existing record (stored response or a request still in flight).
+    """
+    now = timezone.now()
+    claim = {'fingerprint': fingerprint, 'token': token, 'status': None, 'content': b'', 'content_type': '',
+             'expires_at': now + timedelta(seconds=lock_ttl)}
+    for _ in range(2):
+        try:
+            with transaction.atomic():
+                IdempotencyRecord.objects.create(key=key, **claim)
+            return None
+        except IntegrityError:
+            pass
+        record = IdempotencyRecord.objects.filter(key=key).first()
+        if record is None:
+            continue  # purged in between; insert again
+        if record.expires_at > now:
+            return record
+        # expired response or abandoned claim: take it over unless another retry just did
+        if IdempotencyRecord.objects.filter(pk=record.pk, expires_at=record.expires_at).update(**claim):
+            return None
+        return IdempotencyRecord.objects.filter(key=key).first() or record
+    return record
+
+
+class _Renewal(threading.Thread):
+    """Keeps a claim alive while its request runs; stops once the claim is stored, released or lost."""
+
+    def __init__(self, key, token, lock_ttl):
+        super().__init__(daemon=True)
+        self.key, self.token, self.lock_ttl = key, token, lock_ttl
+        self.done = threading.Event()
+
+    def run(self):
+        try:
+            while not self.done.wait(self.lock_ttl / 3):
+                renewed = IdempotencyRecord.objects.filter(key=self.key, token=self.token, status__isnull=True).update(
+                    expires_at=timezone.now() + timedelta(seconds=self.lock_ttl)
+                )
+                if not renewed:
+                    return
+        finally:
+            connection.close()  # this thread's own connection
+
+
+class IdempotencyMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        key = request.META.get(HEADER)
+        config = _config()
+        if not key or request.method not in METHODS or not request.path.startswith(tuple(config['PATHS'])):
+            return self.get_response(request)
+        if len(key) > MAX_KEY_LENGTH:
+            return JsonResponse({'error': f'Idempotency-Key must be at most {MAX_KEY_LENGTH} characters'},
+                                status=400)
+
+        scope = hashlib.sha256(f"{request.META.get('HTTP_AUTHORIZATION', '')}\0{key}".encode()).hexdigest()
+        fingerprint = _fingerprint(request)
+
+        token = secrets.token_hex(16)
+        stored = _claim(scope, fingerprint, token, config['LOCK_TTL'])
+        if stored is not None:
+            if stored.status is None:
+                return JsonResponse({'error': 'A request with this Idempotency-Key is still being processed'},
+                                    status=409)
+            return self._replay(stored, fingerprint)
+
+        claim = IdempotencyRecord.objects.filter(key=scope, token=token, status__isnull=True)
+        renewal = _Renewal(scope, token, config['LOCK_TTL'])
+        renewal.start()
+        saved = False
+        try:
+            response = self.get_response(request)
+            if (response.status_code < 500 and response.status_code not in UNSTORED_STATUSES
+                    and not response.streaming):
+                claim.update(
+                    status=response.status_code,
+                    content=response.content,
+                    content_type=response.get('Content-Type', ''),
+                    expires_at=timezone.now() + timedelta(seconds=config['TTL']),
+                )
+                saved = True
+        finally:
+            renewal.done.set()
+            if not saved:
+                # release the claim so the key can be retried
+                claim.delete()
+        return response
+
+    def _replay(self, stored, fingerprint):
+        if stored.fingerprint != fingerprint:
+            return JsonResponse({'error': 'Idempotency-Key was already used for a different request'},
+                                status=422)
+        response = HttpResponse(bytes(stored.content), status=stored.status, content_type=stored.content_type)
+        response[REPLAY_HEADER] = 'true'
+        return response
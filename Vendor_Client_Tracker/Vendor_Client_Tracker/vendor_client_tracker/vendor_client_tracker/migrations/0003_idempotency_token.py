@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 00:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vendor_client_tracker', '0002_idempotency_record'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='idempotencyrecord',
+            name='token',
+            field=models.CharField(default='', max_length=32),
+        ),
+    ]
@@ -0,0 +1,61 @@
+import time
+
+from django.db import models, transaction
+from django.db.models import F
+from django.utils import timezone
+
+
+class Version(models.Model):
+    """
+    A named counter shared by every worker process (catalog ETags and the
+    like). Bumps are plain UPDATEs, so a bump made inside a write's
+    transaction becomes visible together with that write.
+    """
+    name = models.CharField(max_length=100, primary_key=True)
+    value = models.BigIntegerField()
+    modified = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.name} = {self.value}"
+
+    @staticmethod
+    def _seed():
+        # seeded from the clock so a lost row never reuses a value handed out earlier
+        return int(time.time() * 1000)
+
+    @classmethod
+    def current(cls, name):
+        """(value, modified) of counter `name`, creating it on first use."""
+        row = cls.objects.filter(name=name).values_list('value', 'modified').first()
+        if row is None:
+            version, _ = cls.objects.get_or_create(name=name, defaults={'value': cls._seed(), 'modified': timezone.now()})
+            row = (version.value, version.modified)
+        return row
+
+    @classmethod
+    def bump(cls, name):
+        """Increment counter `name` and return its new value."""
+        with transaction.atomic():
+            if not cls.objects.filter(name=name).update(value=F('value') + 1, modified=timezone.now()):
+                cls.objects.get_or_create(name=name, defaults={'value': cls._seed(), 'modified': timezone.now()})
+            # the UPDATE holds the row lock until commit, so this reads our own increment
+            return cls.objects.filter(name=name).values_list('value', flat=True).get()
+
+
+class IdempotencyRecord(models.Model):
+    """
+    One Idempotency-Key (see vendor_client_tracker.idempotency). The row is
+    inserted before the view runs, so the unique key doubles as the lock that
+    stops a concurrent retry from running the view twice; status stays NULL
+    until the response is stored, and only the run holding `token` may store it.
+    """
+    key = models.CharField(max_length=64, unique=True)  # sha256 of the Authorization header and the key
+    fingerprint = models.CharField(max_length=64)
+    token = models.CharField(max_length=32, default='')  # which run holds the claim
+    status = models.PositiveSmallIntegerField(null=True)
+    content = models.BinaryField(default=b'')
+    content_type = models.CharField(max_length=255, blank=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return self.key
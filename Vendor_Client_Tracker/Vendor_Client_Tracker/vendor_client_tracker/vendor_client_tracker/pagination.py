@@ -0,0 +1,178 @@
+"""
+Keyset (cursor) pagination and chunked JSON streaming shared by the list APIs.
+
+A cursor is an opaque, url-safe token holding the ordering values of the last
+row of the previous page, so the next page is a plain indexed range read
+instead of an ever-growing OFFSET scan.
+"""
+
+import base64
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+from django.core.exceptions import ValidationError
+from django.db import connections
+from django.db.models import Q
+from django.http import StreamingHttpResponse
+from rest_framework.utils.encoders import JSONEncoder
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+STREAM_CHUNK_SIZE = 500
+COUNT_CAP = 10000
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def parse_limit(value, default=DEFAULT_PAGE_SIZE, maximum=MAX_PAGE_SIZE):
+    try:
+        limit = int(value)
+    except (TypeError, ValueError):
+        return default
+    return max(1, min(limit, maximum))
+
+
+def _to_cursor_value(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def encode_cursor(values):
+    raw = json.dumps([_to_cursor_value(v) for v in values], separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor, size):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+    except (ValueError, TypeError):
+        raise InvalidCursor('Invalid cursor')
+    if not isinstance(values, list) or len(values) != size:
+        raise InvalidCursor('Invalid cursor')
+    return values
+
+
+def _field(model, name):
+    """Model field an ordering name ('submission_date', 'consultant__id') ends at."""
+    parts = name.split('__')
+    for part in parts[:-1]:
+        model = model._meta.get_field(part).related_model
+    return model._meta.get_field(parts[-1])
+
+
+def _cursor_values(model, ordering, values):
+    """Decoded cursor values converted by their ordering fields; InvalidCursor if one does not fit."""
+    try:
+        values = [_field(model, field.lstrip('-')).to_python(value) for field, value in zip(ordering, values)]
+    except (ValidationError, ValueError, TypeError):
+        raise InvalidCursor('Invalid cursor')
+    if None in values:  # ordering fields are never NULL, so no real row encodes one
+        raise InvalidCursor('Invalid cursor')
+    return values
+
+
+def _after(ordering, values):
+    """
+    Build the "strictly after this row" filter for a lexicographic ordering,
+    e.g. for ('-submission_date', 'id'):
+        submission_date < d OR (submission_date = d AND id > i)
+    """
+    condition = Q()
+    equal = Q()
+    for field, value in zip(ordering, values):
+        name = field.lstrip('-')
+        lookup = 'lt' if field.startswith('-') else 'gt'
+        condition |= equal & Q(**{f'{name}__{lookup}': value})
+        equal &= Q(**{name: value})
+    return condition
+
+
+def keyset_queryset(queryset, ordering, cursor=None):
+    """
+    Order `queryset` by `ordering` (the last field must be unique, normally
+    'id') and skip everything up to and including the row encoded in `cursor`.
+    """
+    queryset = queryset.order_by(*ordering)
+    if cursor:
+        values = _cursor_values(queryset.model, ordering, decode_cursor(cursor, len(ordering)))
+        queryset = queryset.filter(_after(ordering, values))
+    return queryset
+
+
+def paginate_keyset(queryset, ordering, cursor=None, limit=DEFAULT_PAGE_SIZE):
+    """
+    Return (rows, next_cursor). next_cursor is None on the last page.
+    Rows may be model instances or .values() dicts.
+    """
+    rows = list(keyset_queryset(queryset, ordering, cursor)[:limit + 1])
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = rows[-1]
+    get = last.get if isinstance(last, dict) else (lambda name: getattr(last, name))
+    return rows, encode_cursor([get(field.lstrip('-')) for field in ordering])
+
+
+def _table_estimate(queryset):
+    """Row count of the model's table from the planner statistics, or None where there are none."""
+    connection = connections[queryset.db]
+    if connection.vendor == 'mysql':
+        sql = 'SELECT TABLE_ROWS FROM information_schema.TABLES WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s'
+    elif connection.vendor == 'postgresql':
+        sql = 'SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(%s)'
+    else:
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [queryset.model._meta.db_table])
+        row = cursor.fetchone()
+    # PostgreSQL reports -1 for a table that was never analyzed
+    return int(row[0]) if row and row[0] is not None and row[0] >= 0 else None
+
+
+def approximate_count(queryset, cap=COUNT_CAP):
+    """
+    Return (count, exact) without counting a large match set: an unfiltered
+    queryset is answered from the table statistics, a filtered one is counted
+    through its index up to `cap` rows (count == cap and exact False beyond).
+    """
+    if not queryset.query.where:
+        estimate = _table_estimate(queryset)
+        if estimate is not None:
+            return estimate, False
+    count = queryset.order_by().values('pk')[:cap + 1].count()
+    return min(count, cap), count <= cap
+
+
+def stream_json_list(key, queryset, serialize, chunk_size=STREAM_CHUNK_SIZE):
+    """
+    Stream {"<key>": [...]} without materialising the queryset: rows are read
+    with a server-side iterator and serialized `chunk_size` at a time, so
+    memory stays flat regardless of the table size.
+    """
+    encoder = JSONEncoder()
+
+    def chunks():
+        yield '{"%s":[' % key
+        first = True
+        batch = []
+        for obj in queryset.iterator(chunk_size=chunk_size):
+            batch.append(obj)
+            if len(batch) >= chunk_size:
+                body = ','.join(encoder.encode(row) for row in serialize(batch))
+                yield body if first else ',' + body
+                first = False
+                batch = []
+        if batch:
+            body = ','.join(encoder.encode(row) for row in serialize(batch))
+            yield body if first else ',' + body
+        yield ']}'
+
+    return StreamingHttpResponse(chunks(), content_type='application/json')
@@ -13,6 +13,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 import os
 from pathlib import Path
 from dotenv import load_dotenv
+from corsheaders.defaults import default_headers
 
 BASE_DIR=Path(__file__).resolve().parent.parent
 
@@ -47,7 +48,10 @@ INSTALLED_APPS = [
    'clients',
    'vendors',
    'adminpanel',
-   'sales'
+   'sales',
+   'imports',
+   'geo',
+   'vendor_client_tracker',
    
    
    
@@ -66,6 +70,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'vendor_client_tracker.idempotency.IdempotencyMiddleware',
 ]
 
 ROOT_URLCONF = 'vendor_client_tracker.urls'
@@ -140,6 +145,36 @@ USE_TZ = True
 
 STATIC_URL = 'static/'
 
+# Uploaded files (import spreadsheets, resumes)
+MEDIA_ROOT = BASE_DIR / 'media'
+
+# Skill/Visa/Marketer/Recruiter lookup cache (sales.lookups). Use 'shared' to
+# keep it in a CACHES alias shared by all worker processes; 'local' entries
+# expire after LOCAL_TIMEOUT seconds since other workers' writes never reach them.
+LOOKUP_CACHE = {
+    'BACKEND': 'local',
+    'MAX_ENTRIES': 5000,
+    'LOCAL_TIMEOUT': 5 * 60,
+}
+
+# Consultant facet index snapshot (sales.facets): a CACHES alias shared by all
+# worker processes (e.g. Redis; the snapshot is a few MB) that cold workers load
+# instead of scanning the consultant table. None keeps no snapshot, since the
+# per-process default cache would never be read by another worker.
+CONSULTANT_FACETS_SNAPSHOT_CACHE = None
+
+# Consultant search (sales.search) uses the MySQL FULLTEXT index when running on
+# MySQL; set to False to use the token table there as well.
+CONSULTANT_SEARCH_FULLTEXT = True
+
+# Idempotency-Key handling for write endpoints (vendor_client_tracker.idempotency).
+# Stored responses are IdempotencyRecord rows; purge expired ones with
+# `manage.py purge_idempotency_keys`.
+IDEMPOTENCY = {
+    'TTL': 24 * 60 * 60,
+    'PATHS': ('/sale/', '/client/', '/vendor/'),
+}
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -163,4 +198,6 @@ REST_FRAMEWORK = {
 }
 
 CORS_ALLOW_ALL_ORIGINS = True
+CORS_ALLOW_HEADERS = (*default_headers, 'idempotency-key')
+CORS_EXPOSE_HEADERS = ['Idempotent-Replayed']
 
@@ -1,61 +1,84 @@
 from rest_framework.views import APIView
-from rest_framework.response import Response
+from .catalog import catalog_response
+
+US_STATES = [
+    {"name": "Alabama", "abbr": "AL"},
+    {"name": "Alaska", "abbr": "AK"},
+    {"name": "Arizona", "abbr": "AZ"},
+    {"name": "Arkansas", "abbr": "AR"},
+    {"name": "California", "abbr": "CA"},
+    {"name": "Colorado", "abbr": "CO"},
+    {"name": "Connecticut", "abbr": "CT"},
+    {"name": "Delaware", "abbr": "DE"},
+    {"name": "Florida", "abbr": "FL"},
+    {"name": "Georgia", "abbr": "GA"},
+    {"name": "Hawaii", "abbr": "HI"},
+    {"name": "Idaho", "abbr": "ID"},
+    {"name": "Illinois", "abbr": "IL"},
+    {"name": "Indiana", "abbr": "IN"},
+    {"name": "Iowa", "abbr": "IA"},
+    {"name": "Kansas", "abbr": "KS"},
+    {"name": "Kentucky", "abbr": "KY"},
+    {"name": "Louisiana", "abbr": "LA"},
+    {"name": "Maine", "abbr": "ME"},
+    {"name": "Maryland", "abbr": "MD"},
+    {"name": "Massachusetts", "abbr": "MA"},
+    {"name": "Michigan", "abbr": "MI"},
+    {"name": "Minnesota", "abbr": "MN"},
+    {"name": "Mississippi", "abbr": "MS"},
+    {"name": "Missouri", "abbr": "MO"},
+    {"name": "Montana", "abbr": "MT"},
+    {"name": "Nebraska", "abbr": "NE"},
+    {"name": "Nevada", "abbr": "NV"},
+    {"name": "New Hampshire", "abbr": "NH"},
+    {"name": "New Jersey", "abbr": "NJ"},
+    {"name": "New Mexico", "abbr": "NM"},
+    {"name": "New York", "abbr": "NY"},
+    {"name": "North Carolina", "abbr": "NC"},
+    {"name": "North Dakota", "abbr": "ND"},
+    {"name": "Ohio", "abbr": "OH"},
+    {"name": "Oklahoma", "abbr": "OK"},
+    {"name": "Oregon", "abbr": "OR"},
+    {"name": "Pennsylvania", "abbr": "PA"},
+    {"name": "Rhode Island", "abbr": "RI"},
+    {"name": "South Carolina", "abbr": "SC"},
+    {"name": "South Dakota", "abbr": "SD"},
+    {"name": "Tennessee", "abbr": "TN"},
+    {"name": "Texas", "abbr": "TX"},
+    {"name": "Utah", "abbr": "UT"},
+    {"name": "Vermont", "abbr": "VT"},
+    {"name": "Virginia", "abbr": "VA"},
+    {"name": "Washington", "abbr": "WA"},
+    {"name": "West Virginia", "abbr": "WV"},
+    {"name": "Wisconsin", "abbr": "WI"},
+    {"name": "Wyoming", "abbr": "WY"},
+]
+
+# "TX", "tx", "Texas", " texas " -> "TX"
+STATE_CODES = {
+    **{s["abbr"].lower(): s["abbr"] for s in US_STATES},
+    **{s["name"].lower(): s["abbr"] for s in US_STATES},
+}
+
+
+def state_code(value):
+    """Two-letter code of a US state given by code or name; None if it is not one."""
+    if not value:
+        return None
+    return STATE_CODES.get(" ".join(str(value).split()).lower())
+
+
+def state_codes_starting(value):
+    """Codes of the US states whose code or name starts with `value` ("new" -> NH, NJ, NM, NY)."""
+    text = " ".join(str(value or "").split()).lower()
+    if not text:
+        return []
+    return sorted({code for key, code in STATE_CODES.items() if key.startswith(text)})
+
 
 class StatesListAPI(APIView):
     """
     Global States API – shared for clients, vendors, addresses, etc.
     """
     def get(self, request):
-        states = [
-            {"name": "Alabama", "abbr": "AL"},
-            {"name": "Alaska", "abbr": "AK"},
-            {"name": "Arizona", "abbr": "AZ"},
-            {"name": "Arkansas", "abbr": "AR"},
-            {"name": "California", "abbr": "CA"},
-            {"name": "Colorado", "abbr": "CO"},
-            {"name": "Connecticut", "abbr": "CT"},
-            {"name": "Delaware", "abbr": "DE"},
-            {"name": "Florida", "abbr": "FL"},
-            {"name": "Georgia", "abbr": "GA"},
-            {"name": "Hawaii", "abbr": "HI"},
-            {"name": "Idaho", "abbr": "ID"},
-            {"name": "Illinois", "abbr": "IL"},
-            {"name": "Indiana", "abbr": "IN"},
-            {"name": "Iowa", "abbr": "IA"},
-            {"name": "Kansas", "abbr": "KS"},
-            {"name": "Kentucky", "abbr": "KY"},
-            {"name": "Louisiana", "abbr": "LA"},
-            {"name": "Maine", "abbr": "ME"},
-            {"name": "Maryland", "abbr": "MD"},
-            {"name": "Massachusetts", "abbr": "MA"},
-            {"name": "Michigan", "abbr": "MI"},
-            {"name": "Minnesota", "abbr": "MN"},
-            {"name": "Mississippi", "abbr": "MS"},
-            {"name": "Missouri", "abbr": "MO"},
-            {"name": "Montana", "abbr": "MT"},
-            {"name": "Nebraska", "abbr": "NE"},
-            {"name": "Nevada", "abbr": "NV"},
-            {"name": "New Hampshire", "abbr": "NH"},
-            {"name": "New Jersey", "abbr": "NJ"},
-            {"name": "New Mexico", "abbr": "NM"},
-            {"name": "New York", "abbr": "NY"},
-            {"name": "North Carolina", "abbr": "NC"},
-            {"name": "North Dakota", "abbr": "ND"},
-            {"name": "Ohio", "abbr": "OH"},
-            {"name": "Oklahoma", "abbr": "OK"},
-            {"name": "Oregon", "abbr": "OR"},
-            {"name": "Pennsylvania", "abbr": "PA"},
-            {"name": "Rhode Island", "abbr": "RI"},
-            {"name": "South Carolina", "abbr": "SC"},
-            {"name": "South Dakota", "abbr": "SD"},
-            {"name": "Tennessee", "abbr": "TN"},
-            {"name": "Texas", "abbr": "TX"},
-            {"name": "Utah", "abbr": "UT"},
-            {"name": "Vermont", "abbr": "VT"},
-            {"name": "Virginia", "abbr": "VA"},
-            {"name": "Washington", "abbr": "WA"},
-            {"name": "West Virginia", "abbr": "WV"},
-            {"name": "Wisconsin", "abbr": "WI"},
-            {"name": "Wyoming", "abbr": "WY"},
-        ]
-        return Response(states)
+        return catalog_response(request, 'states', lambda: US_STATES, static=True)
@@ -25,6 +25,8 @@ urlpatterns = [
     path('vendor/', include("vendors.urls")),
     path('adminpanel/', include("adminpanel.urls")),
     path('sale/', include("sales.urls")),
+    path('import/', include("imports.urls")),
+    path('geo/', include("geo.urls")),
     
 
     
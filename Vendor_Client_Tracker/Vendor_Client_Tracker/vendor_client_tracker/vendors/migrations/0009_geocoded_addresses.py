@@ -0,0 +1,104 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:48
+
+import re
+
+from django.db import migrations, models
+from django.db.models import Avg
+
+# frozen copy of geo.geocoding as of this migration
+STATE_NAMES = {
+    'AL': 'Alabama', 'AK': 'Alaska', 'AZ': 'Arizona', 'AR': 'Arkansas', 'CA': 'California',
+    'CO': 'Colorado', 'CT': 'Connecticut', 'DE': 'Delaware', 'FL': 'Florida', 'GA': 'Georgia',
+    'HI': 'Hawaii', 'ID': 'Idaho', 'IL': 'Illinois', 'IN': 'Indiana', 'IA': 'Iowa', 'KS': 'Kansas',
+    'KY': 'Kentucky', 'LA': 'Louisiana', 'ME': 'Maine', 'MD': 'Maryland', 'MA': 'Massachusetts',
+    'MI': 'Michigan', 'MN': 'Minnesota', 'MS': 'Mississippi', 'MO': 'Missouri', 'MT': 'Montana',
+    'NE': 'Nebraska', 'NV': 'Nevada', 'NH': 'New Hampshire', 'NJ': 'New Jersey',
+    'NM': 'New Mexico', 'NY': 'New York', 'NC': 'North Carolina', 'ND': 'North Dakota',
+    'OH': 'Ohio', 'OK': 'Oklahoma', 'OR': 'Oregon', 'PA': 'Pennsylvania', 'RI': 'Rhode Island',
+    'SC': 'South Carolina', 'SD': 'South Dakota', 'TN': 'Tennessee', 'TX': 'Texas', 'UT': 'Utah',
+    'VT': 'Vermont', 'VA': 'Virginia', 'WA': 'Washington', 'WV': 'West Virginia',
+    'WI': 'Wisconsin', 'WY': 'Wyoming',
+}
+STATE_CODES = {**{code.lower(): code for code in STATE_NAMES}, **{name.lower(): code for code, name in STATE_NAMES.items()}}
+ZIP_RE = re.compile(r'^\s*(\d{5})(?:[-\s]?\d{4})?\s*$')
+
+
+def zip5(value):
+    match = ZIP_RE.match(str(value)) if value else None
+    return match.group(1) if match else None
+
+
+def city_key(city, state):
+    code = STATE_CODES.get(" ".join(str(state).split()).lower()) if state else None
+    city = " ".join(str(city).split()).casefold() if city else ''
+    return (code, city) if code and city else None
+
+
+def backfill_coordinates(model, ZipCentroid):
+    """Place every row at its ZIP centroid, else at the mean centroid of its city and state."""
+    by_zip = {zipcode: (lat, lon) for zipcode, lat, lon in
+              ZipCentroid.objects.values_list('zipcode', 'latitude', 'longitude').iterator(chunk_size=5000)}
+    by_city, batch = {}, []
+    rows = model.objects.only('zipcode', 'city', 'state', 'latitude', 'longitude').order_by('pk')
+    for obj in rows.iterator(chunk_size=2000):
+        point = by_zip.get(zip5(obj.zipcode))
+        if point is None:
+            key = city_key(obj.city, obj.state)
+            if key and key not in by_city:
+                found = (ZipCentroid.objects.filter(state=key[0], city__iexact=key[1])
+                         .aggregate(lat=Avg('latitude'), lon=Avg('longitude')))
+                by_city[key] = (found['lat'], found['lon']) if found['lat'] is not None else None
+            point = by_city.get(key)
+        obj.latitude, obj.longitude = point or (None, None)
+        batch.append(obj)
+        if len(batch) >= 2000:
+            model.objects.bulk_update(batch, ['latitude', 'longitude'])
+            batch = []
+    model.objects.bulk_update(batch, ['latitude', 'longitude'])
+
+
+def backfill_addresses(apps, schema_editor):
+    ZipCentroid = apps.get_model('geo', 'ZipCentroid')
+    for name in ('Vendor', 'VendorAddress'):
+        backfill_coordinates(apps.get_model('vendors', name), ZipCentroid)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('geo', '0001_zip_centroid'),
+        ('vendors', '0008_vendor_linkedin_url'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='vendor',
+            name='latitude',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='vendor',
+            name='longitude',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='vendoraddress',
+            name='latitude',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='vendoraddress',
+            name='longitude',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        # filled before the indexes are built
+        migrations.RunPython(backfill_addresses, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='vendor',
+            index=models.Index(fields=['latitude', 'longitude'], name='vendor_geo_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vendoraddress',
+            index=models.Index(fields=['latitude', 'longitude'], name='vendor_address_geo_idx'),
+        ),
+    ]
@@ -1,6 +1,8 @@
 from django.db import models
 
-class Vendor(models.Model):
+from geo.models import Geocoded
+
+class Vendor(Geocoded):
     STATUS_CHOICES = (
         ('active', 'Active'),
         ('inactive', 'Inactive'),
@@ -18,6 +20,9 @@ class Vendor(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [models.Index(fields=['latitude', 'longitude'], name='vendor_geo_idx')]
+
     def __str__(self):
         return self.name
 
@@ -34,7 +39,7 @@ class VendorContact(models.Model):
         return f"{self.full_name} ({self.vendor.name})"
 
 
-class VendorAddress(models.Model):
+class VendorAddress(Geocoded):
     vendor = models.ForeignKey(Vendor, related_name="addresses", on_delete=models.CASCADE)
     type = models.CharField(max_length=50, blank=True, null=True)   # e.g. Billing, Shipping
     street_address = models.CharField(max_length=255)
@@ -45,5 +50,8 @@ class VendorAddress(models.Model):
     is_primary = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [models.Index(fields=['latitude', 'longitude'], name='vendor_address_geo_idx')]
+
     def __str__(self):
         return f"{self.type or 'Address'} - {self.vendor.name}"
@@ -5,6 +5,9 @@ from rest_framework import status
 from rest_framework.views import APIView
 from .models import Vendor
 from .serializers import VendorSerializer, VendorContactSerializer, VendorAddressSerializer
+from vendor_client_tracker.fieldsets import FieldsetError, model_field_map, render_rows, requested_fields, sparse_values
+
+VENDOR_VALUES = model_field_map(Vendor)
 
 # ---------- Vendor Statistics ----------
 class VendorStatsView(APIView):
@@ -32,6 +35,7 @@ class VendorStatsView(APIView):
             status=status.HTTP_200_OK
         )
 
+@api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def add_vendor(request):
     serializer = VendorSerializer(data=request.data)
@@ -42,9 +46,17 @@ def add_vendor(request):
 
 @api_view(['GET'])
 def get_vendors(request):
+    try:
+        fields = requested_fields(request, VENDOR_VALUES)
+    except FieldsetError as exc:
+        return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
     vendors = Vendor.objects.all().order_by('-created_at')  # latest first
-    serializer = VendorSerializer(vendors, many=True)
-    return Response({"message": "Vendors retrieved successfully", "data": serializer.data}, status=status.HTTP_200_OK)
+    if fields:
+        data = render_rows(sparse_values(vendors, VENDOR_VALUES, fields), VENDOR_VALUES, fields)
+    else:
+        data = VendorSerializer(vendors, many=True).data
+    return Response({"message": "Vendors retrieved successfully", "data": data}, status=status.HTTP_200_OK)
 
 @api_view(['GET'])
 def get_vendor_by_id(request, vendor_id):
@@ -11,6 +11,8 @@ const SubmissionService = {
   add: (payload) => coreApi.post("sale/AddSubmission/", payload, authHeader),
   update: (payload) => coreApi.put("sale/UpdateSubmission/", payload, authHeader),
   updateResponse: (payload) => coreApi.post("sale/UpdateVendorResponse/", payload, authHeader),
+  // filters: { ConsultantId, VendorId, ClientId, MarketerId, VendorResponse, StartDate, EndDate, Cursor, Limit }
+  query: (filters) => coreApi.post("sale/QuerySubmissions/", filters, authHeader),
   getByVendor: (vendorId) =>
     coreApi.post("sale/GetSubmissionByVendor/", { VendorId: vendorId }, authHeader),
   getByClient: (clientId) =>
@@ -21,6 +23,9 @@ const SubmissionService = {
     coreApi.post("sale/GetSubmissionByMarketer/", { MarketerId: marketerId }, authHeader),
   getReport: (period) =>
     coreApi.post("sale/GetSubmissionReport/", { Period: period }, authHeader),
+  // query: { StartDate, EndDate, GroupBy: ["vendor", ...], Bucket: "day" | "week" | "month" }
+  getAnalytics: (query) =>
+    coreApi.post("sale/GetSubmissionAnalytics/", query, authHeader),
 };
 
 export default SubmissionService;